@@ -0,0 +1,93 @@
+"""
+Codec Benchmark
+
+Compares StructCodec and JSONCodec against json.dumps/json.loads on the task
+message shape used by zmq_task_processor.py and on a market-data tick.
+"""
+
+import json
+import time
+
+from sdk.cnet import JSONCodec, StructCodec
+from sdk.ctime import clock_realtime
+from sdk.cuuid import uuid4
+
+ITERATIONS = 200_000
+
+TASK_FIELDS = [
+    ("task_id", "uuid"),
+    ("complexity", "u8"),
+    ("created_at", "timestamp"),
+    ("completed_at", "timestamp"),
+    ("status", "str"),
+    ("worker_id", "str"),
+    ("result", "str"),
+]
+
+TICK_FIELDS = [
+    ("ts", "timestamp"),
+    ("bid", "f64"),
+    ("ask", "f64"),
+    ("bid_size", "varint"),
+    ("ask_size", "varint"),
+    ("seq", "uvarint"),
+    ("symbol", "str"),
+]
+
+
+def make_task():
+    return {
+        "task_id": uuid4(),
+        "complexity": 7,
+        "created_at": clock_realtime(),
+        "completed_at": clock_realtime(),
+        "status": "completed",
+        "worker_id": "worker-3",
+        "result": "Result from worker-3: 4711",
+    }
+
+
+def make_tick():
+    return {
+        "ts": clock_realtime(),
+        "bid": 1.08412,
+        "ask": 1.08415,
+        "bid_size": 1_000_000,
+        "ask_size": 750_000,
+        "seq": 123_456_789,
+        "symbol": "EURUSD",
+    }
+
+
+def bench(name, encode, decode, message):
+    data = encode(message)
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        encode(message)
+    encode_ns = (time.perf_counter() - start) / ITERATIONS * 1e9
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        decode(data)
+    decode_ns = (time.perf_counter() - start) / ITERATIONS * 1e9
+    print(f"  {name:<18} {len(data):>5} bytes  encode {encode_ns:7.0f} ns  decode {decode_ns:7.0f} ns")
+
+
+def main():
+    for shape, fields, message in (
+        ("task", TASK_FIELDS, make_task()),
+        ("tick", TICK_FIELDS, make_tick()),
+    ):
+        print(f"{shape}:")
+        struct_codec = StructCodec(fields)
+        json_codec = JSONCodec()
+        in_house = JSONCodec.in_house()
+        # json.dumps needs the UUID as a string, as the task processor sends it
+        plain = {k: str(v) if k == "task_id" else v for k, v in message.items()}
+        bench("json", lambda m: json.dumps(m).encode(), json.loads, plain)
+        bench("JSONCodec", json_codec.encode, json_codec.decode, plain)
+        bench("JSONCodec.in_house", json_codec.encode, in_house.decode, plain)
+        bench("StructCodec", struct_codec.encode, struct_codec.decode, message)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,36 @@
 from typing import Tuple
 
 from .zip import ZipFile, extract_zip
-from .json import read_json, write_json
+from .json import read_json, read_json_bytes, write_json
 from .flist import (
     ListFileReader,
     ListMMAPFileReader,
     create_list_reader,
 )
 from .toml import read_toml, write_toml
-from .arrow import pa_file_exists, pa_write_parquet_table, read_csv_bytes
+from .arrow import (
+    FileInfoCache,
+    ParquetSink,
+    pa_file_exists,
+    pa_deserialize_ipc_stream,
+    pa_files_exist,
+    pa_get_file_infos,
+    pa_iter_csv_batches,
+    pa_iter_parquet_batches,
+    pa_read_ipc_file,
+    pa_read_parquet,
+    pa_serialize_ipc_stream,
+    pa_write_parquet_table,
+    pa_write_ipc_file,
+    pa_write_partitioned_parquet,
+    read_csv_bytes,
+)
 
 __all__: Tuple[str, ...] = (
     "ZipFile",
     "extract_zip",
     "read_json",
+    "read_json_bytes",
     "write_json",
     "ListFileReader",
     "ListMMAPFileReader",
@@ -21,6 +38,18 @@ __all__: Tuple[str, ...] = (
     "read_toml",
     "write_toml",
     "pa_file_exists",
+    "pa_files_exist",
+    "pa_get_file_infos",
+    "FileInfoCache",
     "pa_write_parquet_table",
+    "pa_read_parquet",
+    "pa_iter_csv_batches",
+    "pa_iter_parquet_batches",
+    "pa_write_ipc_file",
+    "pa_read_ipc_file",
+    "pa_serialize_ipc_stream",
+    "pa_deserialize_ipc_stream",
+    "pa_write_partitioned_parquet",
     "read_csv_bytes",
+    "ParquetSink",
 )
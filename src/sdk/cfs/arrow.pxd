@@ -1,17 +1,141 @@
+from libc.stdint cimport int64_t
 from pyarrow._csv cimport ConvertOptions, ReadOptions
 from pyarrow.lib cimport Table
 
 cpdef bint pa_file_exists(object fs, str file_path) except *
 
+cdef class FileInfoCache:
+    cdef:
+        int64_t _ttl_ns
+        Py_ssize_t _max_size
+        dict _entries
+
+    cpdef object get(self, str path)
+    cpdef void put(self, object info, str path = *) except *
+    cpdef void invalidate(self, str path = *) except *
+
+cdef list _list_parent_infos(object fs, str parent, list paths)
+
+cpdef list pa_get_file_infos(
+    object fs,
+    list paths,
+    FileInfoCache cache = *,
+    Py_ssize_t min_listing_size = *,
+)
+
+cpdef list pa_files_exist(
+    object fs,
+    list paths,
+    FileInfoCache cache = *,
+    Py_ssize_t min_listing_size = *,
+)
+
 cpdef Table read_csv_bytes(
     bytes content,
     ReadOptions read_options = *,
     ConvertOptions convert_options = *,
 )
 
+cpdef object pa_iter_csv_batches(
+    object source,
+    ReadOptions read_options = *,
+    ConvertOptions convert_options = *,
+)
+
 cpdef void pa_write_parquet_table(
     Table table,
     str path,
     object filesystem = *,
     str compression = *,
-)
\ No newline at end of file
+)
+cdef object _ipc_write_options(str compression)
+cdef list _as_batches(object data)
+
+cpdef void pa_write_ipc_file(
+    object data,
+    str path,
+    object filesystem = *,
+    str compression = *,
+)
+
+cpdef Table pa_read_ipc_file(
+    str path,
+    object filesystem = *,
+    bint memory_map = *,
+)
+
+cpdef object pa_serialize_ipc_stream(object data, str compression = *)
+cpdef Table pa_deserialize_ipc_stream(object buffer)
+
+cdef object _parquet_dataset(
+    str path, object filesystem, object partitioning, bint memory_map
+)
+cdef object _filter_expression(object dataset, object filters, tuple time_range)
+
+cpdef Table pa_read_parquet(
+    str path,
+    list columns = *,
+    object filters = *,
+    tuple time_range = *,
+    object filesystem = *,
+    object partitioning = *,
+    bint memory_map = *,
+    bint use_threads = *,
+)
+
+cpdef object pa_iter_parquet_batches(
+    str path,
+    list columns = *,
+    object filters = *,
+    tuple time_range = *,
+    object filesystem = *,
+    object partitioning = *,
+    Py_ssize_t batch_size = *,
+    bint memory_map = *,
+    bint use_threads = *,
+)
+
+cdef object _timestamp_buckets(object column, str ts_unit, int64_t bucket_ns)
+
+cpdef list pa_write_partitioned_parquet(
+    Table table,
+    str base_dir,
+    str timestamp_column,
+    str granularity = *,
+    str ts_unit = *,
+    object filesystem = *,
+    str compression = *,
+    object row_group_size = *,
+    str basename_template = *,
+)
+
+
+cdef class ParquetSink:
+    cdef:
+        str _directory
+        object _filesystem
+        object _schema
+        str _compression
+        str _basename_template
+        Py_ssize_t _row_group_size
+        Py_ssize_t _max_file_rows
+        Py_ssize_t _max_file_bytes
+        int64_t _max_file_age_ns
+        list _pending
+        Py_ssize_t _pending_rows
+        object _stream
+        object _writer
+        Py_ssize_t _file_rows
+        int64_t _file_opened_ns
+        Py_ssize_t _file_index
+        list _paths
+        bint _closed
+
+    cdef void _open_file(self) except *
+    cdef void _close_file(self) except *
+    cdef bint _should_roll(self) except -1
+    cdef void _write_row_groups(self, bint flush_all) except *
+
+    cpdef void write(self, object data) except *
+    cpdef void flush(self) except *
+    cpdef void close(self) except *
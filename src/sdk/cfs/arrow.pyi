@@ -1,10 +1,30 @@
-from typing import Optional
+from typing import Any, Iterator, List, Literal, Optional, Self, Tuple, Union
 
 import pyarrow as pa
 import pyarrow.csv as pacsv
+import pyarrow.dataset as pads
 import pyarrow.fs as pafs
 
+class FileInfoCache:
+    def __init__(self, ttl: float = 60.0, max_size: int = 0) -> None: ...
+    def __len__(self) -> int: ...
+    def get(self, path: str) -> Optional[pafs.FileInfo]: ...
+    def put(self, info: pafs.FileInfo, path: Optional[str] = None) -> None: ...
+    def invalidate(self, path: Optional[str] = None) -> None: ...
+
 def pa_file_exists(fs: pafs.FileSystem, file_path: str) -> bool: ...
+def pa_get_file_infos(
+    fs: pafs.FileSystem,
+    paths: List[str],
+    cache: Optional[FileInfoCache] = None,
+    min_listing_size: int = 0,
+) -> List[pafs.FileInfo]: ...
+def pa_files_exist(
+    fs: pafs.FileSystem,
+    paths: List[str],
+    cache: Optional[FileInfoCache] = None,
+    min_listing_size: int = 0,
+) -> List[bool]: ...
 def pa_write_parquet_table(
     table: pa.Table,
     path: str,
@@ -15,4 +35,84 @@ def read_csv_bytes(
     content: bytes,
     read_options: Optional[pacsv.ReadOptions] = None,
     convert_options: Optional[pacsv.ConvertOptions] = None,
-) -> pa.Table: ...
\ No newline at end of file
+) -> pa.Table: ...
+def pa_iter_csv_batches(
+    source: Any,
+    read_options: Optional[pacsv.ReadOptions] = None,
+    convert_options: Optional[pacsv.ConvertOptions] = None,
+) -> pacsv.CSVStreamingReader: ...
+def pa_write_ipc_file(
+    data: Union[pa.RecordBatch, pa.Table],
+    path: str,
+    filesystem: Optional[pafs.FileSystem] = None,
+    compression: Optional[Literal["lz4", "zstd"]] = None,
+) -> None: ...
+def pa_read_ipc_file(
+    path: str,
+    filesystem: Optional[pafs.FileSystem] = None,
+    memory_map: bool = True,
+) -> pa.Table: ...
+def pa_serialize_ipc_stream(
+    data: Union[pa.RecordBatch, pa.Table],
+    compression: Optional[Literal["lz4", "zstd"]] = None,
+) -> pa.Buffer: ...
+def pa_deserialize_ipc_stream(buffer: Any) -> pa.Table: ...
+def pa_read_parquet(
+    path: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Union[pads.Expression, List[Tuple[str, str, Any]]]] = None,
+    time_range: Optional[Tuple[str, Any, Any]] = None,
+    filesystem: Optional[pafs.FileSystem] = None,
+    partitioning: Optional[Union[str, pads.Partitioning]] = "hive",
+    memory_map: bool = True,
+    use_threads: bool = True,
+) -> pa.Table: ...
+def pa_iter_parquet_batches(
+    path: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Union[pads.Expression, List[Tuple[str, str, Any]]]] = None,
+    time_range: Optional[Tuple[str, Any, Any]] = None,
+    filesystem: Optional[pafs.FileSystem] = None,
+    partitioning: Optional[Union[str, pads.Partitioning]] = "hive",
+    batch_size: int = 131072,
+    memory_map: bool = True,
+    use_threads: bool = True,
+) -> Iterator[pa.RecordBatch]: ...
+def pa_write_partitioned_parquet(
+    table: pa.Table,
+    base_dir: str,
+    timestamp_column: str,
+    granularity: Literal["day", "hour", "minute"] = "hour",
+    ts_unit: Optional[Literal["ns", "us", "ms", "s"]] = None,
+    filesystem: Optional[pafs.FileSystem] = None,
+    compression: Optional[str] = "snappy",
+    row_group_size: Optional[int] = None,
+    basename_template: str = "part-{uuid}.parquet",
+) -> List[str]: ...
+
+class ParquetSink:
+    def __init__(
+        self,
+        directory: str,
+        filesystem: Optional[pafs.FileSystem] = None,
+        schema: Optional[pa.Schema] = None,
+        compression: Optional[str] = "snappy",
+        row_group_size: int = 1048576,
+        max_file_rows: int = 0,
+        max_file_bytes: int = 0,
+        max_file_age: float = 0.0,
+        basename_template: str = "part-{ts}-{i}.parquet",
+    ) -> None: ...
+    @property
+    def paths(self) -> List[str]: ...
+    @property
+    def schema(self) -> Optional[pa.Schema]: ...
+    @property
+    def pending_rows(self) -> int: ...
+    def __enter__(self) -> Self: ...
+    def __exit__(self, *args: object) -> None: ...
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, *args: object) -> None: ...
+    def write(self, data: Union[pa.RecordBatch, pa.Table]) -> None: ...
+    def flush(self) -> None: ...
+    def close(self) -> None: ...
@@ -1,7 +1,14 @@
 import io
+import os
+import posixpath
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.csv as pacsv
+import pyarrow.dataset as pads
+import pyarrow.fs as pafs
 import pyarrow.parquet as pq
 
+from libc.stdint cimport int64_t
 from libcpp.memory cimport shared_ptr
 from pyarrow._csv cimport ConvertOptions, ReadOptions
 from pyarrow._fs cimport FileSystem
@@ -10,6 +17,19 @@ from pyarrow.includes.libarrow_fs cimport CFileSystem
 
 from pyarrow.lib cimport Table
 
+from ..ctime import change_ts_units, clock_monotonic, clock_realtime, ns_to_datetime
+from ..cuuid import uuid4
+
+DEF NS_PER_SECOND = 1000000000
+DEF DEFAULT_ROW_GROUP_SIZE = 1048576
+
+# Partition granularity -> (bucket width in ns, hive path strftime format)
+cdef dict _PARTITION_GRANULARITIES = {
+    "day": (86400 * NS_PER_SECOND, "date=%Y-%m-%d"),
+    "hour": (3600 * NS_PER_SECOND, "date=%Y-%m-%d/hour=%H"),
+    "minute": (60 * NS_PER_SECOND, "date=%Y-%m-%d/hour=%H/minute=%M"),
+}
+
 
 cpdef bint pa_file_exists(object fs, str file_path) except *:
     cdef shared_ptr[CFileSystem] c_fs
@@ -30,6 +50,140 @@ cpdef bint pa_file_exists(object fs, str file_path) except *:
         raise RuntimeError(f"Error checking file existence: {e}")
 
 
+cdef class FileInfoCache:
+    """
+    TTL cache of ``pyarrow.fs.FileInfo`` results keyed by path.
+
+    Negative results (``FileType.NotFound``) are cached too, so repeated
+    existence checks of missing paths do not hit the filesystem either.
+    """
+
+    def __cinit__(self, double ttl = 60.0, Py_ssize_t max_size = 0):
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self._ttl_ns = <int64_t>(ttl * NS_PER_SECOND)
+        self._max_size = max_size
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    cpdef object get(self, str path):
+        cdef tuple entry = self._entries.get(path)
+        if entry is None:
+            return None
+        if clock_monotonic() >= <int64_t>entry[0]:
+            del self._entries[path]
+            return None
+        return entry[1]
+
+    cpdef void put(self, object info, str path = None) except *:
+        # ``path`` keys the entry when it differs from ``info.path`` (as requested)
+        if path is None:
+            path = info.path
+        if (
+            self._max_size
+            and len(self._entries) >= self._max_size
+            and path not in self._entries
+        ):
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[path] = (clock_monotonic() + self._ttl_ns, info)
+
+    cpdef void invalidate(self, str path = None) except *:
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(path, None)
+
+
+cdef list _list_parent_infos(object fs, str parent, list paths):
+    # One listing round trip instead of one GetFileInfo per path
+    cdef dict listed
+    try:
+        listed = {
+            info.path: info
+            for info in fs.get_file_info(
+                pafs.FileSelector(parent, allow_not_found=True)
+            )
+        }
+    except OSError:
+        return fs.get_file_info(paths)
+    return [
+        listed.get(path) or pafs.FileInfo(path, type=pafs.FileType.NotFound)
+        for path in paths
+    ]
+
+
+cpdef list pa_get_file_infos(
+    object fs,
+    list paths,
+    FileInfoCache cache = None,
+    Py_ssize_t min_listing_size = 0,
+):
+    cdef list infos = [None] * len(paths)
+    cdef list missing = []
+    cdef dict by_parent = {}
+    cdef Py_ssize_t i
+    cdef str path, parent
+
+    if not isinstance(fs, FileSystem):
+        raise TypeError("fs must be a pyarrow.fs.FileSystem instance")
+
+    for i, path in enumerate(paths):
+        if cache is not None:
+            infos[i] = cache.get(path)
+            if infos[i] is not None:
+                continue
+        missing.append(i)
+
+    if not missing:
+        return infos
+
+    cdef list fetched = missing
+
+    if min_listing_size > 0:
+        missing = []
+        for i in fetched:
+            path = paths[i]
+            # Listings return normalized paths; others are looked up directly
+            if path != posixpath.normpath(path):
+                missing.append(i)
+                continue
+            parent = path.rpartition("/")[0]
+            by_parent.setdefault(parent, []).append(i)
+        for parent, indices in by_parent.items():
+            if len(indices) < min_listing_size:
+                missing.extend(indices)
+                continue
+            for i, info in zip(
+                indices, _list_parent_infos(fs, parent, [paths[i] for i in indices])
+            ):
+                infos[i] = info
+
+    if missing:
+        # Vectorized GetFileInfo: a single call for the whole batch
+        for i, info in zip(missing, fs.get_file_info([paths[i] for i in missing])):
+            infos[i] = info
+
+    if cache is not None:
+        # Only fresh results: re-putting cache hits would extend their TTL
+        for i in fetched:
+            cache.put(infos[i], paths[i])
+    return infos
+
+
+cpdef list pa_files_exist(
+    object fs,
+    list paths,
+    FileInfoCache cache = None,
+    Py_ssize_t min_listing_size = 0,
+):
+    return [
+        info.type != pafs.FileType.NotFound
+        for info in pa_get_file_infos(fs, paths, cache, min_listing_size)
+    ]
+
+
 cpdef Table read_csv_bytes(
     bytes content,
     ReadOptions read_options = None,
@@ -48,6 +202,18 @@ cpdef Table read_csv_bytes(
         convert_options=convert_options
     )
 
+cpdef object pa_iter_csv_batches(
+    object source,
+    ReadOptions read_options = None,
+    ConvertOptions convert_options = None,
+):
+    # Streaming reader: parses one block at a time instead of the whole input
+    return pacsv.open_csv(
+        source,
+        read_options=read_options,
+        convert_options=convert_options,
+    )
+
 cpdef void pa_write_parquet_table(
     Table table,
     str path,
@@ -59,4 +225,425 @@ cpdef void pa_write_parquet_table(
             path,
             filesystem=filesystem,
             compression=compression
-        )
\ No newline at end of file
+        )
+
+
+cdef object _ipc_write_options(str compression):
+    # compression: None, "lz4" or "zstd" (Arrow IPC buffer compression)
+    return pa.ipc.IpcWriteOptions(compression=compression)
+
+
+cdef list _as_batches(object data):
+    if isinstance(data, pa.RecordBatch):
+        return [data]
+    if isinstance(data, pa.Table):
+        return data.to_batches()
+    raise TypeError("data must be a pyarrow.RecordBatch or pyarrow.Table")
+
+
+cpdef void pa_write_ipc_file(
+    object data,
+    str path,
+    object filesystem = None,
+    str compression = None,
+):
+    cdef list batches = _as_batches(data)
+
+    if filesystem is None:
+        sink = pa.OSFile(path, "wb")
+    else:
+        sink = filesystem.open_output_stream(path)
+    with sink:
+        with pa.ipc.new_file(
+            sink, data.schema, options=_ipc_write_options(compression)
+        ) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+
+
+cpdef Table pa_read_ipc_file(
+    str path,
+    object filesystem = None,
+    bint memory_map = True,
+):
+    if filesystem is None and memory_map:
+        # Uncompressed buffers are returned as views into the mapping
+        source = pa.memory_map(path, "r")
+    elif filesystem is None:
+        source = pa.OSFile(path, "rb")
+    else:
+        source = filesystem.open_input_file(path)
+    with source:
+        return pa.ipc.open_file(source).read_all()
+
+
+cpdef object pa_serialize_ipc_stream(object data, str compression = None):
+    cdef list batches = _as_batches(data)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(
+        sink, data.schema, options=_ipc_write_options(compression)
+    ) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+    return sink.getvalue()
+
+
+cpdef Table pa_deserialize_ipc_stream(object buffer):
+    # Wraps (does not copy) any buffer-protocol object, e.g. a zmq.Frame buffer
+    return pa.ipc.open_stream(pa.py_buffer(buffer)).read_all()
+
+
+cdef object _parquet_dataset(
+    str path, object filesystem, object partitioning, bint memory_map
+):
+    if filesystem is None:
+        filesystem = pafs.LocalFileSystem(use_mmap=memory_map)
+        path = os.path.abspath(path)
+    return pads.dataset(
+        path, format="parquet", filesystem=filesystem, partitioning=partitioning
+    )
+
+
+cdef object _filter_expression(object dataset, object filters, tuple time_range):
+    cdef object expression = None
+    cdef object field_type
+
+    if filters is not None:
+        expression = (
+            filters
+            if isinstance(filters, pads.Expression)
+            else pq.filters_to_expression(filters)
+        )
+
+    if time_range is not None:
+        column, start, end = time_range
+        # Accepts int timestamps (in the column's unit) as well as datetimes
+        field_type = dataset.schema.field(column).type
+        if start is not None:
+            start = pads.field(column) >= pa.scalar(start, type=field_type)
+            expression = start if expression is None else expression & start
+        if end is not None:
+            end = pads.field(column) < pa.scalar(end, type=field_type)
+            expression = end if expression is None else expression & end
+
+    return expression
+
+
+cpdef Table pa_read_parquet(
+    str path,
+    list columns = None,
+    object filters = None,
+    tuple time_range = None,
+    object filesystem = None,
+    object partitioning = "hive",
+    bint memory_map = True,
+    bint use_threads = True,
+):
+    dataset = _parquet_dataset(path, filesystem, partitioning, memory_map)
+    # Row groups whose statistics cannot match the filter are never read
+    return dataset.to_table(
+        columns=columns,
+        filter=_filter_expression(dataset, filters, time_range),
+        use_threads=use_threads,
+    )
+
+
+cpdef object pa_iter_parquet_batches(
+    str path,
+    list columns = None,
+    object filters = None,
+    tuple time_range = None,
+    object filesystem = None,
+    object partitioning = "hive",
+    Py_ssize_t batch_size = 131072,
+    bint memory_map = True,
+    bint use_threads = True,
+):
+    dataset = _parquet_dataset(path, filesystem, partitioning, memory_map)
+    return dataset.to_batches(
+        columns=columns,
+        filter=_filter_expression(dataset, filters, time_range),
+        batch_size=batch_size,
+        use_threads=use_threads,
+    )
+
+
+cdef object _timestamp_buckets(object column, str ts_unit, int64_t bucket_ns):
+    cdef int64_t bucket_width
+
+    if pa.types.is_timestamp(column.type):
+        ts_unit = column.type.unit
+    elif not pa.types.is_integer(column.type):
+        raise TypeError("timestamp column must be a timestamp or integer column")
+    elif ts_unit is None:
+        ts_unit = "ns"
+
+    if column.null_count:
+        raise ValueError("timestamp column must not contain nulls")
+
+    # Bucket in the column's own unit so no per-row rescaling is needed
+    bucket_width = change_ts_units(bucket_ns, "ns", ts_unit)
+    values = column.cast(pa.int64())
+    # Floor (not truncating) division so pre-epoch rows land in the right bucket
+    values = pc.if_else(
+        pc.less(values, 0), pc.subtract(values, bucket_width - 1), values
+    )
+    return pc.multiply(pc.divide(values, bucket_width), bucket_width), ts_unit
+
+
+cpdef list pa_write_partitioned_parquet(
+    Table table,
+    str base_dir,
+    str timestamp_column,
+    str granularity = "hour",
+    str ts_unit = None,
+    object filesystem = None,
+    str compression = "snappy",
+    object row_group_size = None,
+    str basename_template = "part-{uuid}.parquet",
+):
+    cdef int64_t bucket_ns
+    cdef str path_format, partition_dir, path
+    cdef list paths = []
+    cdef Py_ssize_t start = 0, end
+
+    try:
+        bucket_ns, path_format = _PARTITION_GRANULARITIES[granularity]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported granularity: {granularity}, "
+            f"expected one of {tuple(_PARTITION_GRANULARITIES)}"
+        )
+
+    if filesystem is None:
+        filesystem = pafs.LocalFileSystem()
+        base_dir = os.path.abspath(base_dir)
+    base_dir = base_dir.rstrip("/")
+
+    if table.num_rows == 0:
+        return paths
+
+    buckets, ts_unit = _timestamp_buckets(
+        table.column(timestamp_column), ts_unit, bucket_ns
+    )
+    order = pc.sort_indices(buckets)
+    table = table.take(order)
+    runs = pc.run_end_encode(
+        buckets.take(order).combine_chunks(), run_end_type=pa.int64()
+    )
+
+    for bucket, run_end in zip(runs.values.to_pylist(), runs.run_ends.to_pylist()):
+        end = run_end
+        partition_dir = f"{base_dir}/" + ns_to_datetime(
+            change_ts_units(bucket, ts_unit, "ns")
+        ).strftime(path_format)
+        path = f"{partition_dir}/" + basename_template.format(
+            uuid=uuid4().hex, i=len(paths)
+        )
+
+        filesystem.create_dir(partition_dir, recursive=True)
+        pq.write_table(
+            table.slice(start, end - start),
+            path,
+            filesystem=filesystem,
+            compression=compression,
+            row_group_size=row_group_size,
+        )
+        paths.append(path)
+        start = end
+
+    return paths
+
+
+cdef class ParquetSink:
+    """
+    Incremental Parquet writer.
+
+    Buffers incoming RecordBatches/Tables into row groups of ``row_group_size``
+    rows and rolls to a new file under ``directory`` once ``max_file_rows``,
+    ``max_file_bytes`` or ``max_file_age`` (seconds) is reached.
+    """
+
+    def __cinit__(
+        self,
+        str directory,
+        object filesystem = None,
+        object schema = None,
+        str compression = "snappy",
+        Py_ssize_t row_group_size = DEFAULT_ROW_GROUP_SIZE,
+        Py_ssize_t max_file_rows = 0,
+        Py_ssize_t max_file_bytes = 0,
+        double max_file_age = 0.0,
+        str basename_template = "part-{ts}-{i}.parquet",
+    ):
+        if row_group_size <= 0:
+            raise ValueError("row_group_size must be positive")
+        if max_file_rows < 0 or max_file_bytes < 0 or max_file_age < 0:
+            raise ValueError("File rolling limits must be non-negative")
+
+        if filesystem is None:
+            filesystem = pafs.LocalFileSystem()
+            directory = os.path.abspath(directory)
+        elif not isinstance(filesystem, FileSystem):
+            raise TypeError("filesystem must be a pyarrow.fs.FileSystem instance")
+
+        self._directory = directory.rstrip("/")
+        self._filesystem = filesystem
+        self._schema = schema
+        self._compression = compression
+        self._basename_template = basename_template
+        self._row_group_size = row_group_size
+        self._max_file_rows = max_file_rows
+        self._max_file_bytes = max_file_bytes
+        self._max_file_age_ns = <int64_t>(max_file_age * NS_PER_SECOND)
+
+        self._pending = []
+        self._pending_rows = 0
+        self._stream = None
+        self._writer = None
+        self._file_rows = 0
+        self._file_opened_ns = 0
+        self._file_index = 0
+        self._paths = []
+        self._closed = False
+
+        self._filesystem.create_dir(self._directory, recursive=True)
+
+    @property
+    def paths(self):
+        return list(self._paths)
+
+    @property
+    def schema(self):
+        return self._schema
+
+    @property
+    def pending_rows(self):
+        return self._pending_rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    cdef void _open_file(self) except *:
+        cdef str basename = self._basename_template.format(
+            ts=clock_realtime(), i=self._file_index
+        )
+        cdef str path = f"{self._directory}/{basename}"
+
+        self._stream = self._filesystem.open_output_stream(path)
+        self._writer = pq.ParquetWriter(
+            self._stream, self._schema, compression=self._compression
+        )
+        self._paths.append(path)
+        self._file_index += 1
+        self._file_rows = 0
+        self._file_opened_ns = clock_monotonic()
+
+    cdef void _close_file(self) except *:
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._stream.close()
+        self._writer = None
+        self._stream = None
+
+    cdef bint _should_roll(self) except -1:
+        if self._writer is None:
+            return False
+        if self._max_file_rows and self._file_rows >= self._max_file_rows:
+            return True
+        if self._max_file_bytes and self._stream.tell() >= self._max_file_bytes:
+            return True
+        if (
+            self._max_file_age_ns
+            and clock_monotonic() - self._file_opened_ns >= self._max_file_age_ns
+        ):
+            return True
+        return False
+
+    cdef void _write_row_groups(self, bint flush_all) except *:
+        cdef Table table
+        cdef Py_ssize_t offset = 0
+        cdef Py_ssize_t n_rows
+
+        if self._pending_rows == 0:
+            return
+        if not flush_all and self._pending_rows < self._row_group_size:
+            return
+
+        table = pa.Table.from_batches(self._pending, schema=self._schema)
+        self._pending = []
+        self._pending_rows = 0
+
+        while offset < table.num_rows:
+            if not flush_all and table.num_rows - offset < self._row_group_size:
+                break
+            if self._should_roll():
+                self._close_file()
+            if self._writer is None:
+                self._open_file()
+
+            n_rows = min(self._row_group_size, table.num_rows - offset)
+            if self._max_file_rows:
+                n_rows = min(n_rows, self._max_file_rows - self._file_rows)
+
+            self._writer.write_table(
+                table.slice(offset, n_rows), row_group_size=n_rows
+            )
+            self._file_rows += n_rows
+            offset += n_rows
+
+        if offset < table.num_rows:
+            # Keep the remainder buffered until it fills a whole row group
+            self._pending = table.slice(offset).to_batches()
+            self._pending_rows = table.num_rows - offset
+
+    cpdef void write(self, object data) except *:
+        cdef list batches
+
+        if self._closed:
+            raise ValueError("ParquetSink is closed")
+
+        if isinstance(data, pa.RecordBatch):
+            batches = [data]
+        elif isinstance(data, pa.Table):
+            batches = data.to_batches()
+        else:
+            raise TypeError("data must be a pyarrow.RecordBatch or pyarrow.Table")
+
+        if self._schema is None:
+            self._schema = data.schema
+        elif not data.schema.equals(self._schema):
+            raise ValueError("data schema does not match the sink schema")
+
+        for batch in batches:
+            if batch.num_rows:
+                self._pending.append(batch)
+                self._pending_rows += batch.num_rows
+
+        self._write_row_groups(False)
+
+        # Roll on the time window even when no full row group was written
+        if self._should_roll():
+            self._close_file()
+
+    cpdef void flush(self) except *:
+        self._write_row_groups(True)
+
+    cpdef void close(self) except *:
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._close_file()
+            self._closed = True
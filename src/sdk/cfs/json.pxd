@@ -15,4 +15,5 @@ cdef object parse_json_file(FILE* cfile)
 cdef write_json_value(FILE* cfile, object value, int indent)  # Remove except -1 for Python objects
 
 cpdef read_json(str file_path)
+cpdef read_json_bytes(object data)
 cpdef write_json(str file_path, object data)
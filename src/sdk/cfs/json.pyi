@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, Union
 
 def read_json(file_path: str) -> Dict[str, Any]:
     """
@@ -15,6 +15,21 @@ def read_json(file_path: str) -> Dict[str, Any]:
     """
     ...
 
+def read_json_bytes(data: Union[bytes, str, memoryview]) -> Any:
+    """
+    Parse a JSON document held in memory.
+
+    Args:
+        data: Encoded JSON document, or a str
+
+    Returns:
+        The parsed value
+
+    Raises:
+        ValueError: If the document is malformed or has trailing content
+    """
+    ...
+
 def write_json(file_path: str, data: Dict[str, Any]) -> None:
     """
     Write a dictionary to a JSON file.
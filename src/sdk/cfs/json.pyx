@@ -213,6 +213,21 @@ cpdef read_json(str file_path):
     
     return result
 
+cpdef read_json_bytes(object data):
+    cdef:
+        bytes encoded = data.encode('utf-8') if isinstance(data, str) else bytes(data)
+        const char* end_ptr
+        object result
+
+    # bytes objects are NUL-terminated, as parse_json_value expects
+    result = parse_json_value(encoded, &end_ptr)
+    while end_ptr[0] == b' ' or end_ptr[0] == b'\t' or end_ptr[0] == b'\n' or end_ptr[0] == b'\r':
+        end_ptr += 1
+    if end_ptr[0] != b'\0':
+        raise ValueError("Trailing content after JSON value")
+    return result
+
+
 
 cdef write_json_value(FILE* cfile, object value, int indent):
     cdef:
@@ -1,42 +1,101 @@
 from typing import Tuple
 
+from .broker import ZMQBroker, ZMQClient, ZMQWorker
+from .codec import Codec, JSONCodec, StructCodec
 from .http import (
+    HTTPCache,
     HTTPClient,
     HTTPMethods,
+    HTTPPoolOptions,
+    HTTPRateLimit,
+    HTTPRateLimiter,
+    HTTPStreamResponse,
     HTTPRequest,
     HTTPResponse,
+    HTTPRetryPolicy,
+    TokenBucket,
     verify_http_status_code,
 )
+from .pool import ZMQWorkerPool
+from .pubsub import (
+    TopicTrie,
+    ZMQConflatingSubscriber,
+    ZMQSequencedPublisher,
+    ZMQSequencedSubscriber,
+    ZMQSnapshotServer,
+    ZMQTopicDispatcher,
+)
+from .shm import ShmPull, ShmPush, ShmRing
+from .trace import LatencyHistogram, MessageTracer
 from .zmq import (
+    SendStatus,
+    ZMQContext,
+    ZMQPoller,
     ZMQSocket,
+    ZMQSocketOptions,
     ZMQPublisher,
     ZMQSubscriber,
     ZMQRouter,
     ZMQDealer,
     ZMQPush,
     ZMQPull,
+    wait_sent,
 )
 
 from .parameters import (
     AbstractSocketParameters,
     TCPSocketParameters,
+    IPCSocketParameters,
+    InprocSocketParameters,
     PGConnectionParameters,
 )
 
 __all__: Tuple[str, ...] = (
+    "Codec",
+    "JSONCodec",
+    "StructCodec",
     "HTTPResponse",
+    "HTTPRetryPolicy",
     "HTTPMethods",
+    "HTTPCache",
     "HTTPClient",
+    "HTTPPoolOptions",
+    "HTTPRateLimit",
+    "HTTPRateLimiter",
+    "HTTPStreamResponse",
     "HTTPRequest",
+    "TokenBucket",
     "verify_http_status_code",
     "AbstractSocketParameters",
     "TCPSocketParameters",
+    "IPCSocketParameters",
+    "InprocSocketParameters",
+    "LatencyHistogram",
+    "MessageTracer",
+    "SendStatus",
+    "ShmPull",
+    "ShmPush",
+    "ShmRing",
+    "TopicTrie",
+    "ZMQBroker",
+    "ZMQClient",
+    "ZMQConflatingSubscriber",
+    "ZMQContext",
+    "ZMQPoller",
+    "ZMQSequencedPublisher",
+    "ZMQSequencedSubscriber",
+    "ZMQSnapshotServer",
     "ZMQSocket",
+    "ZMQSocketOptions",
     "ZMQPublisher",
     "ZMQSubscriber",
+    "ZMQTopicDispatcher",
     "ZMQRouter",
     "ZMQDealer",
     "ZMQPush",
     "ZMQPull",
+    "ZMQWorker",
+    "ZMQWorkerPool",
+    "wait_sent",
     "PGConnectionParameters",
 )
@@ -0,0 +1,68 @@
+from typing import Any, Awaitable, Callable, List, Optional, Self
+
+from .parameters import AbstractSocketParameters
+from .zmq import ZMQContext, ZMQSocketOptions
+
+READY: bytes
+HEARTBEAT: bytes
+TASK: bytes
+RESULT: bytes
+FAILED: bytes
+SUBMIT: bytes
+
+class ZMQBroker(object):
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        heartbeat_interval: float = 1.0,
+        heartbeat_liveness: int = 3,
+        task_timeout: float = 30.0,
+        max_retries: int = 3,
+        batch_size: int = 1024,
+    ) -> None: ...
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None: ...
+    @property
+    def workers(self) -> int: ...
+    @property
+    def pending(self) -> int: ...
+    @property
+    def inflight(self) -> int: ...
+    def stop(self) -> None: ...
+    async def run(self) -> None: ...
+
+class ZMQWorker(object):
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        handler: Callable[[List[bytes]], Awaitable[List[bytes]]],
+        credit: int = 1,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        heartbeat_interval: float = 1.0,
+        heartbeat_liveness: int = 3,
+        batch_size: int = 1024,
+    ) -> None: ...
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None: ...
+    @property
+    def completed(self) -> int: ...
+    def stop(self) -> None: ...
+    async def run(self) -> None: ...
+
+class ZMQClient(object):
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        batch_size: int = 1024,
+    ) -> None: ...
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None: ...
+    async def submit(
+        self, payload: List[bytes], timeout: Optional[float] = None
+    ) -> List[bytes]: ...
+    async def submit_many(self, payloads: List[List[bytes]]) -> List[List[bytes]]: ...
@@ -0,0 +1,354 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Self, Tuple
+
+import asyncio
+from collections import deque
+
+from .parameters import AbstractSocketParameters
+from .zmq import ZMQContext, ZMQDealer, ZMQRouter, ZMQSocketOptions
+
+from ..ctime import clock_monotonic
+
+# Wire protocol: the first frame after the routing identity is a 1-byte command
+#   worker -> broker: READY credit | HEARTBEAT | RESULT client task *payload
+#                     | FAILED client task reason
+#   broker -> worker: TASK client task *payload | HEARTBEAT
+#   client -> broker: SUBMIT task *payload
+#   broker -> client: RESULT task *payload | FAILED task reason
+READY = b"\x01"
+HEARTBEAT = b"\x02"
+TASK = b"\x03"
+RESULT = b"\x04"
+FAILED = b"\x05"
+SUBMIT = b"\x06"
+
+DEF NS_PER_SECOND = 1000000000
+
+
+class ZMQBroker(object):
+    """
+    Load-balancing task broker on a ZMQRouter.
+
+    Workers advertise credit (how many tasks they run at once); each unit of
+    credit is one entry in an LRU queue, so tasks go to the least recently
+    used worker with spare capacity. In-flight tasks that exceed
+    ``task_timeout`` or whose worker stops heartbeating are re-dispatched up
+    to ``max_retries`` times before the client is told they failed.
+    """
+
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        heartbeat_interval: float = 1.0,
+        heartbeat_liveness: int = 3,
+        task_timeout: float = 30.0,
+        max_retries: int = 3,
+        batch_size: int = 1024,
+    ):
+        self._router = ZMQRouter(socket_parameters, context=context, options=options)
+        self._heartbeat_interval: float = heartbeat_interval
+        self._heartbeat_ns: int = int(heartbeat_interval * NS_PER_SECOND)
+        self._worker_expiry_ns: int = self._heartbeat_ns * heartbeat_liveness
+        self._task_timeout_ns: int = int(task_timeout * NS_PER_SECOND)
+        self._max_retries: int = max_retries
+        self._batch_size: int = batch_size
+
+        # worker id -> last time it was heard from
+        self._workers: Dict[bytes, int] = {}
+        # one entry per unit of free worker credit, least recently used first
+        self._ready: deque = deque()
+        # (client id, task id, payload, retries) waiting for worker credit
+        self._pending: deque = deque()
+        # (client id, task id) -> [worker id, client id, task id, payload, retries, deadline]
+        self._inflight: Dict[Tuple[bytes, bytes], list] = {}
+        self._outgoing: List[List[bytes]] = []
+        self._running: bool = False
+        self._last_heartbeat: int = 0
+
+    async def __aenter__(self) -> Self:
+        await self._router.__aenter__()
+        return self
+
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        self.stop()
+        await self._router.__aexit__(*args, **kwargs)
+
+    @property
+    def workers(self) -> int:
+        return len(self._workers)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def stop(self) -> None:
+        self._running = False
+
+    async def run(self) -> None:
+        self._running = True
+        while self._running:
+            messages = await self._router.recv_batch(
+                self._batch_size, timeout=self._heartbeat_interval
+            )
+            now = clock_monotonic()
+            for message in messages:
+                self._handle(message, now)
+            if now - self._last_heartbeat >= self._heartbeat_ns:
+                self._heartbeat(now)
+            self._dispatch(now)
+            if self._outgoing:
+                outgoing, self._outgoing = self._outgoing, []
+                await self._router.send_batch(outgoing)
+
+    def _handle(self, message: List[bytes], now: int) -> None:
+        # Modules are built without bounds checks: check frame counts before indexing
+        cdef Py_ssize_t size = len(message)
+        if size < 2:
+            return
+        sender = message[0]
+        command = message[1]
+
+        if command == SUBMIT:
+            if size >= 3:
+                self._pending.append((sender, message[2], message[3:], 0))
+            return
+
+        if command == READY:
+            if size < 3:
+                return
+            if sender not in self._workers:
+                self._ready.extend([sender] * int.from_bytes(message[2], "big"))
+        elif command == RESULT or command == FAILED:
+            if size < 4:
+                return
+            entry = self._inflight.pop((message[2], message[3]), None)
+            if entry is not None:
+                self._outgoing.append([message[2], command, message[3]] + message[4:])
+            if sender not in self._workers:
+                return
+            self._ready.append(sender)
+        elif sender not in self._workers:
+            # Heartbeat from a worker that was expired; it must send READY again
+            return
+        self._workers[sender] = now
+
+    def _heartbeat(self, now: int) -> None:
+        self._last_heartbeat = now
+        for worker, last_seen in list(self._workers.items()):
+            if now - last_seen > self._worker_expiry_ns:
+                self._expire(worker)
+            else:
+                self._outgoing.append([worker, HEARTBEAT])
+
+        # Deadlines are monotonic in dispatch order, so stop at the first live one
+        expired = []
+        for key, entry in self._inflight.items():
+            if entry[5] > now:
+                break
+            expired.append(key)
+        for key in expired:
+            self._retry(self._inflight.pop(key))
+
+    def _expire(self, worker: bytes) -> None:
+        del self._workers[worker]
+        self._ready = deque(w for w in self._ready if w != worker)
+        lost = [key for key, entry in self._inflight.items() if entry[0] == worker]
+        for key in lost:
+            self._retry(self._inflight.pop(key))
+
+    def _retry(self, entry: list) -> None:
+        worker, client, task_id, payload, retries, deadline = entry
+        if retries >= self._max_retries:
+            self._outgoing.append([client, FAILED, task_id, b"max retries exceeded"])
+        else:
+            self._pending.appendleft((client, task_id, payload, retries + 1))
+
+    def _dispatch(self, now: int) -> None:
+        deadline = now + self._task_timeout_ns
+        while self._pending and self._ready:
+            worker = self._ready.popleft()
+            if worker not in self._workers:
+                continue
+            client, task_id, payload, retries = self._pending.popleft()
+            self._inflight[(client, task_id)] = [
+                worker, client, task_id, payload, retries, deadline
+            ]
+            self._outgoing.append([worker, TASK, client, task_id] + payload)
+
+
+class ZMQWorker(object):
+    """
+    ZMQDealer worker for ZMQBroker.
+
+    ``handler`` receives the task payload frames and returns the result
+    frames; up to ``credit`` handlers run concurrently.
+    """
+
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        handler: Callable[[List[bytes]], Awaitable[List[bytes]]],
+        credit: int = 1,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        heartbeat_interval: float = 1.0,
+        heartbeat_liveness: int = 3,
+        batch_size: int = 1024,
+    ):
+        if credit <= 0:
+            raise ValueError("credit must be positive")
+        self._socket_parameters = socket_parameters
+        self._context = context
+        self._options = options
+        self._handler = handler
+        self._credit: int = credit
+        self._heartbeat_interval: float = heartbeat_interval
+        self._heartbeat_ns: int = int(heartbeat_interval * NS_PER_SECOND)
+        self._broker_expiry_ns: int = self._heartbeat_ns * heartbeat_liveness
+        self._batch_size: int = batch_size
+
+        self._dealer: ZMQDealer = None
+        self._tasks: set = set()
+        self._running: bool = False
+        self._last_sent: int = 0
+        self._last_received: int = 0
+        self._completed: int = 0
+
+    async def __aenter__(self) -> Self:
+        await self._connect()
+        return self
+
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        self.stop()
+        await self._disconnect()
+
+    @property
+    def completed(self) -> int:
+        return self._completed
+
+    def stop(self) -> None:
+        self._running = False
+
+    async def _connect(self) -> None:
+        self._dealer = ZMQDealer(
+            self._socket_parameters, context=self._context, options=self._options
+        )
+        await self._dealer.__aenter__()
+        self._last_received = self._last_sent = clock_monotonic()
+        await self._dealer.send_multipart([READY, self._credit.to_bytes(4, "big")])
+
+    async def _disconnect(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        await self._dealer.__aexit__(None, None, None)
+
+    async def _process(self, client: bytes, task_id: bytes, payload: List[bytes]) -> None:
+        try:
+            reply = [RESULT, client, task_id] + list(await self._handler(payload))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            reply = [FAILED, client, task_id, str(e).encode()]
+        await self._dealer.send_multipart(reply)
+        self._last_sent = clock_monotonic()
+        self._completed += 1
+
+    async def run(self) -> None:
+        self._running = True
+        while self._running:
+            messages = await self._dealer.recv_batch(
+                self._batch_size, timeout=self._heartbeat_interval
+            )
+            now = clock_monotonic()
+            if messages:
+                self._last_received = now
+            for message in messages:
+                if len(message) >= 3 and message[0] == TASK:
+                    task = asyncio.create_task(
+                        self._process(message[1], message[2], message[3:])
+                    )
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+
+            if now - self._last_received > self._broker_expiry_ns:
+                # Broker is gone: start over with a fresh identity and full credit
+                await self._disconnect()
+                await self._connect()
+            elif now - self._last_sent >= self._heartbeat_ns:
+                await self._dealer.send_multipart([HEARTBEAT])
+                self._last_sent = now
+
+
+class ZMQClient(object):
+    """ZMQDealer client that submits tasks to a ZMQBroker and awaits results."""
+
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        batch_size: int = 1024,
+    ):
+        self._dealer = ZMQDealer(socket_parameters, context=context, options=options)
+        self._batch_size: int = batch_size
+        self._futures: Dict[bytes, asyncio.Future] = {}
+        self._next_id: int = 0
+        self._reader: asyncio.Task = None
+
+    async def __aenter__(self) -> Self:
+        await self._dealer.__aenter__()
+        self._reader = asyncio.create_task(self._read())
+        return self
+
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        self._reader.cancel()
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        await self._dealer.__aexit__(*args, **kwargs)
+
+    async def _read(self) -> None:
+        while True:
+            for message in await self._dealer.recv_batch(self._batch_size):
+                if len(message) < 2:
+                    continue
+                future = self._futures.pop(message[1], None)
+                if future is None or future.done():
+                    continue
+                if message[0] == RESULT:
+                    future.set_result(message[2:])
+                else:
+                    reason = message[2].decode() if len(message) > 2 else "unknown error"
+                    future.set_exception(RuntimeError(f"Task failed: {reason}"))
+
+    def _submit(self, payload: List[bytes]) -> Tuple[asyncio.Future, List[bytes]]:
+        task_id = self._next_id.to_bytes(8, "big")
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._futures[task_id] = future
+        return future, [SUBMIT, task_id] + list(payload)
+
+    async def submit(
+        self, payload: List[bytes], timeout: Optional[float] = None
+    ) -> List[bytes]:
+        future, message = self._submit(payload)
+        await self._dealer.send_multipart(message)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._futures.pop(message[1], None)
+
+    async def submit_many(self, payloads: List[List[bytes]]) -> List[List[bytes]]:
+        futures, messages = [], []
+        for payload in payloads:
+            future, message = self._submit(payload)
+            futures.append(future)
+            messages.append(message)
+        await self._dealer.send_batch(messages)
+        return list(await asyncio.gather(*futures))
@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+FIXED_TYPES: Dict[str, str]
+VARIABLE_TYPES: Dict[str, int]
+
+class Codec(ABC):
+    @abstractmethod
+    def encode(self, obj: Any) -> bytes: ...
+    @abstractmethod
+    def decode(self, data: Any) -> Any: ...
+
+class StructCodec(Codec):
+    def __init__(
+        self,
+        fields: Sequence[Tuple[str, str]],
+        factory: Optional[Callable[..., Any]] = None,
+    ) -> None: ...
+    @property
+    def fields(self) -> Tuple[str, ...]: ...
+    @property
+    def fixed_size(self) -> int: ...
+    def encode(self, obj: Any) -> bytes: ...
+    def decode(self, data: Any) -> Any: ...
+
+class JSONCodec(Codec):
+    def __init__(
+        self,
+        loads: Optional[Callable[[Any], Any]] = None,
+        dumps: Optional[Callable[[Any], bytes]] = None,
+    ) -> None: ...
+    @classmethod
+    def in_house(cls) -> "JSONCodec": ...
+    def encode(self, obj: Any) -> bytes: ...
+    def decode(self, data: Any) -> Any: ...
@@ -0,0 +1,231 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import json
+import struct
+from abc import ABC, abstractmethod
+
+from cpython.bytes cimport PyBytes_FromStringAndSize
+from libc.stdint cimport int64_t, uint64_t
+
+from ..cuuid import UUID
+
+DEF KIND_VARINT = 0
+DEF KIND_UVARINT = 1
+DEF KIND_STR = 2
+DEF KIND_BYTES = 3
+
+# Fixed-layout field types and their little-endian struct codes
+FIXED_TYPES: Dict[str, str] = {
+    "bool": "?",
+    "i8": "b",
+    "u8": "B",
+    "i16": "h",
+    "u16": "H",
+    "i32": "i",
+    "u32": "I",
+    "i64": "q",
+    "u64": "Q",
+    "f32": "f",
+    "f64": "d",
+    # nanoseconds since the epoch, as returned by sdk.ctime.clock_realtime
+    "timestamp": "q",
+    # sdk.cuuid.UUID, 16 raw bytes
+    "uuid": "16s",
+}
+
+# Variable-length field types, appended after the fixed part in field order
+VARIABLE_TYPES: Dict[str, int] = {
+    "varint": KIND_VARINT,
+    "uvarint": KIND_UVARINT,
+    "str": KIND_STR,
+    "bytes": KIND_BYTES,
+}
+
+
+cdef inline void _write_uvarint(bytearray out, uint64_t value):
+    cdef unsigned char buf[10]
+    cdef Py_ssize_t n = 0
+    while value >= 0x80:
+        buf[n] = <unsigned char>(value & 0x7f) | 0x80
+        value >>= 7
+        n += 1
+    buf[n] = <unsigned char>value
+    out += PyBytes_FromStringAndSize(<char *>buf, n + 1)
+
+
+cdef inline uint64_t _read_uvarint(
+    const unsigned char[::1] data, Py_ssize_t *pos
+) except? 0xffffffffffffffff:
+    # Modules are built without bounds checks: check every byte read
+    cdef uint64_t value = 0
+    cdef int shift = 0
+    cdef unsigned char byte
+    cdef Py_ssize_t i = pos[0]
+    cdef Py_ssize_t size = data.shape[0]
+    while True:
+        if i >= size:
+            raise ValueError("Truncated varint")
+        if shift > 63:
+            raise ValueError("Varint is too long")
+        byte = data[i]
+        i += 1
+        value |= <uint64_t>(byte & 0x7f) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+    pos[0] = i
+    return value
+
+
+cdef void _encode_variable(bytearray out, int kind, object value) except *:
+    cdef int64_t signed
+    if kind == KIND_VARINT:
+        signed = value
+        # zigzag: small magnitudes of either sign take few bytes
+        _write_uvarint(out, (<uint64_t>signed << 1) ^ <uint64_t>(signed >> 63))
+    elif kind == KIND_UVARINT:
+        _write_uvarint(out, <uint64_t>value)
+    else:
+        if kind == KIND_STR:
+            value = value.encode("utf-8")
+        _write_uvarint(out, len(value))
+        out += value
+
+
+cdef object _decode_variable(const unsigned char[::1] data, Py_ssize_t *pos, int kind):
+    cdef uint64_t value = _read_uvarint(data, pos)
+    cdef Py_ssize_t start
+    if kind == KIND_VARINT:
+        return <int64_t>(value >> 1) ^ -<int64_t>(value & 1)
+    if kind == KIND_UVARINT:
+        return value
+    start = pos[0]
+    if value > <uint64_t>(data.shape[0] - start):
+        raise ValueError("Truncated field")
+    pos[0] = start + value
+    chunk = PyBytes_FromStringAndSize(<const char *>&data[start], value) if value else b""
+    return chunk.decode("utf-8") if kind == KIND_STR else chunk
+
+
+class Codec(ABC):
+    """Turns objects into a single message frame and back."""
+
+    @abstractmethod
+    def encode(self, obj: Any) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, data: Any) -> Any:
+        raise NotImplementedError
+
+
+class StructCodec(Codec):
+    """
+    Schema-based binary codec for typed records.
+
+    ``fields`` is a sequence of ``(name, type)`` pairs using the names in
+    FIXED_TYPES and VARIABLE_TYPES. Fixed-size fields are packed first with
+    one precompiled struct, followed by the variable-size ones (zigzag
+    varints, length-prefixed UTF-8 strings and bytes). Records are encoded
+    from dicts or from objects with matching attributes, and decoded to
+    dicts, or to ``factory(**fields)`` when a factory is given.
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[Tuple[str, str]],
+        factory: Optional[Callable[..., Any]] = None,
+    ):
+        fixed_format = ["<"]
+        self._names: Tuple[str, ...] = tuple(name for name, _ in fields)
+        self._fixed_names: List[str] = []
+        self._uuids: List[int] = []
+        self._variable: List[Tuple[str, int]] = []
+        for name, type_name in fields:
+            if type_name in FIXED_TYPES:
+                if type_name == "uuid":
+                    self._uuids.append(len(self._fixed_names))
+                self._fixed_names.append(name)
+                fixed_format.append(FIXED_TYPES[type_name])
+            elif type_name in VARIABLE_TYPES:
+                self._variable.append((name, VARIABLE_TYPES[type_name]))
+            else:
+                raise ValueError(f"Unknown field type {type_name!r} for {name!r}")
+        if len(set(self._names)) != len(self._names):
+            raise ValueError("Field names must be unique")
+        self._fixed = struct.Struct("".join(fixed_format))
+        self._factory = factory
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return self._names
+
+    @property
+    def fixed_size(self) -> int:
+        return self._fixed.size
+
+    def encode(self, obj: Any) -> bytes:
+        if isinstance(obj, dict):
+            fixed = [obj[name] for name in self._fixed_names]
+            variable = [(obj[name], kind) for name, kind in self._variable]
+        else:
+            fixed = [getattr(obj, name) for name in self._fixed_names]
+            variable = [(getattr(obj, name), kind) for name, kind in self._variable]
+        for i in self._uuids:
+            fixed[i] = fixed[i].bytes
+        cdef bytearray out = bytearray(self._fixed.pack(*fixed))
+        for value, kind in variable:
+            _encode_variable(out, kind, value)
+        return bytes(out)
+
+    def decode(self, data: Any) -> Any:
+        cdef const unsigned char[::1] view = data
+        cdef Py_ssize_t pos = self._fixed.size
+        if view.shape[0] < pos:
+            raise ValueError(
+                f"Record needs at least {pos} bytes, got {view.shape[0]}"
+            )
+        record = dict(zip(self._fixed_names, self._fixed.unpack_from(data)))
+        for i in self._uuids:
+            name = self._fixed_names[i]
+            record[name] = UUID(record[name])
+        for name, kind in self._variable:
+            record[name] = _decode_variable(view, &pos, kind)
+        if pos != view.shape[0]:
+            raise ValueError("Trailing bytes after record")
+        if self._factory is not None:
+            return self._factory(**record)
+        return record
+
+
+def _compact_dumps(obj: Any) -> bytes:
+    # str() covers sdk.cuuid.UUID and other scalar-like values
+    return json.dumps(obj, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class JSONCodec(Codec):
+    """JSON codec with pluggable ``loads``/``dumps``; stdlib json by default."""
+
+    def __init__(
+        self,
+        loads: Optional[Callable[[Any], Any]] = None,
+        dumps: Optional[Callable[[Any], bytes]] = None,
+    ):
+        self._loads = loads or json.loads
+        self._dumps = dumps or _compact_dumps
+
+    @classmethod
+    def in_house(cls) -> "JSONCodec":
+        """Decode with the sdk.cfs JSON parser."""
+        # Imported here so sdk.cnet does not load sdk.cfs for non-JSON users
+        from ..cfs.json import read_json_bytes
+
+        return cls(loads=read_json_bytes)
+
+    def encode(self, obj: Any) -> bytes:
+        return self._dumps(obj)
+
+    def decode(self, data: Any) -> Any:
+        if not isinstance(data, (bytes, str)):
+            data = bytes(data)
+        return self._loads(data)
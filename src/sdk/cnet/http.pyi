@@ -1,4 +1,24 @@
-from typing import Any, Dict, Optional, Type, Awaitable
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from .trace import LatencyHistogram
+
+IDEMPOTENT_METHODS: frozenset
+RETRY_STATUSES: frozenset
+RETRY_EXCEPTIONS: Tuple[type, ...]
+COALESCE_METHODS: frozenset
+COALESCE_HEADERS: Tuple[str, ...]
 
 class HTTPMethods:
     GET: str
@@ -28,6 +48,134 @@ class HTTPRequest:
         data: dict = ...,
     ) -> None: ...
 
+class HTTPStreamResponse:
+    status_code: int
+    headers: Dict[str, str]
+    ok: bool
+    def __init__(self, response: Any) -> None: ...
+    async def __aenter__(self) -> HTTPStreamResponse: ...
+    async def __aexit__(self, *args: Any) -> None: ...
+    def __aiter__(self) -> AsyncIterator[bytes]: ...
+    def iter_chunks(self) -> AsyncIterator[bytes]: ...
+    async def read(self) -> bytes: ...
+    async def aclose(self) -> None: ...
+    def raise_for_status(self) -> None: ...
+
+class HTTPCache:
+    hits: int
+    misses: int
+    revalidated: int
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 67108864,
+        directory: Optional[str] = None,
+        default_ttl: float = 0.0,
+    ) -> None: ...
+    def __len__(self) -> int: ...
+    def key(self, request: HTTPRequest) -> Optional[str]: ...
+    def lookup(self, key: str, request: HTTPRequest) -> Tuple[Optional[Any], bool]: ...
+    def conditional_headers(self, entry: Optional[Any], request: HTTPRequest) -> Optional[dict]: ...
+    def store(self, key: str, request: HTTPRequest, response: HTTPResponse) -> None: ...
+    def refresh(self, key: str, entry: Any, response: HTTPResponse) -> HTTPResponse: ...
+    def invalidate(self, key: Optional[str] = None) -> None: ...
+    def stats(self) -> Dict[str, int]: ...
+
+class HTTPPoolOptions(object):
+    size: Optional[int]
+    host_sizes: Optional[Dict[str, int]]
+    keepalive_timeout: Optional[float]
+    max_requests: Optional[int]
+    acquire_timeout: Optional[float]
+    connect_timeout: Optional[float]
+    def __init__(
+        self,
+        *,
+        size: Optional[int] = None,
+        host_sizes: Optional[Dict[str, int]] = None,
+        keepalive_timeout: Optional[float] = None,
+        max_requests: Optional[int] = None,
+        acquire_timeout: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+    ) -> None: ...
+    def pool_config(self, size: Optional[int] = None) -> Any: ...
+    def connector(self) -> Any: ...
+
+class HTTPRetryPolicy(object):
+    attempts: int
+    backoff: float
+    multiplier: float
+    max_backoff: float
+    jitter: bool
+    deadline: Optional[float]
+    statuses: frozenset
+    methods: frozenset
+    exceptions: Tuple[type, ...]
+    hedge_after: Optional[float]
+    hedge_percentile: Optional[float]
+    hedge_min_samples: int
+    hedge_window: int
+    latencies: LatencyHistogram
+    retries: int
+    hedges: int
+    hedge_wins: int
+    def __init__(
+        self,
+        *,
+        attempts: int = 3,
+        backoff: float = 0.1,
+        multiplier: float = 2.0,
+        max_backoff: float = 10.0,
+        jitter: bool = True,
+        deadline: Optional[float] = None,
+        statuses: Iterable[int] = ...,
+        methods: Iterable[str] = ...,
+        exceptions: Tuple[type, ...] = ...,
+        hedge_after: Optional[float] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: int = 20,
+        hedge_window: int = 10000,
+    ) -> None: ...
+    def delay(self, attempt: int) -> float: ...
+    def observe(self, latency_ns: int) -> None: ...
+    def hedge_delay(self) -> Optional[float]: ...
+    def stats(self) -> Dict[str, Any]: ...
+
+class TokenBucket:
+    rate: float
+    burst: float
+    def __init__(self, rate: float = 0.0, burst: float = 0.0) -> None: ...
+    @property
+    def tokens(self) -> float: ...
+    def reserve(self, now: int) -> float: ...
+    def blocked_for(self, now: int) -> float: ...
+    def block(self, until: int) -> None: ...
+    def cap(self, tokens: float, now: int) -> None: ...
+
+class HTTPRateLimit(object):
+    rate: Optional[float]
+    burst: Optional[float]
+    concurrency: Optional[int]
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        concurrency: Optional[int] = None,
+    ) -> None: ...
+
+class HTTPRateLimiter(object):
+    def __init__(
+        self,
+        default: Optional[HTTPRateLimit] = None,
+        hosts: Optional[Dict[str, HTTPRateLimit]] = None,
+        routes: Optional[Dict[str, HTTPRateLimit]] = None,
+    ) -> None: ...
+    def scopes(self, url: str) -> List[Any]: ...
+    async def acquire(self, url: str) -> List[Any]: ...
+    def release(self, scopes: List[Any]) -> None: ...
+    def observe(self, scopes: List[Any], status_code: int, headers: dict) -> None: ...
+    def stats(self) -> Dict[str, Dict[str, Any]]: ...
+
 class HTTPClient:
     def __init__(self) -> None: ...
     def connected(self) -> bool: ...
@@ -37,6 +185,12 @@ class HTTPClient:
         handle_cookies: bool = ...,
         verify_ssl: bool = ...,
         proxy: Any = ...,
+        pool_options: Optional[HTTPPoolOptions] = ...,
+        cache: Optional[HTTPCache] = ...,
+        coalesce: bool = ...,
+        coalesce_headers: Sequence[str] = ...,
+        retry: Optional[HTTPRetryPolicy] = ...,
+        rate_limiter: Optional[HTTPRateLimiter] = ...,
     ) -> "HTTPClient": ...
     async def __aexit__(
         self,
@@ -57,9 +211,47 @@ class HTTPClient:
         handle_cookies: bool = ...,
         verify_ssl: bool = ...,
         proxy: Any = ...,
+        pool_options: Optional[HTTPPoolOptions] = ...,
+        cache: Optional[HTTPCache] = ...,
+        coalesce: bool = ...,
+        coalesce_headers: Sequence[str] = ...,
+        retry: Optional[HTTPRetryPolicy] = ...,
+        rate_limiter: Optional[HTTPRateLimiter] = ...,
     ) -> None: ...
     async def disconnect(self) -> None: ...
     async def wait_connection(self, timeout: Optional[float] = ...) -> None: ...
+    async def warm_up(self, url: str, connections: int = 1) -> int: ...
+    def pool_stats(self) -> Dict[str, Any]: ...
+    @property
+    def cache(self) -> Optional[HTTPCache]: ...
+    @property
+    def coalesced(self) -> int: ...
+    @property
+    def retry(self) -> Optional[HTTPRetryPolicy]: ...
+    @property
+    def rate_limiter(self) -> Optional[HTTPRateLimiter]: ...
+    async def request(self, request: HTTPRequest, *args: Any, **kwargs: Any) -> HTTPResponse: ...
+    async def stream(self, request: HTTPRequest) -> HTTPStreamResponse: ...
+    async def download(self, request: HTTPRequest, path: str, prefetch: int = 4) -> int: ...
+    def stream_csv(
+        self,
+        request: HTTPRequest,
+        read_options: Optional[Any] = None,
+        convert_options: Optional[Any] = None,
+        prefetch: int = 4,
+    ) -> AsyncIterator[Any]: ...
+    def stream_ndjson(self, request: HTTPRequest) -> AsyncIterator[Any]: ...
+    def request_many(
+        self,
+        requests: Iterable[HTTPRequest],
+        concurrency: int = 16,
+        ordered: bool = True,
+        timeout: Optional[float] = None,
+        return_exceptions: bool = False,
+    ) -> Union[
+        Awaitable[List[Union[HTTPResponse, Exception]]],
+        AsyncIterator[Tuple[int, Union[HTTPResponse, Exception]]],
+    ]: ...
 
 def verify_http_status_code(status_code: int) -> bool: ...
 
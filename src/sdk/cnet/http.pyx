@@ -1,10 +1,70 @@
-from typing import Any, Dict, Final, Literal, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 cimport cython
+from libc.stdint cimport int64_t
 import aiosonic
 import asyncio
+import concurrent.futures
+import hashlib
+import io
+import json
+import os
+import random
+import sys
+import threading
+from urllib.parse import urlencode, urlparse
+
+from aiosonic.exceptions import BaseTimeout, ConnectionDisconnected
+from aiosonic.pools import PoolConfig, SmartPool
+from aiosonic.timeout import Timeouts
+
+from ..ctime import clock_monotonic, clock_realtime, parse_rfc2822_bytes_to_timestamp
+from .trace import LatencyHistogram
+
+if sys.platform.startswith("win"):
+    from ..ctime import clock_monotonic as clock_monotonic_coarse
+else:
+    # Rate limiting reads the clock on every request: the coarse clock is enough
+    from ..ctime import clock_monotonic_coarse
 
 DEF HTTP_OK_STATUS_CODE = 200
 DEF HTTP_ERROR_STATUS_CODE = 300
+DEF HTTP_NOT_MODIFIED_STATUS_CODE = 304
+DEF HTTP_TOO_MANY_REQUESTS_STATUS_CODE = 429
+DEF HTTP_SERVICE_UNAVAILABLE_STATUS_CODE = 503
+DEF NS_PER_SECOND = 1000000000
+# Seconds between checks for a stopped body while a reader thread waits for a chunk
+DEF STOP_POLL_INTERVAL = 0.05
+# X-RateLimit-Reset values above this are epoch seconds, not a delay
+DEF EPOCH_RESET_THRESHOLD = 1000000000
+
+# Methods a retry or a hedged copy cannot apply twice
+IDEMPOTENT_METHODS: Final[frozenset] = frozenset(("GET", "HEAD", "PUT", "DELETE", "OPTIONS"))
+# Statuses worth another attempt: throttling and transient gateway errors
+RETRY_STATUSES: Final[frozenset] = frozenset((429, 502, 503, 504))
+# OSError covers connection errors and socket timeouts
+RETRY_EXCEPTIONS: Final[Tuple[type, ...]] = (
+    OSError,
+    asyncio.TimeoutError,
+    BaseTimeout,
+    ConnectionDisconnected,
+)
+# Safe methods whose concurrent identical requests may share one upstream call
+COALESCE_METHODS: Final[frozenset] = frozenset(("GET", "HEAD"))
+# Request headers that, besides method, URL and params, tell requests apart
+COALESCE_HEADERS: Final[Tuple[str, ...]] = ("accept", "accept-encoding", "authorization", "cookie")
 
 cpdef inline bint verify_http_status_code(int status_code) noexcept nogil:
     return HTTP_OK_STATUS_CODE <= status_code < HTTP_ERROR_STATUS_CODE
@@ -41,14 +101,898 @@ cdef class HTTPRequest:
         self.params = params
         self.data = data
 
+class HTTPStreamResponse(object):
+    """
+    Response whose body has not been read yet.
+
+    Iterate it for the (decompressed) body chunks as they arrive, or
+    ``read()`` the rest at once. Use it as an async context manager, or call
+    ``aclose()``, so an unread body gives its connection back.
+    """
+
+    __slots__ = ("status_code", "headers", "ok", "_response")
+
+    def __init__(self, response: aiosonic.HttpResponse):
+        self.status_code: int = response.status_code
+        self.headers: Dict[str, str] = dict(response.headers)
+        self.ok: bool = verify_http_status_code(response.status_code)
+        self._response = response
+
+    async def __aenter__(self) -> "HTTPStreamResponse":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self.iter_chunks()
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        async for chunk in self._response.iter_bytes():
+            yield chunk
+
+    async def read(self) -> bytes:
+        return await self._response.content()
+
+    async def aclose(self) -> None:
+        await self._response.aclose()
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise RuntimeError(f"HTTP request failed with status {self.status_code}")
+
+
+def _header(dict headers, str name) -> Optional[str]:
+    # Header names are case-insensitive; ``name`` is given in lower case
+    if headers:
+        for key, value in headers.items():
+            if key.lower() == name:
+                return value
+    return None
+
+
+def _cache_control(dict headers) -> Dict[str, Optional[str]]:
+    directives = {}
+    value = _header(headers, "cache-control")
+    if value:
+        for part in value.split(","):
+            name, _, argument = part.strip().partition("=")
+            if name:
+                directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parse_rfc2822_bytes_to_timestamp(value.encode())
+    except ValueError:
+        return None
+
+
+class _CacheEntry(object):
+    __slots__ = ("status_code", "headers", "content", "fresh_until", "vary")
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: Dict[str, str],
+        content: bytes,
+        fresh_until: int,
+        vary: Dict[str, Optional[str]],
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        # clock_realtime ns, so entries loaded from disk stay comparable
+        self.fresh_until = fresh_until
+        self.vary = vary
+
+    def response(self) -> HTTPResponse:
+        return HTTPResponse(self.status_code, dict(self.headers), self.content)
+
+
+class HTTPCache(object):
+    """
+    Opt-in response cache for HTTPClient.request.
+
+    GET and HEAD responses with status 200 are kept in an in-memory LRU
+    bounded by ``max_entries`` and ``max_bytes`` and, when ``directory`` is
+    given, in one file per entry there as well. Entries are fresh for the
+    Cache-Control max-age (or until Expires), else for ``default_ttl``
+    seconds; fresh entries are served without a request. Stale ones are
+    revalidated with If-None-Match/If-Modified-Since, and a 304 returns the
+    cached response. ``no-store`` and ``Vary: *`` responses are not kept.
+    Requests carrying Authorization or Cookie headers are keyed by a hash of
+    those credentials, so responses are never shared between them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 << 20,
+        directory: Optional[str] = None,
+        default_ttl: float = 0.0,
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self._max_entries: int = max_entries
+        self._max_bytes: int = max_bytes
+        self._directory: Optional[str] = directory
+        self._default_ttl_ns: int = int(default_ttl * NS_PER_SECOND)
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.revalidated: int = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, HTTPRequest request) -> Optional[str]:
+        """Cache key of ``request``, or None if it must not use the cache."""
+        if request.method not in ("GET", "HEAD"):
+            return None
+        if "no-store" in _cache_control(request.headers):
+            return None
+        key = f"{request.method} {request.url}"
+        if request.params:
+            key += "?" + urlencode(sorted(request.params.items()))
+        credentials = [_header(request.headers, name) for name in ("authorization", "cookie")]
+        if any(credentials):
+            # Hashed so that keys, which the disk store writes out, never hold secrets
+            digest = hashlib.sha256("\n".join(value or "" for value in credentials).encode())
+            key += " " + digest.hexdigest()
+        return key
+
+    def lookup(self, str key, HTTPRequest request) -> Tuple[Optional[_CacheEntry], bool]:
+        """The entry for ``key`` (or None) and whether it can be used as is."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            # Re-inserted last: the dict's insertion order is the LRU order
+            self._entries[key] = entry
+        elif self._directory is not None:
+            entry = self._load(key)
+            if entry is not None:
+                self._keep(key, entry)
+        if entry is None or any(
+            _header(request.headers, name) != value for name, value in entry.vary.items()
+        ):
+            self.misses += 1
+            return None, False
+        if clock_realtime() < entry.fresh_until and "no-cache" not in _cache_control(
+            request.headers
+        ):
+            self.hits += 1
+            return entry, True
+        return entry, False
+
+    def conditional_headers(self, entry: Optional[_CacheEntry], HTTPRequest request) -> Optional[dict]:
+        if entry is None:
+            return request.headers
+        headers = dict(request.headers or {})
+        etag = _header(entry.headers, "etag")
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        last_modified = _header(entry.headers, "last-modified")
+        if last_modified is not None:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def store(self, str key, HTTPRequest request, HTTPResponse response) -> None:
+        if response.status_code != HTTP_OK_STATUS_CODE:
+            return
+        directives = _cache_control(response.headers)
+        vary = _header(response.headers, "vary")
+        if "no-store" in directives or (vary is not None and vary.strip() == "*"):
+            self.invalidate(key)
+            return
+        fresh_until = clock_realtime() + self._lifetime_ns(response.headers, directives)
+        if fresh_until <= clock_realtime() and not (
+            _header(response.headers, "etag") or _header(response.headers, "last-modified")
+        ):
+            # Neither fresh nor revalidatable: nothing to gain from keeping it
+            self.invalidate(key)
+            return
+        names = [name.strip().lower() for name in vary.split(",")] if vary else []
+        entry = _CacheEntry(
+            response.status_code,
+            dict(response.headers),
+            response.content,
+            fresh_until,
+            {name: _header(request.headers, name) for name in names if name},
+        )
+        self._put(key, entry)
+
+    def refresh(self, str key, entry: _CacheEntry, HTTPResponse response) -> HTTPResponse:
+        """Merge a 304 into ``entry`` and return the cached response."""
+        self.revalidated += 1
+        for name, value in response.headers.items():
+            if name.lower() not in ("content-length", "transfer-encoding"):
+                for existing in [k for k in entry.headers if k.lower() == name.lower()]:
+                    del entry.headers[existing]
+                entry.headers[name] = value
+        directives = _cache_control(entry.headers)
+        if "no-store" in directives:
+            self.invalidate(key)
+        else:
+            entry.fresh_until = clock_realtime() + self._lifetime_ns(entry.headers, directives)
+            self._put(key, entry)
+        return entry.response()
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop ``key``, or every entry (including the on-disk ones)."""
+        keys = list(self._entries) if key is None else [key]
+        for k in keys:
+            entry = self._entries.pop(k, None)
+            if entry is not None:
+                self._size -= len(entry.content)
+        if self._directory is None:
+            return
+        if key is None:
+            for name in os.listdir(self._directory):
+                if name.endswith(".cache"):
+                    os.remove(os.path.join(self._directory, name))
+        else:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+        }
+
+    def _lifetime_ns(self, dict headers, dict directives) -> int:
+        if "no-cache" in directives:
+            return 0
+        if "max-age" in directives:
+            try:
+                max_age = int(directives["max-age"])
+                age = int(_header(headers, "age") or 0)
+            except (TypeError, ValueError):
+                return 0
+            return max(0, max_age - age) * NS_PER_SECOND
+        expires = _header(headers, "expires")
+        if expires is not None:
+            expires_at = _parse_http_date(expires)
+            if expires_at is None:
+                # Invalid dates such as "0" mean already expired
+                return 0
+            date = _parse_http_date(_header(headers, "date"))
+            now = date if date is not None else clock_realtime() / NS_PER_SECOND
+            return max(0, int((expires_at - now) * NS_PER_SECOND))
+        return self._default_ttl_ns
+
+    def _put(self, str key, entry: _CacheEntry) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous.content)
+        self._keep(key, entry)
+        if self._directory is not None:
+            self._save(key, entry)
+
+    def _keep(self, str key, entry: _CacheEntry) -> None:
+        # Bodies over the byte budget are only ever served from disk
+        if len(entry.content) > self._max_bytes:
+            return
+        self._entries[key] = entry
+        self._size += len(entry.content)
+        while len(self._entries) > self._max_entries or self._size > self._max_bytes:
+            evicted = self._entries.pop(next(iter(self._entries)))
+            self._size -= len(evicted.content)
+
+    def _path(self, str key) -> str:
+        return os.path.join(
+            self._directory, hashlib.sha256(key.encode()).hexdigest() + ".cache"
+        )
+
+    def _save(self, str key, entry: _CacheEntry) -> None:
+        # One JSON metadata line followed by the body; replaced atomically
+        meta = {
+            "key": key,
+            "status_code": entry.status_code,
+            "headers": entry.headers,
+            "fresh_until": entry.fresh_until,
+            "vary": entry.vary,
+        }
+        path = self._path(key)
+        partial = f"{path}.part"
+        with open(partial, "wb") as file:
+            file.write(json.dumps(meta).encode() + b"\n")
+            file.write(entry.content)
+        os.replace(partial, path)
+
+    def _load(self, str key) -> Optional[_CacheEntry]:
+        try:
+            with open(self._path(key), "rb") as file:
+                meta = json.loads(file.readline())
+                content = file.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("key") != key:
+            return None
+        return _CacheEntry(
+            meta["status_code"], meta["headers"], content, meta["fresh_until"], meta["vary"]
+        )
+
+
+class _BodyReader(io.RawIOBase):
+    """
+    Blocking file object over an async chunk iterator, for parsers running
+    in a worker thread.
+
+    Up to ``prefetch`` chunks are read ahead on the event loop, so the
+    download carries on while the thread parses. Created and ``stop()``-ed
+    on the loop; only the read methods may be called from other threads.
+    Once stopped, readers see the end of the body without needing the loop.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], prefetch: int):
+        super().__init__()
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(prefetch)
+        self._buffer = memoryview(b"")
+        self._eof = False
+        self._stopped = threading.Event()
+        self._pump = asyncio.create_task(self._fill(chunks))
+
+    async def _fill(self, chunks: AsyncIterator[bytes]) -> None:
+        try:
+            async for chunk in chunks:
+                await self._queue.put(chunk)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._queue.put(e)
+            return
+        await self._queue.put(None)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._pump.cancel()
+        # Drop what was read ahead so the sentinel always fits and a reader
+        # waiting for a chunk is woken up
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    def next_chunk(self) -> Optional[bytes]:
+        """Next chunk, or None at the end of the body."""
+        if self._eof or self._stopped.is_set():
+            return None
+        future = asyncio.run_coroutine_threadsafe(self._queue.get(), self._loop)
+        while True:
+            try:
+                chunk = future.result(STOP_POLL_INTERVAL)
+                break
+            except concurrent.futures.TimeoutError:
+                # The loop may be busy waiting on this thread: do not wait on it
+                if self._stopped.is_set():
+                    future.cancel()
+                    self._eof = True
+                    return None
+        if chunk is None:
+            self._eof = True
+        elif isinstance(chunk, BaseException):
+            self._eof = True
+            raise chunk
+        return chunk
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if not self._buffer:
+            chunk = self.next_chunk()
+            if chunk is None:
+                return 0
+            self._buffer = memoryview(chunk)
+        cdef Py_ssize_t n = min(len(buffer), len(self._buffer))
+        buffer[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+def _write_chunks(reader: _BodyReader, path: str) -> int:
+    cdef Py_ssize_t size = 0
+    with open(path, "wb") as file:
+        while (chunk := reader.next_chunk()) is not None:
+            file.write(chunk)
+            size += len(chunk)
+    return size
+
+
+def _next_batch(batches: Any) -> Any:
+    return next(batches, None)
+
+
+class HTTPPoolOptions(object):
+    """
+    Connection pool settings for HTTPClient; ``None`` keeps the aiosonic default.
+
+    ``host_sizes`` maps ``"<scheme>://<host>"`` to a dedicated pool size for
+    that host; other hosts share the default pool of ``size`` connections.
+    """
+
+    __slots__ = (
+        "size",
+        "host_sizes",
+        "keepalive_timeout",
+        "max_requests",
+        "acquire_timeout",
+        "connect_timeout",
+    )
+
+    def __init__(
+        self,
+        *,
+        size: Optional[int] = None,
+        host_sizes: Optional[Dict[str, int]] = None,
+        keepalive_timeout: Optional[float] = None,
+        max_requests: Optional[int] = None,
+        acquire_timeout: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+    ):
+        self.size = size
+        self.host_sizes = host_sizes
+        self.keepalive_timeout = keepalive_timeout
+        self.max_requests = max_requests
+        self.acquire_timeout = acquire_timeout
+        self.connect_timeout = connect_timeout
+
+    def pool_config(self, size: Optional[int] = None) -> PoolConfig:
+        config = {}
+        if size is not None or self.size is not None:
+            config["size"] = size if size is not None else self.size
+        if self.max_requests is not None:
+            config["max_conn_requests"] = self.max_requests
+        if self.keepalive_timeout is not None:
+            config["max_conn_idle_ms"] = int(self.keepalive_timeout * 1000)
+        return PoolConfig(**config)
+
+    def connector(self) -> aiosonic.TCPConnector:
+        pool_configs = {":default": self.pool_config()}
+        for host, size in (self.host_sizes or {}).items():
+            pool_configs[host] = self.pool_config(size)
+        timeouts = {}
+        if self.acquire_timeout is not None:
+            timeouts["pool_acquire"] = self.acquire_timeout
+        if self.connect_timeout is not None:
+            timeouts["sock_connect"] = self.connect_timeout
+        return _PooledConnector(
+            pool_configs=pool_configs, timeouts=Timeouts(**timeouts), pool_cls=_CountingPool
+        )
+
+
+class HTTPRetryPolicy(object):
+    """
+    Retry and hedging settings for HTTPClient, with their counters.
+
+    Failed attempts (``exceptions``, or a status in ``statuses``) are retried
+    up to ``attempts`` times in all, after a full-jitter exponential backoff
+    of at most ``max_backoff`` seconds, as long as the next attempt can start
+    within ``deadline`` seconds of the first. Only idempotent ``methods``
+    are retried or hedged.
+
+    Hedging sends a second copy of a request that has not answered after
+    ``hedge_after`` seconds and takes whichever succeeds first. With
+    ``hedge_percentile`` the delay follows that percentile of the latencies
+    seen by this policy instead, once ``hedge_min_samples`` were recorded;
+    latencies are kept over windows of ``hedge_window`` samples.
+    """
+
+    __slots__ = (
+        "attempts",
+        "backoff",
+        "multiplier",
+        "max_backoff",
+        "jitter",
+        "deadline",
+        "statuses",
+        "methods",
+        "exceptions",
+        "hedge_after",
+        "hedge_percentile",
+        "hedge_min_samples",
+        "hedge_window",
+        "latencies",
+        "retries",
+        "hedges",
+        "hedge_wins",
+        "_hedge_ns",
+    )
+
+    def __init__(
+        self,
+        *,
+        attempts: int = 3,
+        backoff: float = 0.1,
+        multiplier: float = 2.0,
+        max_backoff: float = 10.0,
+        jitter: bool = True,
+        deadline: Optional[float] = None,
+        statuses: Iterable[int] = RETRY_STATUSES,
+        methods: Iterable[str] = IDEMPOTENT_METHODS,
+        exceptions: Tuple[type, ...] = RETRY_EXCEPTIONS,
+        hedge_after: Optional[float] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: int = 20,
+        hedge_window: int = 10000,
+    ):
+        if attempts <= 0:
+            raise ValueError("attempts must be positive")
+        if hedge_percentile is not None and not 0 < hedge_percentile < 100:
+            raise ValueError("hedge_percentile must be between 0 and 100")
+        self.attempts = attempts
+        self.backoff = backoff
+        self.multiplier = multiplier
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.deadline = deadline
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(methods)
+        self.exceptions = exceptions
+        self.hedge_after = hedge_after
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_window = hedge_window
+        self.latencies = LatencyHistogram()
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        # Percentile of the last full window, used while the next one fills
+        self._hedge_ns = 0
+
+    def delay(self, int attempt) -> float:
+        """Seconds to wait before retry number ``attempt`` (from 0)."""
+        delay = min(self.max_backoff, self.backoff * self.multiplier ** attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def observe(self, int64_t latency_ns) -> None:
+        latencies = self.latencies
+        latencies.record(latency_ns)
+        if self.hedge_percentile is not None and latencies.count >= self.hedge_window:
+            self._hedge_ns = latencies.percentile(self.hedge_percentile)
+            latencies.reset()
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None to not hedge."""
+        if self.hedge_percentile is not None:
+            if self.latencies.count >= self.hedge_min_samples:
+                return self.latencies.percentile(self.hedge_percentile) / NS_PER_SECOND
+            if self._hedge_ns:
+                return self._hedge_ns / NS_PER_SECOND
+        return self.hedge_after
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_delay": self.hedge_delay(),
+            "latency": self.latencies.to_dict(),
+        }
+
+
+cdef class TokenBucket:
+    """
+    ``rate`` tokens per second, up to ``burst`` banked; rate 0 is unlimited.
+
+    Tokens are reserved rather than awaited: ``reserve`` always takes one and
+    returns how long to wait before using it, so callers queue up in order
+    with a single sleep each. ``block`` holds every token back until a
+    given clock_monotonic_coarse time.
+    """
+
+    cdef readonly double rate
+    cdef readonly double burst
+    cdef double _tokens
+    cdef int64_t _updated
+    cdef int64_t _blocked_until
+
+    def __cinit__(self, double rate = 0.0, double burst = 0.0):
+        if rate < 0:
+            raise ValueError("rate must not be negative")
+        self.rate = rate
+        self.burst = burst if burst > 0 else max(rate, 1.0)
+        self._tokens = self.burst
+        self._updated = clock_monotonic_coarse()
+        self._blocked_until = 0
+
+    @property
+    def tokens(self) -> float:
+        self._refill(clock_monotonic_coarse())
+        return self._tokens
+
+    cdef inline void _refill(self, int64_t now):
+        # ``_updated`` is in the future while blocked: nothing accrues until then
+        if now > self._updated:
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate / NS_PER_SECOND
+            )
+            self._updated = now
+
+    cpdef double reserve(self, int64_t now):
+        """Take a token; returns the seconds to wait before using it."""
+        cdef double ready
+        if self.rate <= 0:
+            return self.blocked_for(now)
+        self._refill(now)
+        self._tokens -= 1.0
+        ready = (self._updated - now) / <double>NS_PER_SECOND
+        if self._tokens < 0:
+            ready -= self._tokens / self.rate
+        return max(ready, self.blocked_for(now))
+
+    cpdef double blocked_for(self, int64_t now):
+        if self._blocked_until <= now:
+            return 0.0
+        return (self._blocked_until - now) / <double>NS_PER_SECOND
+
+    cpdef void block(self, int64_t until):
+        if until <= self._blocked_until:
+            return
+        self._blocked_until = until
+        if self.rate > 0:
+            # Start refilling from empty once the block is over
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, until)
+
+    cpdef void cap(self, double tokens, int64_t now):
+        """Hold at most ``tokens``, e.g. what the server says is left."""
+        self._refill(now)
+        if tokens < self._tokens:
+            self._tokens = tokens
+
+
+class HTTPRateLimit(object):
+    """
+    Limits for one host or route: ``rate`` requests per second in bursts of
+    up to ``burst``, and at most ``concurrency`` in flight. None is unlimited.
+    """
+
+    __slots__ = ("rate", "burst", "concurrency")
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        concurrency: Optional[int] = None,
+    ):
+        if concurrency is not None and concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+
+
+class _RateScope(object):
+    __slots__ = ("bucket", "semaphore", "in_flight", "waits", "wait_ns")
+
+    def __init__(self, limit: Optional[HTTPRateLimit]):
+        if limit is None:
+            limit = HTTPRateLimit()
+        self.bucket = TokenBucket(limit.rate or 0.0, limit.burst or 0.0)
+        self.semaphore = (
+            asyncio.Semaphore(limit.concurrency) if limit.concurrency is not None else None
+        )
+        self.in_flight = 0
+        self.waits = 0
+        self.wait_ns = 0
+
+
+def _seconds_until(value: Optional[str], bint epoch_dates) -> Optional[float]:
+    # Retry-After is seconds or an HTTP date; X-RateLimit-Reset is seconds
+    # or, when large enough, epoch seconds
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        timestamp = _parse_http_date(value)
+        if timestamp is None:
+            return None
+        return timestamp - clock_realtime() / <double>NS_PER_SECOND
+    if epoch_dates and seconds > EPOCH_RESET_THRESHOLD:
+        return seconds - clock_realtime() / <double>NS_PER_SECOND
+    return seconds
+
+
+class HTTPRateLimiter(object):
+    """
+    Per-host and per-route throttling for HTTPClient.
+
+    Each request passes the scope of its host (``"<scheme>://<host>"``),
+    limited by ``hosts`` or else ``default``, and the scope of the longest
+    ``routes`` URL prefix it matches, if any. A scope has a TokenBucket and
+    an optional concurrency cap; every upstream attempt, retries and hedges
+    included, takes a token from each.
+
+    Responses steer the most specific scope: Retry-After on 429/503, or
+    X-RateLimit-Remaining (RateLimit-Remaining) reaching 0, blocks it until
+    the server's reset time, and a positive remaining count caps its tokens.
+    """
+
+    def __init__(
+        self,
+        default: Optional[HTTPRateLimit] = None,
+        hosts: Optional[Dict[str, HTTPRateLimit]] = None,
+        routes: Optional[Dict[str, HTTPRateLimit]] = None,
+    ):
+        self._default = default
+        self._hosts: Dict[str, HTTPRateLimit] = dict(hosts or {})
+        # Longest prefix first, so the first match is the most specific
+        self._routes: List[Tuple[str, HTTPRateLimit]] = sorted(
+            (routes or {}).items(), key=lambda item: -len(item[0])
+        )
+        self._scopes: Dict[str, _RateScope] = {}
+
+    def scopes(self, url: str) -> List[_RateScope]:
+        parsed = urlparse(url)
+        host = f"{parsed.scheme}://{parsed.hostname}"
+        scope = self._scopes.get(host)
+        if scope is None:
+            scope = self._scopes[host] = _RateScope(self._hosts.get(host, self._default))
+        scopes = [scope]
+        for prefix, limit in self._routes:
+            if url.startswith(prefix):
+                scope = self._scopes.get(prefix)
+                if scope is None:
+                    scope = self._scopes[prefix] = _RateScope(limit)
+                scopes.append(scope)
+                break
+        return scopes
+
+    async def acquire(self, url: str) -> List[_RateScope]:
+        """Wait for a slot and a token in every scope of ``url``."""
+        scopes = self.scopes(url)
+        acquired = []
+        try:
+            # Always host before route, so waiters cannot deadlock
+            for scope in scopes:
+                if scope.semaphore is not None:
+                    await scope.semaphore.acquire()
+                scope.in_flight += 1
+                acquired.append(scope)
+            wait = max([scope.bucket.reserve(clock_monotonic_coarse()) for scope in scopes])
+            if wait > 0:
+                start = clock_monotonic_coarse()
+                # A response may extend a block while we sleep: check again after
+                while wait > 0:
+                    await asyncio.sleep(wait)
+                    now = clock_monotonic_coarse()
+                    wait = max([scope.bucket.blocked_for(now) for scope in scopes])
+                for scope in scopes:
+                    scope.waits += 1
+                    scope.wait_ns += clock_monotonic_coarse() - start
+        except BaseException:
+            self.release(acquired)
+            raise
+        return scopes
+
+    def release(self, scopes: List[_RateScope]) -> None:
+        for scope in scopes:
+            scope.in_flight -= 1
+            if scope.semaphore is not None:
+                scope.semaphore.release()
+
+    def observe(self, scopes: List[_RateScope], int status_code, dict headers) -> None:
+        """Adjust the most specific of ``scopes`` to the server's limit headers."""
+        bucket = scopes[len(scopes) - 1].bucket
+        now = clock_monotonic_coarse()
+        if status_code in (HTTP_TOO_MANY_REQUESTS_STATUS_CODE, HTTP_SERVICE_UNAVAILABLE_STATUS_CODE):
+            delay = _seconds_until(_header(headers, "retry-after"), False)
+            if delay is not None and delay > 0:
+                bucket.block(now + <int64_t>(delay * NS_PER_SECOND))
+            elif status_code == HTTP_TOO_MANY_REQUESTS_STATUS_CODE:
+                # Throttled without a hint: spend nothing until tokens accrue again
+                bucket.cap(0.0, now)
+        remaining = _header(headers, "x-ratelimit-remaining") or _header(
+            headers, "ratelimit-remaining"
+        )
+        if remaining is None:
+            return
+        try:
+            left = float(remaining)
+        except ValueError:
+            return
+        if left > 0:
+            bucket.cap(left, now)
+            return
+        delay = _seconds_until(
+            _header(headers, "x-ratelimit-reset") or _header(headers, "ratelimit-reset"), True
+        )
+        if delay is not None and delay > 0:
+            bucket.block(now + <int64_t>(delay * NS_PER_SECOND))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            key: {
+                "tokens": scope.bucket.tokens,
+                "in_flight": scope.in_flight,
+                "waits": scope.waits,
+                "wait_ns": scope.wait_ns,
+                "blocked_for": scope.bucket.blocked_for(clock_monotonic_coarse()),
+            }
+            for key, scope in self._scopes.items()
+        }
+
+
+# _CountingPool and _PooledConnector hook aiosonic internals (SmartPool._init_pool,
+# sem, TCPConnector.after_acquire, Connection.reused): requirements.txt pins the
+# aiosonic 1.3 series they were written against
+class _CountingPool(SmartPool):
+    """SmartPool that counts how often, and for how long, acquire had to wait."""
+
+    def _init_pool(self, connection_cls):
+        super()._init_pool(connection_cls)
+        self.acquired = 0
+        self.waits = 0
+        self.wait_ns = 0
+
+    async def acquire(self, urlparsed=None):
+        self.acquired += 1
+        if not self.sem.locked():
+            return await super().acquire(urlparsed)
+        self.waits += 1
+        start = clock_monotonic()
+        try:
+            return await super().acquire(urlparsed)
+        finally:
+            self.wait_ns += clock_monotonic() - start
+
+
+class _PooledConnector(aiosonic.TCPConnector):
+    """TCPConnector that counts connections opened versus reused."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.opened = 0
+        self.reused = 0
+
+    async def after_acquire(self, urlparsed, conn, verify, ssl, timeouts, http2):
+        conn.reused = False
+        conn = await super().after_acquire(urlparsed, conn, verify, ssl, timeouts, http2)
+        if conn.reused:
+            self.reused += 1
+        else:
+            self.opened += 1
+        return conn
+
+
 cdef class HTTPClient:
     cdef:
         object _session
         object _connection_event
+        bint _verify_ssl
+        object _cache
+        bint _coalesce
+        tuple _coalesce_headers
+        dict _inflight
+        Py_ssize_t _coalesced
+        object _retry
+        object _rate_limiter
 
     def __init__(self):
         self._session = None
         self._connection_event = asyncio.Event()
+        self._verify_ssl = True
+        self._cache = None
+        self._coalesce = False
+        self._coalesce_headers = ()
+        self._inflight = {}
+        self._coalesced = 0
+        self._retry = None
+        self._rate_limiter = None
 
     cpdef bint connected(self):
         return self._connection_event.is_set()
@@ -59,8 +1003,25 @@ cdef class HTTPClient:
         handle_cookies: bool = False,
         verify_ssl: bool = True,
         proxy: Optional[aiosonic.Proxy] = None,
+        pool_options: Optional[HTTPPoolOptions] = None,
+        cache: Optional[HTTPCache] = None,
+        coalesce: bool = False,
+        coalesce_headers: Sequence[str] = COALESCE_HEADERS,
+        retry: Optional[HTTPRetryPolicy] = None,
+        rate_limiter: Optional[HTTPRateLimiter] = None,
     ):
-        self.connect(connector, handle_cookies, verify_ssl, proxy)
+        self.connect(
+            connector,
+            handle_cookies,
+            verify_ssl,
+            proxy,
+            pool_options,
+            cache,
+            coalesce,
+            coalesce_headers,
+            retry,
+            rate_limiter,
+        )
         return self
 
     async def __aexit__(
@@ -86,7 +1047,21 @@ cdef class HTTPClient:
         handle_cookies: bool = False,
         verify_ssl: bool = True,
         proxy: Optional[aiosonic.Proxy] = None,
+        pool_options: Optional[HTTPPoolOptions] = None,
+        cache: Optional[HTTPCache] = None,
+        coalesce: bool = False,
+        coalesce_headers: Sequence[str] = COALESCE_HEADERS,
+        retry: Optional[HTTPRetryPolicy] = None,
+        rate_limiter: Optional[HTTPRateLimiter] = None,
     ):
+        if connector is None:
+            connector = (pool_options or HTTPPoolOptions()).connector()
+        self._verify_ssl = verify_ssl
+        self._cache = cache
+        self._coalesce = coalesce
+        self._coalesce_headers = tuple([name.lower() for name in coalesce_headers])
+        self._retry = retry
+        self._rate_limiter = rate_limiter
         self._session = aiosonic.HTTPClient(
             connector=connector,
             handle_cookies=handle_cookies,
@@ -103,12 +1078,376 @@ cdef class HTTPClient:
     async def wait_connection(self, timeout: Optional[float] = None) -> None:
         await asyncio.wait_for(self._connection_event.wait(), timeout=timeout)
 
+    async def warm_up(self, url: str, connections: int = 1) -> int:
+        """Open up to ``connections`` keep-alive connections to the host of ``url``."""
+        connector = self._session.connector
+        urlparsed = urlparse(url)
+        # All are held at once: more than the host's pool would wait forever
+        pool = connector.pools.get(
+            f"{urlparsed.scheme}://{urlparsed.hostname}", connector.pools[":default"]
+        )
+        connections = min(connections, pool.pool_size)
+        opened = []
+        try:
+            # Hold them all at once so each acquire gets a distinct connection
+            for _ in range(connections):
+                opened.append(
+                    await connector.acquire(
+                        urlparsed, self._verify_ssl, None, connector.timeouts, False
+                    )
+                )
+        finally:
+            for conn in opened:
+                connector.release(conn)
+        return len(opened)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        connector = self._session.connector
+        pools = {}
+        for key, pool in connector.pools.items():
+            free = pool.free_conns()
+            buckets = getattr(pool, "pool", {})
+            pools[key] = {
+                "size": pool.pool_size,
+                "in_use": pool.pool_size - free,
+                # free connections holding an open socket, ready for reuse
+                "idle": sum(
+                    1 for bucket in buckets.values() for conn in bucket if conn.is_connected
+                ) if isinstance(buckets, dict) else free,
+                "acquired": getattr(pool, "acquired", 0),
+                "waits": getattr(pool, "waits", 0),
+                "wait_ns": getattr(pool, "wait_ns", 0),
+            }
+        return {
+            "opened": getattr(connector, "opened", 0),
+            "reused": getattr(connector, "reused", 0),
+            "pools": pools,
+        }
+
+    @property
+    def cache(self) -> Optional[HTTPCache]:
+        return self._cache
+
+    @property
+    def coalesced(self) -> int:
+        """Requests that were answered by another caller's in-flight request."""
+        return self._coalesced
+
     async def request(self, request: HTTPRequest, *args: Any, **kwargs: Any) -> HTTPResponse:
+        if self._cache is not None:
+            return await self._cached_request(request)
+        return await self._fetch(request, request.headers)
+
+    async def _fetch(self, HTTPRequest request, dict headers) -> HTTPResponse:
+        if (
+            not self._coalesce
+            or request.method not in COALESCE_METHODS
+            or request.data is not None
+        ):
+            return await self._send(request, headers)
+        key = (
+            request.method,
+            request.url,
+            tuple(sorted(request.params.items())) if request.params else (),
+            tuple(_header(request.headers, name) for name in self._coalesce_headers),
+        )
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._send(request, headers))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._land(key, done))
+        else:
+            self._coalesced += 1
+        # Shielded: a caller giving up must not cancel the call for the others
+        return await asyncio.shield(task)
+
+    def _land(self, tuple key, object task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Marks the error as retrieved even if every caller was cancelled
+            task.exception()
+
+    @property
+    def retry(self) -> Optional[HTTPRetryPolicy]:
+        return self._retry
+
+    @property
+    def rate_limiter(self) -> Optional[HTTPRateLimiter]:
+        return self._rate_limiter
+
+    async def _send(self, HTTPRequest request, dict headers) -> HTTPResponse:
+        policy = self._retry
+        if policy is None or request.method not in policy.methods:
+            return await self._send_once(request, headers)
+        cdef int attempt = 0
+        cdef int64_t deadline = (
+            clock_monotonic() + <int64_t>(policy.deadline * NS_PER_SECOND)
+            if policy.deadline is not None else 0
+        )
+        while True:
+            delay = policy.delay(attempt)
+            try:
+                response = await self._send_hedged(request, headers, policy)
+            except policy.exceptions:
+                if not self._retry_allowed(policy, attempt, deadline, delay):
+                    raise
+            else:
+                if response.status_code not in policy.statuses or not self._retry_allowed(
+                    policy, attempt, deadline, delay
+                ):
+                    return response
+            await asyncio.sleep(delay)
+            attempt += 1
+            policy.retries += 1
+
+    cdef bint _retry_allowed(self, object policy, int attempt, int64_t deadline, double delay):
+        if attempt + 1 >= policy.attempts:
+            return False
+        # Backoff included: a retry that could only start late is not worth it
+        return deadline == 0 or clock_monotonic() + <int64_t>(delay * NS_PER_SECOND) < deadline
+
+    async def _send_hedged(
+        self, HTTPRequest request, dict headers, object policy
+    ) -> HTTPResponse:
+        delay = policy.hedge_delay()
+        first = asyncio.create_task(self._send_timed(request, headers, policy))
+        if delay is None:
+            return await first
+        tasks = {first}
+        try:
+            done, tasks = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return first.result()
+            policy.hedges += 1
+            tasks.add(asyncio.create_task(self._send_timed(request, headers, policy)))
+            # The first success wins; an error only counts once both failed
+            while True:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            policy.hedge_wins += 1
+                        return task.result()
+                if not tasks:
+                    return done.pop().result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _send_timed(
+        self, HTTPRequest request, dict headers, object policy
+    ) -> HTTPResponse:
+        cdef int64_t start = clock_monotonic()
+        response = await self._send_once(request, headers)
+        policy.observe(clock_monotonic() - start)
+        return response
+
+    async def _send_once(self, HTTPRequest request, dict headers) -> HTTPResponse:
+        limiter = self._rate_limiter
+        if limiter is None:
+            return await self._send_upstream(request, headers)
+        scopes = await limiter.acquire(request.url)
+        try:
+            response = await self._send_upstream(request, headers)
+        finally:
+            limiter.release(scopes)
+        limiter.observe(scopes, response.status_code, response.headers)
+        return response
+
+    async def _send_upstream(self, HTTPRequest request, dict headers) -> HTTPResponse:
         resp = await self._request(
             url=request.url,
             method=request.method,
-            headers=request.headers,
+            headers=headers,
             params=request.params,
             data=request.data,
         )
-        return HTTPResponse(resp.status_code, dict(resp.headers), await resp.content())
\ No newline at end of file
+        return HTTPResponse(resp.status_code, dict(resp.headers), await resp.content())
+
+    async def _cached_request(self, HTTPRequest request) -> HTTPResponse:
+        cache = self._cache
+        key = cache.key(request)
+        if key is None:
+            return await self._fetch(request, request.headers)
+        entry, fresh = cache.lookup(key, request)
+        if fresh:
+            return entry.response()
+        response = await self._fetch(request, cache.conditional_headers(entry, request))
+        if response.status_code == HTTP_NOT_MODIFIED_STATUS_CODE and entry is not None:
+            return cache.refresh(key, entry, response)
+        cache.store(key, request, response)
+        return response
+
+    async def stream(self, request: HTTPRequest) -> HTTPStreamResponse:
+        """Send ``request`` and return as soon as the response headers are in."""
+        limiter = self._rate_limiter
+        scopes = await limiter.acquire(request.url) if limiter is not None else None
+        try:
+            resp = await self._request(
+                url=request.url,
+                method=request.method,
+                headers=request.headers,
+                params=request.params,
+                data=request.data,
+                stream=True,
+            )
+        finally:
+            # The slot covers the request, not however long the body is read
+            if scopes is not None:
+                limiter.release(scopes)
+        response = HTTPStreamResponse(resp)
+        if scopes is not None:
+            limiter.observe(scopes, response.status_code, response.headers)
+        return response
+
+    async def download(self, request: HTTPRequest, path: str, prefetch: int = 4) -> int:
+        """
+        Stream the response body into ``path``; returns the number of bytes.
+
+        The file is written from a worker thread while the next chunks are
+        downloaded, and only appears at ``path`` once it is complete.
+        """
+        partial = f"{path}.part"
+        async with await self.stream(request) as response:
+            response.raise_for_status()
+            reader = _BodyReader(response.iter_chunks(), prefetch)
+            try:
+                size = await asyncio.to_thread(_write_chunks, reader, partial)
+                os.replace(partial, path)
+            except BaseException:
+                if os.path.exists(partial):
+                    os.remove(partial)
+                raise
+            finally:
+                reader.stop()
+        return size
+
+    async def stream_csv(
+        self,
+        request: HTTPRequest,
+        read_options: Optional[Any] = None,
+        convert_options: Optional[Any] = None,
+        prefetch: int = 4,
+    ) -> AsyncIterator[Any]:
+        """
+        Parse a CSV response into pyarrow RecordBatches while it downloads.
+
+        Parsing runs in a worker thread with sdk.cfs.pa_iter_csv_batches;
+        memory is bounded by ``prefetch`` chunks plus one parser block.
+        """
+        # Imported here so sdk.cnet does not load pyarrow for non-CSV users
+        from ..cfs.arrow import pa_iter_csv_batches
+
+        async with await self.stream(request) as response:
+            response.raise_for_status()
+            reader = _BodyReader(response.iter_chunks(), prefetch)
+            batches = None
+            try:
+                batches = await asyncio.to_thread(
+                    pa_iter_csv_batches, io.BufferedReader(reader), read_options, convert_options
+                )
+                while (batch := await asyncio.to_thread(_next_batch, batches)) is not None:
+                    yield batch
+            finally:
+                reader.stop()
+                if batches is not None:
+                    # Closing joins pyarrow's read-ahead thread, which may be in
+                    # next_chunk(): never block the loop on it
+                    await asyncio.to_thread(batches.close)
+
+    async def stream_ndjson(self, request: HTTPRequest) -> AsyncIterator[Any]:
+        """Parse a newline-delimited JSON response one record at a time."""
+        from ..cfs.json import read_json_bytes
+
+        async with await self.stream(request) as response:
+            response.raise_for_status()
+            tail = b""
+            async for chunk in response:
+                lines = (tail + chunk).split(b"\n")
+                tail = lines.pop()
+                for line in lines:
+                    if line.strip():
+                        yield read_json_bytes(line)
+            if tail.strip():
+                yield read_json_bytes(tail)
+
+    def request_many(
+        self,
+        requests: Iterable[HTTPRequest],
+        concurrency: int = 16,
+        ordered: bool = True,
+        timeout: Optional[float] = None,
+        return_exceptions: bool = False,
+    ) -> Union[Awaitable[List[Any]], AsyncIterator[Tuple[int, Any]]]:
+        """
+        Send ``requests`` with at most ``concurrency`` in flight.
+
+        With ``ordered=True`` this is awaited for a list of responses in
+        request order; otherwise it is an async iterator of
+        ``(index, response)`` in completion order. ``timeout`` applies to each
+        request. The first error cancels the remaining requests and is raised,
+        unless ``return_exceptions`` puts it in place of the response.
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        if ordered:
+            return self._request_ordered(requests, concurrency, timeout, return_exceptions)
+        return self._request_unordered(requests, concurrency, timeout, return_exceptions)
+
+    async def _request_ordered(
+        self,
+        requests: Iterable[HTTPRequest],
+        concurrency: int,
+        timeout: Optional[float],
+        return_exceptions: bool,
+    ) -> List[Any]:
+        results = {}
+        async for index, response in self._request_unordered(
+            requests, concurrency, timeout, return_exceptions
+        ):
+            results[index] = response
+        return [results[index] for index in range(len(results))]
+
+    async def _request_unordered(
+        self,
+        requests: Iterable[HTTPRequest],
+        concurrency: int,
+        timeout: Optional[float],
+        return_exceptions: bool,
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        # A fixed set of workers pulls from one iterator, so neither tasks nor
+        # finished responses pile up however many requests there are
+        pending = iter(enumerate(requests))
+        queue = asyncio.Queue(concurrency)
+
+        async def work() -> None:
+            for index, request in pending:
+                try:
+                    response = await asyncio.wait_for(self.request(request), timeout)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if not return_exceptions:
+                        await queue.put((index, e, True))
+                        return
+                    response = e
+                await queue.put((index, response, False))
+
+        async def finish() -> None:
+            await asyncio.gather(*workers)
+            await queue.put(None)
+
+        workers = [asyncio.create_task(work()) for _ in range(concurrency)]
+        finisher = asyncio.create_task(finish())
+        try:
+            while (item := await queue.get()) is not None:
+                index, response, failed = item
+                if failed:
+                    raise response
+                yield index, response
+        finally:
+            for task in workers:
+                task.cancel()
+            finisher.cancel()
+            await asyncio.gather(*workers, finisher, return_exceptions=True)
\ No newline at end of file
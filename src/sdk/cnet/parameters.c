@@ -4,6 +4,7 @@
 // This file is a C extension for Python, implementing two classes:
 //   - AbstractSocketParameters (abstract base)
 //   - TCPSocketParameters (concrete, for TCP sockets)
+//   - IPCSocketParameters, InprocSocketParameters (same-host transports)
 // It is intended to be imported as sdk.cnet.parameters
 
 #include "parameters.h"
@@ -64,12 +65,30 @@ TCPSocketParameters_init(TCPSocketParametersObject *self, PyObject *args, PyObje
 {
     PyObject *host = NULL;
     PyObject *port = NULL;
-    static char *kwlist[] = {"host", "port", NULL};
+    PyObject *tcp_keepalive = NULL;
+    PyObject *tcp_keepalive_idle = NULL;
+    PyObject *tcp_keepalive_intvl = NULL;
+    PyObject *tcp_keepalive_cnt = NULL;
+    PyObject *tcp_maxrt = NULL;
+    static char *kwlist[] = {"host", "port", "tcp_keepalive", "tcp_keepalive_idle",
+                             "tcp_keepalive_intvl", "tcp_keepalive_cnt", "tcp_maxrt", NULL};
 
     // Initialize cache
     TCPSocketParameters_init_cache(self);
+    self->_socket_options = NULL;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OO", kwlist, &host, &port))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OO|$OOOOO", kwlist, &host, &port,
+                                     &tcp_keepalive, &tcp_keepalive_idle, &tcp_keepalive_intvl,
+                                     &tcp_keepalive_cnt, &tcp_maxrt))
+        return -1;
+
+    self->_socket_options = PyDict_New();
+    if (!self->_socket_options) return -1;
+    if (TCPSocketParameters_add_option(self->_socket_options, "tcp_keepalive", tcp_keepalive) < 0 ||
+        TCPSocketParameters_add_option(self->_socket_options, "tcp_keepalive_idle", tcp_keepalive_idle) < 0 ||
+        TCPSocketParameters_add_option(self->_socket_options, "tcp_keepalive_intvl", tcp_keepalive_intvl) < 0 ||
+        TCPSocketParameters_add_option(self->_socket_options, "tcp_keepalive_cnt", tcp_keepalive_cnt) < 0 ||
+        TCPSocketParameters_add_option(self->_socket_options, "tcp_maxrt", tcp_maxrt) < 0)
         return -1;
 
     Py_INCREF(host);
@@ -89,6 +108,7 @@ static void
 TCPSocketParameters_dealloc(TCPSocketParametersObject *self)
 {
     TCPSocketParameters_clear_cache(self);
+    Py_XDECREF(self->_socket_options);
     AbstractSocketParameters_dealloc((AbstractSocketParametersObject *)self);
 }
 
@@ -144,8 +164,17 @@ TCPSocketParameters_get_url(TCPSocketParametersObject *self, void *closure)
     return url_obj;
 }
 
+// Returns a copy so callers cannot mutate the configured options
+static PyObject *
+TCPSocketParameters_get_socket_options(TCPSocketParametersObject *self, void *closure)
+{
+    if (!self->_socket_options) return PyDict_New();
+    return PyDict_Copy(self->_socket_options);
+}
+
 static PyGetSetDef TCPSocketParameters_getset[] = {
     {"url", (getter)TCPSocketParameters_get_url, NULL, "url property", NULL},
+    {"socket_options", (getter)TCPSocketParameters_get_socket_options, NULL, "socket_options property", NULL},
     {NULL}
 };
 
@@ -162,6 +191,315 @@ static PyTypeObject TCPSocketParametersType = {
     .tp_getset = TCPSocketParameters_getset,
 };
 
+// ---------------- IPCSocketParameters ----------------
+
+static int
+IPCSocketParameters_init(IPCSocketParametersObject *self, PyObject *args, PyObject *kwds)
+{
+    PyObject *dir = NULL;
+    PyObject *filename = NULL;
+    static char *kwlist[] = {"dir", "filename", NULL};
+
+    IPCSocketParameters_init_cache(self);
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "UU", kwlist, &dir, &filename))
+        return -1;
+
+    Py_ssize_t dir_len = PyUnicode_GET_LENGTH(dir);
+    if (dir_len == 0 || PyUnicode_GET_LENGTH(filename) == 0) {
+        PyErr_SetString(PyExc_ValueError, "dir and filename must not be empty");
+        return -1;
+    }
+    if (PyUnicode_FindChar(filename, '/', 0, PyUnicode_GET_LENGTH(filename), 1) != -1) {
+        PyErr_SetString(PyExc_ValueError, "filename must not contain '/'");
+        return -1;
+    }
+
+    // Paths are fixed after init, so build url and path once; the getter is a plain incref
+    PyObject *path = PyUnicode_READ_CHAR(dir, dir_len - 1) == '/'
+        ? PyUnicode_Concat(dir, filename)
+        : PyUnicode_FromFormat("%U/%U", dir, filename);
+    if (!path) return -1;
+
+    PyObject *encoded = PyUnicode_EncodeFSDefault(path);
+    if (!encoded) {
+        Py_DECREF(path);
+        return -1;
+    }
+    Py_ssize_t encoded_len = PyBytes_GET_SIZE(encoded);
+    Py_DECREF(encoded);
+    if (encoded_len > (Py_ssize_t)IPC_MAX_PATH_LENGTH) {
+        PyErr_Format(PyExc_ValueError, "IPC path is %zd bytes, the limit is %zd: %U",
+                     encoded_len, (Py_ssize_t)IPC_MAX_PATH_LENGTH, path);
+        Py_DECREF(path);
+        return -1;
+    }
+
+    PyObject *url_obj = PyUnicode_FromFormat(IPC_PROTOCOL "://%U", path);
+    if (!url_obj) {
+        Py_DECREF(path);
+        return -1;
+    }
+
+    PyObject *ipc_str = PyUnicode_FromString(IPC_PROTOCOL);
+    if (!ipc_str) {
+        Py_DECREF(path);
+        Py_DECREF(url_obj);
+        return -1;
+    }
+
+    Py_INCREF(dir);
+    self->base._dir = dir;
+    Py_INCREF(filename);
+    self->base._filename = filename;
+    self->base._protocol = ipc_str;
+    self->_path = path;
+    self->_url_cache = url_obj;
+
+    return 0;
+}
+
+static void
+IPCSocketParameters_dealloc(IPCSocketParametersObject *self)
+{
+    IPCSocketParameters_clear_cache(self);
+    AbstractSocketParameters_dealloc((AbstractSocketParametersObject *)self);
+}
+
+static PyObject *
+IPCSocketParameters_get_url(IPCSocketParametersObject *self, void *closure)
+{
+    if (UNLIKELY(!self->_url_cache)) {
+        PyErr_SetString(PyExc_RuntimeError, "IPCSocketParameters fields not properly initialized");
+        return NULL;
+    }
+    Py_INCREF(self->_url_cache);
+    return self->_url_cache;
+}
+
+static PyObject *
+IPCSocketParameters_get_path(IPCSocketParametersObject *self, void *closure)
+{
+    if (UNLIKELY(!self->_path)) {
+        PyErr_SetString(PyExc_RuntimeError, "IPCSocketParameters fields not properly initialized");
+        return NULL;
+    }
+    Py_INCREF(self->_path);
+    return self->_path;
+}
+
+// Removes the socket file if it exists; refuses to remove anything that is not a socket
+static PyObject *
+IPCSocketParameters_cleanup(IPCSocketParametersObject *self, PyObject *Py_UNUSED(ignored))
+{
+    if (UNLIKELY(!self->_path)) {
+        PyErr_SetString(PyExc_RuntimeError, "IPCSocketParameters fields not properly initialized");
+        return NULL;
+    }
+    PyObject *encoded = PyUnicode_EncodeFSDefault(self->_path);
+    if (!encoded) return NULL;
+
+    struct stat st;
+    const char *path_cstr = PyBytes_AS_STRING(encoded);
+    if (lstat(path_cstr, &st) < 0) {
+        Py_DECREF(encoded);
+        if (errno == ENOENT) Py_RETURN_FALSE;
+        return PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, self->_path);
+    }
+    if (!S_ISSOCK(st.st_mode)) {
+        Py_DECREF(encoded);
+        PyErr_Format(PyExc_FileExistsError, "%U exists and is not a socket", self->_path);
+        return NULL;
+    }
+    if (unlink(path_cstr) < 0) {
+        Py_DECREF(encoded);
+        if (errno == ENOENT) Py_RETURN_FALSE;
+        return PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, self->_path);
+    }
+    Py_DECREF(encoded);
+    Py_RETURN_TRUE;
+}
+
+// Returns 1 if a process is accepting on the socket file, 0 if nobody is (stale), -1 on error
+static int
+IPCSocketParameters_probe(const char *path_cstr, Py_ssize_t path_len)
+{
+    struct sockaddr_un addr;
+    memset(&addr, 0, sizeof(addr));
+    addr.sun_family = AF_UNIX;
+    memcpy(addr.sun_path, path_cstr, path_len);
+
+    int fd = socket(AF_UNIX, SOCK_STREAM, 0);
+    if (fd < 0) return -1;
+    int rc = connect(fd, (struct sockaddr *)&addr, sizeof(addr));
+    int saved_errno = errno;
+    close(fd);
+    if (rc == 0) return 1;
+    if (saved_errno == ECONNREFUSED || saved_errno == ENOENT) return 0;
+    errno = saved_errno;
+    return -1;
+}
+
+// Creates the socket directory (owner-only) and removes a stale socket file before bind.
+// A socket file that still accepts connections belongs to a live binder: EADDRINUSE.
+static PyObject *
+IPCSocketParameters_prepare(IPCSocketParametersObject *self, PyObject *Py_UNUSED(ignored))
+{
+    if (UNLIKELY(!self->base._dir || !self->_path)) {
+        PyErr_SetString(PyExc_RuntimeError, "IPCSocketParameters fields not properly initialized");
+        return NULL;
+    }
+    PyObject *encoded = PyUnicode_EncodeFSDefault(self->base._dir);
+    if (!encoded) return NULL;
+    if (mkdir(PyBytes_AS_STRING(encoded), IPC_DIR_MODE) < 0 && errno != EEXIST) {
+        Py_DECREF(encoded);
+        return PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, self->base._dir);
+    }
+    Py_DECREF(encoded);
+
+    encoded = PyUnicode_EncodeFSDefault(self->_path);
+    if (!encoded) return NULL;
+    struct stat st;
+    if (lstat(PyBytes_AS_STRING(encoded), &st) < 0) {
+        Py_DECREF(encoded);
+        if (errno == ENOENT) Py_RETURN_NONE;
+        return PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, self->_path);
+    }
+    if (!S_ISSOCK(st.st_mode)) {
+        Py_DECREF(encoded);
+        PyErr_Format(PyExc_FileExistsError, "%U exists and is not a socket", self->_path);
+        return NULL;
+    }
+
+    int live;
+    Py_BEGIN_ALLOW_THREADS
+    live = IPCSocketParameters_probe(PyBytes_AS_STRING(encoded), PyBytes_GET_SIZE(encoded));
+    Py_END_ALLOW_THREADS
+    Py_DECREF(encoded);
+    if (live < 0) {
+        return PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, self->_path);
+    }
+    if (live) {
+        errno = EADDRINUSE;
+        return PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, self->_path);
+    }
+
+    PyObject *removed = IPCSocketParameters_cleanup(self, NULL);
+    if (!removed) return NULL;
+    Py_DECREF(removed);
+    Py_RETURN_NONE;
+}
+
+static PyGetSetDef IPCSocketParameters_getset[] = {
+    {"url", (getter)IPCSocketParameters_get_url, NULL, "url property", NULL},
+    {"path", (getter)IPCSocketParameters_get_path, NULL, "socket file path", NULL},
+    {NULL}
+};
+
+static PyMethodDef IPCSocketParameters_methods[] = {
+    {"prepare", (PyCFunction)IPCSocketParameters_prepare, METH_NOARGS,
+     "Create the socket directory and remove a stale socket file; EADDRINUSE if one is live"},
+    {"cleanup", (PyCFunction)IPCSocketParameters_cleanup, METH_NOARGS,
+     "Remove the socket file; returns True if it existed"},
+    {NULL}
+};
+
+static PyTypeObject IPCSocketParametersType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = PARAMETERS_MODULE_NAME "." IPC_SOCKET_PARAMETERS_CLASS_NAME,
+    .tp_basicsize = sizeof(IPCSocketParametersObject),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    .tp_base = &AbstractSocketParametersType,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)IPCSocketParameters_init,
+    .tp_dealloc = (destructor)IPCSocketParameters_dealloc,
+    .tp_getset = IPCSocketParameters_getset,
+    .tp_methods = IPCSocketParameters_methods,
+};
+
+// ---------------- InprocSocketParameters ----------------
+
+static int
+InprocSocketParameters_init(InprocSocketParametersObject *self, PyObject *args, PyObject *kwds)
+{
+    PyObject *name = NULL;
+    static char *kwlist[] = {"name", NULL};
+
+    self->_url_cache = NULL;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "U", kwlist, &name))
+        return -1;
+    if (PyUnicode_GET_LENGTH(name) == 0) {
+        PyErr_SetString(PyExc_ValueError, "name must not be empty");
+        return -1;
+    }
+
+    PyObject *url_obj = PyUnicode_FromFormat(INPROC_PROTOCOL "://%U", name);
+    if (!url_obj) return -1;
+
+    PyObject *inproc_str = PyUnicode_FromString(INPROC_PROTOCOL);
+    if (!inproc_str) {
+        Py_DECREF(url_obj);
+        return -1;
+    }
+
+    Py_INCREF(name);
+    self->base._filename = name;
+    self->base._protocol = inproc_str;
+    self->_url_cache = url_obj;
+
+    return 0;
+}
+
+static void
+InprocSocketParameters_dealloc(InprocSocketParametersObject *self)
+{
+    Py_XDECREF(self->_url_cache);
+    self->_url_cache = NULL;
+    AbstractSocketParameters_dealloc((AbstractSocketParametersObject *)self);
+}
+
+static PyObject *
+InprocSocketParameters_get_url(InprocSocketParametersObject *self, void *closure)
+{
+    if (UNLIKELY(!self->_url_cache)) {
+        PyErr_SetString(PyExc_RuntimeError, "InprocSocketParameters fields not properly initialized");
+        return NULL;
+    }
+    Py_INCREF(self->_url_cache);
+    return self->_url_cache;
+}
+
+static PyObject *
+InprocSocketParameters_get_name(InprocSocketParametersObject *self, void *closure)
+{
+    if (self->base._filename) {
+        Py_INCREF(self->base._filename);
+        return self->base._filename;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyGetSetDef InprocSocketParameters_getset[] = {
+    {"url", (getter)InprocSocketParameters_get_url, NULL, "url property", NULL},
+    {"name", (getter)InprocSocketParameters_get_name, NULL, "endpoint name", NULL},
+    {NULL}
+};
+
+static PyTypeObject InprocSocketParametersType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = PARAMETERS_MODULE_NAME "." INPROC_SOCKET_PARAMETERS_CLASS_NAME,
+    .tp_basicsize = sizeof(InprocSocketParametersObject),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    .tp_base = &AbstractSocketParametersType,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)InprocSocketParameters_init,
+    .tp_dealloc = (destructor)InprocSocketParameters_dealloc,
+    .tp_getset = InprocSocketParameters_getset,
+};
+
 // ---------------- PGConnectionParameters ----------------
 
 static int
@@ -559,6 +897,10 @@ PyInit_parameters(void)
         return NULL;
     if (PyType_Ready(&TCPSocketParametersType) < 0)
         return NULL;
+    if (PyType_Ready(&IPCSocketParametersType) < 0)
+        return NULL;
+    if (PyType_Ready(&InprocSocketParametersType) < 0)
+        return NULL;
     if (PyType_Ready(&PGConnectionParametersType) < 0)
         return NULL;
 
@@ -580,6 +922,20 @@ PyInit_parameters(void)
         return NULL;
     }
 
+    Py_INCREF(&IPCSocketParametersType);
+    if (PyModule_AddObject(m, IPC_SOCKET_PARAMETERS_CLASS_NAME, (PyObject *)&IPCSocketParametersType) < 0) {
+        Py_DECREF(&IPCSocketParametersType);
+        Py_DECREF(m);
+        return NULL;
+    }
+
+    Py_INCREF(&InprocSocketParametersType);
+    if (PyModule_AddObject(m, INPROC_SOCKET_PARAMETERS_CLASS_NAME, (PyObject *)&InprocSocketParametersType) < 0) {
+        Py_DECREF(&InprocSocketParametersType);
+        Py_DECREF(m);
+        return NULL;
+    }
+
     Py_INCREF(&PGConnectionParametersType);
     if (PyModule_AddObject(m, PG_CONNECTION_PARAMETERS_CLASS_NAME, (PyObject *)&PGConnectionParametersType) < 0) {
         Py_DECREF(&PGConnectionParametersType);
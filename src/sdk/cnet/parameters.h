@@ -6,6 +6,11 @@
 #include <structmember.h>
 #include <stdio.h>
 #include <string.h>
+#include <errno.h>
+#include <sys/socket.h>
+#include <sys/stat.h>
+#include <sys/un.h>
+#include <unistd.h>
 
 // ---------------- Constants and Macros ----------------
 
@@ -13,12 +18,20 @@
 #define ABSTRACT_SOCKET_PARAMETERS_CLASS_NAME "AbstractSocketParameters"
 #define TCP_SOCKET_PARAMETERS_CLASS_NAME "TCPSocketParameters"
 #define PG_CONNECTION_PARAMETERS_CLASS_NAME "PGConnectionParameters"
+#define IPC_SOCKET_PARAMETERS_CLASS_NAME "IPCSocketParameters"
+#define INPROC_SOCKET_PARAMETERS_CLASS_NAME "InprocSocketParameters"
 
 // URL building constants
 #define TCP_PROTOCOL "tcp"
 #define URL_PREFIX "tcp://"
 #define URL_SEPARATOR ":"
 #define MAX_PORT_LENGTH 16
+#define IPC_PROTOCOL "ipc"
+#define INPROC_PROTOCOL "inproc"
+
+// Unix domain socket paths must fit in sockaddr_un.sun_path, including the NUL
+#define IPC_MAX_PATH_LENGTH (sizeof(((struct sockaddr_un *)0)->sun_path) - 1)
+#define IPC_DIR_MODE 0700
 
 // Cache validation macros
 #define CACHE_INVALID 0
@@ -65,6 +78,8 @@ typedef struct {
     PyObject *_url_cache;      // PyUnicode object, NULL if invalid
     Py_hash_t _host_hash;
     long _port_val;
+    // TCP transport socket options, {pyzmq option name: int}
+    PyObject *_socket_options;
 } TCPSocketParametersObject;
 
 // Inline utility functions for TCPSocketParameters
@@ -74,6 +89,16 @@ static inline void TCPSocketParameters_init_cache(TCPSocketParametersObject *sel
     self->_port_val = -1;
 }
 
+// Adds name -> value to the options dict unless value is NULL/None; values must be ints
+static inline int TCPSocketParameters_add_option(PyObject *options, const char *name, PyObject *value) {
+    if (!value || value == Py_None) return 0;
+    if (!PyLong_Check(value)) {
+        PyErr_Format(PyExc_TypeError, "%s must be an integer", name);
+        return -1;
+    }
+    return PyDict_SetItemString(options, name, value);
+}
+
 static inline void TCPSocketParameters_clear_cache(TCPSocketParametersObject *self) {
     Py_XDECREF(self->_url_cache);
     self->_url_cache = NULL;
@@ -131,6 +156,49 @@ static inline PyObject *TCPSocketParameters_build_url(const char *host_cstr, Py_
 static int TCPSocketParameters_init(TCPSocketParametersObject *self, PyObject *args, PyObject *kwds);
 static void TCPSocketParameters_dealloc(TCPSocketParametersObject *self);
 static PyObject *TCPSocketParameters_get_url(TCPSocketParametersObject *self, void *closure);
+static PyObject *TCPSocketParameters_get_socket_options(TCPSocketParametersObject *self, void *closure);
+
+// ---------------- IPCSocketParameters ----------------
+
+typedef struct {
+    AbstractSocketParametersObject base;
+    // Fields are immutable after init, so url and path are built once there
+    PyObject *_url_cache;      // "ipc://" + path
+    PyObject *_path;           // dir + "/" + filename
+} IPCSocketParametersObject;
+
+static inline void IPCSocketParameters_init_cache(IPCSocketParametersObject *self) {
+    self->_url_cache = NULL;
+    self->_path = NULL;
+}
+
+static inline void IPCSocketParameters_clear_cache(IPCSocketParametersObject *self) {
+    Py_XDECREF(self->_url_cache);
+    Py_XDECREF(self->_path);
+    self->_url_cache = NULL;
+    self->_path = NULL;
+}
+
+// Function prototypes for IPCSocketParameters
+static int IPCSocketParameters_init(IPCSocketParametersObject *self, PyObject *args, PyObject *kwds);
+static void IPCSocketParameters_dealloc(IPCSocketParametersObject *self);
+static PyObject *IPCSocketParameters_get_url(IPCSocketParametersObject *self, void *closure);
+static PyObject *IPCSocketParameters_get_path(IPCSocketParametersObject *self, void *closure);
+static PyObject *IPCSocketParameters_prepare(IPCSocketParametersObject *self, PyObject *Py_UNUSED(ignored));
+static PyObject *IPCSocketParameters_cleanup(IPCSocketParametersObject *self, PyObject *Py_UNUSED(ignored));
+
+// ---------------- InprocSocketParameters ----------------
+
+typedef struct {
+    AbstractSocketParametersObject base;
+    PyObject *_url_cache;      // "inproc://" + name, built once in init
+} InprocSocketParametersObject;
+
+// Function prototypes for InprocSocketParameters
+static int InprocSocketParameters_init(InprocSocketParametersObject *self, PyObject *args, PyObject *kwds);
+static void InprocSocketParameters_dealloc(InprocSocketParametersObject *self);
+static PyObject *InprocSocketParameters_get_url(InprocSocketParametersObject *self, void *closure);
+static PyObject *InprocSocketParameters_get_name(InprocSocketParametersObject *self, void *closure);
 
 // ---------------- PGConnectionParameters ----------------
 
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Dict, Optional
 
 class AbstractSocketParameters:
     _protocol: str
@@ -12,9 +12,39 @@ class AbstractSocketParameters:
     
 
 class TCPSocketParameters(AbstractSocketParameters):
-    def __init__(self, host: str, port: int) -> None: ...
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        tcp_keepalive: Optional[int] = None,
+        tcp_keepalive_idle: Optional[int] = None,
+        tcp_keepalive_intvl: Optional[int] = None,
+        tcp_keepalive_cnt: Optional[int] = None,
+        tcp_maxrt: Optional[int] = None,
+    ) -> None: ...
     @property
     def url(self) -> str: ...
+    @property
+    def socket_options(self) -> Dict[str, int]: ...
+
+
+class IPCSocketParameters(AbstractSocketParameters):
+    def __init__(self, dir: str, filename: str) -> None: ...
+    @property
+    def url(self) -> str: ...
+    @property
+    def path(self) -> str: ...
+    def prepare(self) -> None: ...
+    def cleanup(self) -> bool: ...
+
+
+class InprocSocketParameters(AbstractSocketParameters):
+    def __init__(self, name: str) -> None: ...
+    @property
+    def url(self) -> str: ...
+    @property
+    def name(self) -> str: ...
 
 
 class PGConnectionParameters(AbstractSocketParameters):
@@ -0,0 +1,52 @@
+from typing import Any, Awaitable, Callable, List, Optional, Self
+
+from .parameters import IPCSocketParameters
+from .zmq import ZMQContext, ZMQSocketOptions
+
+TASK: bytes
+END: bytes
+RESULT: bytes
+FAILED: bytes
+DONE: bytes
+
+class ZMQWorkerPool(object):
+    def __init__(
+        self,
+        handler: Callable[[List[bytes]], Awaitable[List[bytes]]],
+        processes: Optional[int] = None,
+        concurrency: int = 1,
+        dir: Optional[str] = None,
+        name: str = "pool",
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        batch_size: int = 1024,
+        max_errors: int = 1024,
+    ) -> None: ...
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None: ...
+    @property
+    def processes(self) -> int: ...
+    @property
+    def submitted(self) -> int: ...
+    @property
+    def completed(self) -> int: ...
+    @property
+    def failed(self) -> int: ...
+    @property
+    def pending(self) -> int: ...
+    @property
+    def restarts(self) -> int: ...
+    @property
+    def errors(self) -> List[str]: ...
+    @property
+    def pids(self) -> List[Optional[int]]: ...
+    async def submit(self, message: List[bytes]) -> None: ...
+    async def submit_batch(self, messages: List[List[bytes]]) -> None: ...
+    async def results(
+        self, max_n: int = 1024, timeout: Optional[float] = None
+    ) -> List[List[bytes]]: ...
+    async def drain(self, timeout: Optional[float] = None) -> None: ...
+    async def restart(
+        self, index: Optional[int] = None, timeout: Optional[float] = None
+    ) -> None: ...
+    def supervise(self) -> int: ...
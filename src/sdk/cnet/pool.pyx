@@ -0,0 +1,380 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Self
+
+import asyncio
+import multiprocessing
+import os
+import shutil
+import tempfile
+from collections import deque
+
+import zmq
+
+from .parameters import IPCSocketParameters
+from .zmq import SendStatus, ZMQContext, ZMQPull, ZMQPush, ZMQSocketOptions
+
+# Wire protocol: the first frame is a 1-byte command
+#   pool -> worker: TASK *payload | END
+#   worker -> sink: RESULT *frames | FAILED reason | DONE index
+TASK = b"\x01"
+END = b"\x02"
+RESULT = b"\x03"
+FAILED = b"\x04"
+DONE = b"\x05"
+
+
+async def _serve(
+    index: int,
+    handler: Callable[[List[bytes]], Awaitable[List[bytes]]],
+    endpoint: IPCSocketParameters,
+    sink: IPCSocketParameters,
+    concurrency: int,
+    batch_size: int,
+    options: Optional[ZMQSocketOptions],
+) -> None:
+    # zmq contexts do not cross processes: every worker owns one
+    context = ZMQContext()
+    limit = asyncio.Semaphore(concurrency)
+    tasks = set()
+
+    async with ZMQPull(endpoint, context=context, options=options) as pull, \
+            ZMQPush(sink, context=context, options=options) as push:
+
+        async def process(payload: List[bytes]) -> None:
+            try:
+                reply = [RESULT] + list(await handler(payload))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                reply = [FAILED, str(e).encode()]
+            finally:
+                limit.release()
+            await push.send_multipart(reply)
+
+        running = True
+        while running:
+            for message in await pull.recv_batch(batch_size):
+                if len(message) == 0:
+                    continue
+                if message[0] == END:
+                    # Messages are ordered per pipe: everything sent before END is in
+                    running = False
+                    break
+                await limit.acquire()
+                task = asyncio.create_task(process(message[1:]))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        await push.send_multipart([DONE, index.to_bytes(4, "big")])
+
+
+def _run_worker(
+    index: int,
+    handler: Callable[[List[bytes]], Awaitable[List[bytes]]],
+    dir: str,
+    endpoint: str,
+    sink: str,
+    concurrency: int,
+    batch_size: int,
+    options: Optional[ZMQSocketOptions],
+) -> None:
+    from .. import evlib
+
+    # Socket parameters do not pickle: rebuild them in the spawned process
+    evlib.run(
+        _serve(
+            index,
+            handler,
+            IPCSocketParameters(dir, endpoint),
+            IPCSocketParameters(dir, sink),
+            concurrency,
+            batch_size,
+            options,
+        )
+    )
+
+
+class ZMQWorkerPool(object):
+    """
+    Fans messages out to ``processes`` worker processes over IPC PUSH/PULL.
+
+    Each worker runs its own sdk.evlib loop with a ZMQPull bound to a
+    private ipc endpoint and awaits ``handler`` on every message, up to
+    ``concurrency`` at a time. Handler results come back through a sink
+    ZMQPull in the pool; one result (possibly empty) is produced per
+    submitted message, and handler exceptions are counted in ``failed``.
+
+    Messages go round-robin to workers whose send queue has room. Workers
+    that die are restarted by ``supervise()`` (messages queued to them are
+    lost); ``restart()`` replaces workers one at a time without losing any.
+
+    Workers are spawned, not forked, since the parent runs zmq io threads:
+    ``handler`` and ``options`` must be picklable, e.g. a module-level
+    coroutine function.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[bytes]], Awaitable[List[bytes]]],
+        processes: Optional[int] = None,
+        concurrency: int = 1,
+        dir: Optional[str] = None,
+        name: str = "pool",
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        batch_size: int = 1024,
+        max_errors: int = 1024,
+    ):
+        processes = processes or os.cpu_count() or 1
+        if processes <= 0:
+            raise ValueError("processes must be positive")
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        self._handler = handler
+        self._processes: int = processes
+        self._concurrency: int = concurrency
+        self._dir: Optional[str] = dir
+        self._owns_dir: bool = dir is None
+        self._name: str = name
+        self._context: Optional[ZMQContext] = context
+        self._options: Optional[ZMQSocketOptions] = options
+        self._batch_size: int = batch_size
+        self._mp = multiprocessing.get_context("spawn")
+
+        self._sink: ZMQPull = None
+        self._pushes: List[ZMQPush] = []
+        self._workers: List[Any] = []
+        # Workers that were sent END and are not taking new messages
+        self._stopping: set = set()
+        self._cursor: int = 0
+        self._results: deque = deque()
+        self._errors: deque = deque(maxlen=max_errors)
+        self._done: set = set()
+        self._closed: bool = True
+        self._submitted: int = 0
+        self._completed: int = 0
+        self._failed: int = 0
+        self._restarts: int = 0
+
+    async def __aenter__(self) -> Self:
+        if self._owns_dir:
+            self._dir = tempfile.mkdtemp(prefix=f"{self._name}-")
+        self._sink = ZMQPull(self._sink_parameters(), context=self._context, options=self._options)
+        await self._sink.__aenter__()
+        try:
+            for index in range(self._processes):
+                push = ZMQPush(
+                    self._endpoint(index), context=self._context, options=self._options
+                )
+                await push.__aenter__()
+                self._pushes.append(push)
+                self._workers.append(self._spawn(index))
+        except BaseException:
+            await self._close()
+            raise
+        self._closed = False
+        return self
+
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        try:
+            if not self._closed:
+                await self.drain()
+        finally:
+            await self._close()
+
+    @property
+    def processes(self) -> int:
+        return self._processes
+
+    @property
+    def submitted(self) -> int:
+        return self._submitted
+
+    @property
+    def completed(self) -> int:
+        return self._completed
+
+    @property
+    def failed(self) -> int:
+        return self._failed
+
+    @property
+    def pending(self) -> int:
+        return self._submitted - self._completed - self._failed
+
+    @property
+    def restarts(self) -> int:
+        return self._restarts
+
+    @property
+    def errors(self) -> List[str]:
+        return list(self._errors)
+
+    @property
+    def pids(self) -> List[Optional[int]]:
+        return [worker.pid for worker in self._workers]
+
+    def _endpoint_name(self, index: int) -> str:
+        return f"{self._name}-{index}.ipc"
+
+    def _endpoint(self, index: int) -> IPCSocketParameters:
+        return IPCSocketParameters(self._dir, self._endpoint_name(index))
+
+    def _sink_name(self) -> str:
+        return f"{self._name}-sink.ipc"
+
+    def _sink_parameters(self) -> IPCSocketParameters:
+        return IPCSocketParameters(self._dir, self._sink_name())
+
+    def _spawn(self, index: int) -> Any:
+        worker = self._mp.Process(
+            target=_run_worker,
+            args=(
+                index,
+                self._handler,
+                self._dir,
+                self._endpoint_name(index),
+                self._sink_name(),
+                self._concurrency,
+                self._batch_size,
+                self._options,
+            ),
+            name=f"{self._name}-{index}",
+            daemon=True,
+        )
+        worker.start()
+        return worker
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("Worker pool is not running")
+
+    async def submit(self, message: List[bytes]) -> None:
+        self._check_open()
+        message = [TASK] + list(message)
+        cdef Py_ssize_t n = len(self._pushes)
+        cdef Py_ssize_t i, index
+        # Round-robin over workers with room, like a PUSH socket across its peers
+        for i in range(n):
+            index = (self._cursor + i) % n
+            if index in self._stopping:
+                continue
+            if self._pushes[index].send_nowait(message) == SendStatus.OK:
+                self._cursor = index + 1
+                self._submitted += 1
+                return
+        # Every queue is full: wait for room on the next worker in turn
+        for i in range(n):
+            index = (self._cursor + i) % n
+            if index not in self._stopping:
+                break
+        else:
+            raise RuntimeError("No workers are accepting messages")
+        await self._pushes[index].send_multipart(message)
+        self._cursor = index + 1
+        self._submitted += 1
+
+    async def submit_batch(self, messages: List[List[bytes]]) -> None:
+        for message in messages:
+            await self.submit(message)
+
+    def _collect(self, messages: List[List[bytes]]) -> None:
+        for message in messages:
+            if len(message) == 0:
+                continue
+            command = message[0]
+            if command == RESULT:
+                self._results.append(message[1:])
+                self._completed += 1
+            elif command == FAILED:
+                self._errors.append(message[1].decode() if len(message) > 1 else "unknown error")
+                self._failed += 1
+            elif command == DONE and len(message) > 1:
+                self._done.add(int.from_bytes(message[1], "big"))
+
+    async def results(
+        self, max_n: int = 1024, timeout: Optional[float] = None
+    ) -> List[List[bytes]]:
+        # Results buffered while draining or restarting are returned first
+        if not self._results:
+            self._collect(await self._sink.recv_batch(max_n, timeout))
+        results = []
+        while self._results and len(results) < max_n:
+            results.append(self._results.popleft())
+        return results
+
+    async def _stop_workers(self, indices: List[int], timeout: Optional[float]) -> None:
+        for index in indices:
+            self._stopping.add(index)
+            self._done.discard(index)
+            await self._pushes[index].send_multipart([END])
+
+        async def wait_done() -> None:
+            while not all(
+                index in self._done or not self._workers[index].is_alive()
+                for index in indices
+            ):
+                self._collect(await self._sink.recv_batch(self._batch_size, 0.1))
+
+        try:
+            await asyncio.wait_for(wait_done(), timeout)
+        finally:
+            for index in indices:
+                worker = self._workers[index]
+                await asyncio.to_thread(worker.join, timeout)
+                if worker.is_alive():
+                    worker.kill()
+                    await asyncio.to_thread(worker.join)
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """Stop taking messages, let workers finish what was sent and exit."""
+        self._check_open()
+        self._closed = True
+        live = [index for index in range(self._processes) if self._workers[index].is_alive()]
+        await self._stop_workers(live, timeout)
+
+    async def restart(
+        self, index: Optional[int] = None, timeout: Optional[float] = None
+    ) -> None:
+        """Replace one worker, or all of them one at a time, after draining it."""
+        self._check_open()
+        indices = range(self._processes) if index is None else [index]
+        for i in indices:
+            if self._workers[i].is_alive():
+                await self._stop_workers([i], timeout)
+            self._workers[i] = self._spawn(i)
+            self._stopping.discard(i)
+            self._restarts += 1
+
+    def supervise(self) -> int:
+        """Restart workers that exited on their own; returns how many were."""
+        self._check_open()
+        cdef int restarted = 0
+        for index in range(self._processes):
+            if index in self._stopping or self._workers[index].is_alive():
+                continue
+            self._workers[index].join()
+            self._workers[index] = self._spawn(index)
+            self._restarts += 1
+            restarted += 1
+        return restarted
+
+    async def _close(self) -> None:
+        self._closed = True
+        for worker in self._workers:
+            if worker.is_alive():
+                worker.kill()
+                await asyncio.to_thread(worker.join)
+        self._workers.clear()
+        for push in self._pushes:
+            # Whatever is still queued was meant for a worker that is gone
+            push._socket.setsockopt(zmq.LINGER, 0)
+            await push.__aexit__(None, None, None)
+        self._pushes.clear()
+        if self._sink is not None and self._sink._socket is not None:
+            await self._sink.__aexit__(None, None, None)
+        self._sink = None
+        if self._owns_dir and self._dir is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
@@ -0,0 +1,13 @@
+cdef class _TrieNode:
+    cdef bytes label
+    cdef dict children
+    cdef tuple handlers
+
+cdef class TopicTrie:
+    cdef dict _prefixes
+    cdef _TrieNode _root
+    cdef dict _cache
+    cdef Py_ssize_t _cache_size
+
+    cdef _TrieNode _compile(self)
+    cpdef tuple match(self, bytes topic)
@@ -0,0 +1,124 @@
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Optional, Self, Tuple
+
+from .parameters import AbstractSocketParameters
+from .zmq import ZMQContext, ZMQPublisher, ZMQSocketOptions, ZMQSubscriber
+
+SNAPSHOT_REQUEST: bytes
+SNAPSHOT_ITEM: bytes
+SNAPSHOT_END: bytes
+SNAPSHOT_TOPIC: bytes
+
+class TopicTrie:
+    def __init__(self, cache_size: int = 65536) -> None: ...
+    def __len__(self) -> int: ...
+    def __contains__(self, prefix: bytes) -> bool: ...
+    @property
+    def prefixes(self) -> List[bytes]: ...
+    def add(self, prefix: bytes, handler: Any) -> bool: ...
+    def remove(self, prefix: bytes, handler: Any) -> bool: ...
+    def match(self, topic: bytes) -> Tuple[Any, ...]: ...
+
+class ZMQTopicDispatcher(object):
+    def __init__(
+        self,
+        subscriber: ZMQSubscriber,
+        batch_size: int = 1024,
+        cache_size: int = 65536,
+    ) -> None: ...
+    @property
+    def prefixes(self) -> List[bytes]: ...
+    @property
+    def unmatched(self) -> int: ...
+    def register(
+        self,
+        prefix: bytes,
+        handler: Callable[[List[List[bytes]]], Awaitable[None]],
+    ) -> "ZMQTopicDispatcher": ...
+    def unregister(
+        self,
+        prefix: bytes,
+        handler: Callable[[List[List[bytes]]], Awaitable[None]],
+    ) -> "ZMQTopicDispatcher": ...
+    def sync_subscriptions(self) -> None: ...
+    async def dispatch(self, messages: List[List[bytes]]) -> None: ...
+    def stop(self) -> None: ...
+    async def run(self, timeout: Optional[float] = 1.0) -> None: ...
+
+class ZMQConflatingSubscriber(ZMQSubscriber):
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        max_topics: int = 1024,
+        batch_size: int = 1024,
+    ) -> None: ...
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None: ...
+    @property
+    def received(self) -> int: ...
+    @property
+    def conflated(self) -> int: ...
+    @property
+    def overflow(self) -> int: ...
+    @property
+    def topics(self) -> List[bytes]: ...
+    def store(self, messages: List[List[bytes]]) -> None: ...
+    def latest(self, topic: bytes) -> Optional[List[bytes]]: ...
+    def snapshot(self) -> Dict[bytes, List[bytes]]: ...
+    def updates(self) -> List[List[bytes]]: ...
+    async def wait_updates(self, timeout: Optional[float] = None) -> List[List[bytes]]: ...
+
+class ZMQSequencedPublisher(ZMQPublisher):
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+    ) -> None: ...
+    def sequence(self, topic: bytes) -> int: ...
+    def latest(self, topic: bytes) -> Optional[Tuple[int, List[bytes]]]: ...
+    def state(self, prefix: bytes = b"") -> Dict[bytes, Tuple[int, List[bytes]]]: ...
+    def publish(self, topic: bytes, frames: List[bytes]) -> Coroutine[Any, Any, None]: ...
+    async def publish_batch(self, messages: List[Tuple[bytes, List[bytes]]]) -> None: ...
+
+class ZMQSnapshotServer(object):
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        publisher: ZMQSequencedPublisher,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        batch_size: int = 1024,
+    ) -> None: ...
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None: ...
+    def stop(self) -> None: ...
+    async def run(self, timeout: Optional[float] = 1.0) -> None: ...
+
+class ZMQSequencedSubscriber(ZMQSubscriber):
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        snapshot_parameters: Optional[AbstractSocketParameters] = None,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        snapshot_timeout: float = 1.0,
+    ) -> None: ...
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None: ...
+    @property
+    def gaps(self) -> int: ...
+    @property
+    def duplicates(self) -> int: ...
+    @property
+    def recovered(self) -> int: ...
+    @property
+    def malformed(self) -> int: ...
+    def last_sequence(self, topic: bytes) -> int: ...
+    async def snapshot(
+        self, prefix: bytes = b"", timeout: Optional[float] = None
+    ) -> Dict[bytes, Tuple[int, List[bytes]]]: ...
+    async def recv_messages(
+        self, max_n: int = 1024, timeout: Optional[float] = None
+    ) -> List[List[bytes]]: ...
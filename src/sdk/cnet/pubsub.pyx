@@ -0,0 +1,645 @@
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Optional, Self, Tuple
+
+import asyncio
+
+from libc.string cimport memcmp
+
+from .parameters import AbstractSocketParameters
+from .zmq import (
+    ZMQContext,
+    ZMQDealer,
+    ZMQPublisher,
+    ZMQRouter,
+    ZMQSocketOptions,
+    ZMQSubscriber,
+)
+
+DEF DEFAULT_CACHE_SIZE = 65536
+
+# Snapshot protocol commands (first frame), see ZMQSnapshotServer
+SNAPSHOT_REQUEST = b"\x01"
+SNAPSHOT_ITEM = b"\x02"
+SNAPSHOT_END = b"\x03"
+SNAPSHOT_TOPIC = b"\x04"
+
+
+cdef class _TrieNode:
+    def __cinit__(self, bytes label, tuple handlers):
+        self.label = label
+        self.children = {}
+        self.handlers = handlers
+
+
+cdef class TopicTrie:
+    """
+    Prefix trie mapping topic prefixes to handlers, with ZMQ SUBSCRIBE
+    semantics: a topic matches every registered prefix it starts with.
+
+    The trie is compiled lazily into a radix tree (single-child chains are
+    merged into one edge compared with memcmp) and match results are cached
+    per topic, up to ``cache_size`` distinct topics.
+    """
+
+    def __init__(self, Py_ssize_t cache_size=DEFAULT_CACHE_SIZE):
+        self._prefixes = {}
+        self._root = None
+        self._cache = {}
+        self._cache_size = cache_size
+
+    def __len__(self) -> int:
+        return len(self._prefixes)
+
+    def __contains__(self, bytes prefix) -> bool:
+        return prefix in self._prefixes
+
+    @property
+    def prefixes(self) -> List[bytes]:
+        return list(self._prefixes)
+
+    def add(self, bytes prefix, handler: Any) -> bool:
+        """Returns True if ``prefix`` was not registered before."""
+        handlers = self._prefixes.get(prefix)
+        if handlers is None:
+            self._prefixes[prefix] = [handler]
+        elif handler in handlers:
+            return False
+        else:
+            handlers.append(handler)
+        self._root = None
+        self._cache.clear()
+        return handlers is None
+
+    def remove(self, bytes prefix, handler: Any) -> bool:
+        """Returns True if ``prefix`` has no handlers left."""
+        handlers = self._prefixes.get(prefix)
+        if handlers is None or handler not in handlers:
+            raise KeyError(prefix)
+        handlers.remove(handler)
+        if not handlers:
+            del self._prefixes[prefix]
+        self._root = None
+        self._cache.clear()
+        return not handlers
+
+    cdef _TrieNode _compile(self):
+        cdef _TrieNode root = _TrieNode(b"", tuple(self._prefixes.get(b"", ())))
+        cdef _TrieNode node, child, split
+        cdef bytes prefix, label
+        cdef Py_ssize_t pos, common, limit
+
+        for prefix in self._prefixes:
+            if not prefix:
+                continue
+            node = root
+            pos = 0
+            while True:
+                child = node.children.get(prefix[pos])
+                if child is None:
+                    node.children[prefix[pos]] = _TrieNode(
+                        prefix[pos:], tuple(self._prefixes[prefix])
+                    )
+                    break
+                label = child.label
+                limit = min(len(label), len(prefix) - pos)
+                common = 1
+                while common < limit and label[common] == prefix[pos + common]:
+                    common += 1
+                if common < len(label):
+                    # Split the edge: new intermediate node owns the shared part
+                    split = _TrieNode(label[:common], ())
+                    child.label = label[common:]
+                    split.children[child.label[0]] = child
+                    node.children[prefix[pos]] = split
+                    child = split
+                pos += common
+                node = child
+                if pos == len(prefix):
+                    node.handlers = tuple(self._prefixes[prefix])
+                    break
+        return root
+
+    cpdef tuple match(self, bytes topic):
+        """Handlers of every prefix of ``topic``, shortest prefix first, deduplicated."""
+        cached = self._cache.get(topic)
+        if cached is not None:
+            return <tuple>cached
+
+        if self._root is None:
+            self._root = self._compile()
+
+        cdef const unsigned char *data = topic
+        cdef Py_ssize_t n = len(topic)
+        cdef Py_ssize_t pos = 0
+        cdef Py_ssize_t size
+        cdef _TrieNode node = self._root
+        cdef _TrieNode child
+        cdef list matched = list(node.handlers)
+
+        while pos < n:
+            child = node.children.get(data[pos])
+            if child is None:
+                break
+            size = len(child.label)
+            if size > n - pos or memcmp(data + pos, <const char *>child.label, size) != 0:
+                break
+            pos += size
+            node = child
+            for handler in node.handlers:
+                if handler not in matched:
+                    matched.append(handler)
+
+        result = tuple(matched)
+        if len(self._cache) >= self._cache_size:
+            self._cache.clear()
+        self._cache[topic] = result
+        return result
+
+
+class ZMQTopicDispatcher(object):
+    """
+    Routes messages from a ZMQSubscriber to async handlers by topic prefix.
+
+    The first frame is matched against a TopicTrie and each handler is
+    awaited once per received batch with all of its messages, in arrival
+    order. The socket's SUBSCRIBE options follow the registered prefixes.
+    """
+
+    def __init__(
+        self,
+        subscriber: ZMQSubscriber,
+        batch_size: int = 1024,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        self._subscriber: ZMQSubscriber = subscriber
+        self._batch_size: int = batch_size
+        self._trie: TopicTrie = TopicTrie(cache_size)
+        # Prefixes currently set on the socket; SUB subscriptions are counted
+        self._subscribed: set = set()
+        self._running: bool = False
+        self._unmatched: int = 0
+
+    @property
+    def prefixes(self) -> List[bytes]:
+        return self._trie.prefixes
+
+    @property
+    def unmatched(self) -> int:
+        return self._unmatched
+
+    def register(
+        self,
+        prefix: bytes,
+        handler: Callable[[List[List[bytes]]], Awaitable[None]],
+    ) -> "ZMQTopicDispatcher":
+        self._trie.add(prefix, handler)
+        self.sync_subscriptions()
+        return self
+
+    def unregister(
+        self,
+        prefix: bytes,
+        handler: Callable[[List[List[bytes]]], Awaitable[None]],
+    ) -> "ZMQTopicDispatcher":
+        self._trie.remove(prefix, handler)
+        self.sync_subscriptions()
+        return self
+
+    def sync_subscriptions(self) -> None:
+        # Nothing to do until the subscriber is connected; run() syncs again
+        if self._subscriber._socket is None:
+            return
+        wanted = set(self._trie.prefixes)
+        for prefix in self._subscribed - wanted:
+            self._subscriber.unsubscribe(prefix)
+        for prefix in wanted - self._subscribed:
+            self._subscriber.subscribe(prefix)
+        self._subscribed = wanted
+
+    async def dispatch(self, messages: List[List[bytes]]) -> None:
+        cdef TopicTrie trie = self._trie
+        cdef dict batches = {}
+        cdef tuple handlers
+        for message in messages:
+            handlers = trie.match(message[0])
+            if not handlers:
+                self._unmatched += 1
+                continue
+            for handler in handlers:
+                batch = batches.get(handler)
+                if batch is None:
+                    batches[handler] = [message]
+                else:
+                    batch.append(message)
+        for handler, batch in batches.items():
+            await handler(batch)
+
+    def stop(self) -> None:
+        self._running = False
+
+    async def run(self, timeout: Optional[float] = 1.0) -> None:
+        self.sync_subscriptions()
+        self._running = True
+        while self._running:
+            messages = await self._subscriber.recv_batch(self._batch_size, timeout=timeout)
+            if messages:
+                await self.dispatch(messages)
+
+
+class ZMQConflatingSubscriber(ZMQSubscriber):
+    """
+    ZMQSubscriber that keeps only the latest message per topic.
+
+    A background task drains the socket into a fixed table of ``max_topics``
+    slots keyed by the first frame, so a slow consumer reads current values
+    instead of a backlog. Unlike the CONFLATE socket option this works with
+    multipart messages and conflates per topic. Messages for new topics
+    are dropped once the table is full. If the background task fails, its
+    exception is raised by the read methods.
+    """
+
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        max_topics: int = 1024,
+        batch_size: int = 1024,
+    ):
+        if max_topics <= 0:
+            raise ValueError("max_topics must be positive")
+        super().__init__(socket_parameters, context=context, options=options)
+        self._max_topics: int = max_topics
+        self._batch_size: int = batch_size
+        self._index: Dict[bytes, int] = {}
+        self._slots: List[Optional[List[bytes]]] = [None] * max_topics
+        # Slot ids updated since the last updates() call, each listed once
+        self._dirty_flags: bytearray = bytearray(max_topics)
+        self._dirty: List[int] = []
+        self._updated: asyncio.Event = asyncio.Event()
+        self._drainer: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+        self._received: int = 0
+        self._conflated: int = 0
+        self._overflow: int = 0
+
+    async def __aenter__(self) -> Self:
+        await super().__aenter__()
+        self._error = None
+        self._drainer = asyncio.create_task(self._drain_forever())
+        self._drainer.add_done_callback(self._drainer_done)
+        return self
+
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        if self._drainer is not None:
+            self._drainer.cancel()
+            await asyncio.gather(self._drainer, return_exceptions=True)
+            self._drainer = None
+        await super().__aexit__(*args, **kwargs)
+
+    @property
+    def received(self) -> int:
+        return self._received
+
+    @property
+    def conflated(self) -> int:
+        return self._conflated
+
+    @property
+    def overflow(self) -> int:
+        return self._overflow
+
+    @property
+    def topics(self) -> List[bytes]:
+        return list(self._index)
+
+    async def _drain_forever(self) -> None:
+        while True:
+            self.store(await self.recv_batch(self._batch_size))
+
+    def _drainer_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled():
+            self._error = task.exception()
+        # Wake wait_updates() so it can raise instead of blocking forever
+        self._updated.set()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Background receive failed") from self._error
+
+    def store(self, messages: List[List[bytes]]) -> None:
+        cdef dict index = self._index
+        cdef list slots = self._slots
+        cdef bytearray dirty_flags = self._dirty_flags
+        cdef list dirty = self._dirty
+        cdef Py_ssize_t slot
+        for message in messages:
+            topic = message[0]
+            found = index.get(topic)
+            if found is None:
+                if len(index) >= self._max_topics:
+                    self._overflow += 1
+                    continue
+                slot = len(index)
+                index[topic] = slot
+            else:
+                slot = found
+            if dirty_flags[slot]:
+                self._conflated += 1
+            else:
+                dirty_flags[slot] = 1
+                dirty.append(slot)
+            slots[slot] = message
+        self._received += len(messages)
+        if dirty:
+            self._updated.set()
+
+    def latest(self, topic: bytes) -> Optional[List[bytes]]:
+        self._raise_if_failed()
+        slot = self._index.get(topic)
+        return None if slot is None else self._slots[slot]
+
+    def snapshot(self) -> Dict[bytes, List[bytes]]:
+        self._raise_if_failed()
+        slots = self._slots
+        return {topic: slots[slot] for topic, slot in self._index.items()}
+
+    def updates(self) -> List[List[bytes]]:
+        """Latest message of each topic updated since the previous call."""
+        self._raise_if_failed()
+        cdef bytearray dirty_flags = self._dirty_flags
+        cdef list slots = self._slots
+        cdef Py_ssize_t slot
+        result = []
+        for slot in self._dirty:
+            dirty_flags[slot] = 0
+            result.append(slots[slot])
+        self._dirty = []
+        self._updated.clear()
+        return result
+
+    async def wait_updates(self, timeout: Optional[float] = None) -> List[List[bytes]]:
+        self._raise_if_failed()
+        if not self._dirty:
+            try:
+                await asyncio.wait_for(self._updated.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        return self.updates()
+
+
+class ZMQSequencedPublisher(ZMQPublisher):
+    """
+    ZMQPublisher that numbers messages per topic.
+
+    Each message is sent as ``[topic, seq, *frames]`` where ``seq`` is an
+    8-byte big-endian counter starting at 1. The latest message of every
+    topic is kept so a ZMQSnapshotServer can serve it to subscribers that
+    detect a gap.
+    """
+
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+    ):
+        super().__init__(socket_parameters, context=context, options=options)
+        # topic -> (seq, frames) of the latest message
+        self._state: Dict[bytes, Tuple[int, List[bytes]]] = {}
+
+    def sequence(self, topic: bytes) -> int:
+        entry = self._state.get(topic)
+        return 0 if entry is None else entry[0]
+
+    def latest(self, topic: bytes) -> Optional[Tuple[int, List[bytes]]]:
+        return self._state.get(topic)
+
+    def state(self, prefix: bytes = b"") -> Dict[bytes, Tuple[int, List[bytes]]]:
+        if not prefix:
+            return dict(self._state)
+        return {
+            topic: entry for topic, entry in self._state.items() if topic.startswith(prefix)
+        }
+
+    def _sequence_message(self, topic: bytes, frames: List[bytes]) -> List[bytes]:
+        entry = self._state.get(topic)
+        seq = 1 if entry is None else entry[0] + 1
+        self._state[topic] = (seq, frames)
+        return [topic, seq.to_bytes(8, "big")] + frames
+
+    def publish(self, topic: bytes, frames: List[bytes]) -> Coroutine[Any, Any, None]:
+        return self._socket.send_multipart(self._sequence_message(topic, list(frames)))
+
+    async def publish_batch(self, messages: List[Tuple[bytes, List[bytes]]]) -> None:
+        await self.send_batch(
+            [self._sequence_message(topic, list(frames)) for topic, frames in messages]
+        )
+
+
+class ZMQSnapshotServer(object):
+    """
+    ZMQRouter serving the latest state of a ZMQSequencedPublisher.
+
+    Requests are ``[SNAPSHOT_REQUEST, request_id, prefix]`` or
+    ``[SNAPSHOT_TOPIC, request_id, topic]``; the reply is one
+    ``[ITEM, request_id, topic, seq, *frames]`` per matching topic followed
+    by ``[END, request_id]``. Malformed requests are dropped.
+    """
+
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        publisher: ZMQSequencedPublisher,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        batch_size: int = 1024,
+    ):
+        self._router = ZMQRouter(socket_parameters, context=context, options=options)
+        self._publisher: ZMQSequencedPublisher = publisher
+        self._batch_size: int = batch_size
+        self._running: bool = False
+
+    async def __aenter__(self) -> Self:
+        await self._router.__aenter__()
+        return self
+
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        self.stop()
+        await self._router.__aexit__(*args, **kwargs)
+
+    def stop(self) -> None:
+        self._running = False
+
+    def _reply(self, request: List[bytes]) -> List[List[bytes]]:
+        client = request[0]
+        command = request[1]
+        request_id = request[2]
+        if command == SNAPSHOT_TOPIC:
+            entry = self._publisher.latest(request[3])
+            state = {} if entry is None else {request[3]: entry}
+        else:
+            state = self._publisher.state(request[3])
+        reply = [
+            [client, SNAPSHOT_ITEM, request_id, topic, seq.to_bytes(8, "big")] + frames
+            for topic, (seq, frames) in state.items()
+        ]
+        reply.append([client, SNAPSHOT_END, request_id])
+        return reply
+
+    async def run(self, timeout: Optional[float] = 1.0) -> None:
+        self._running = True
+        while self._running:
+            replies = []
+            for request in await self._router.recv_batch(self._batch_size, timeout=timeout):
+                # Modules are built without bounds checks: validate before indexing
+                if len(request) != 4:
+                    continue
+                if request[1] == SNAPSHOT_REQUEST or request[1] == SNAPSHOT_TOPIC:
+                    replies += self._reply(request)
+            if replies:
+                await self._router.send_batch(replies)
+
+
+class ZMQSequencedSubscriber(ZMQSubscriber):
+    """
+    ZMQSubscriber for ZMQSequencedPublisher that detects gaps.
+
+    recv_messages() strips the sequence header, drops duplicates and, when
+    ``snapshot_parameters`` points at a ZMQSnapshotServer, replaces a
+    message that follows a gap with the topic's snapshot. Call snapshot()
+    after subscribing to load the current state on join.
+    """
+
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        snapshot_parameters: Optional[AbstractSocketParameters] = None,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        snapshot_timeout: float = 1.0,
+    ):
+        super().__init__(socket_parameters, context=context, options=options)
+        self._snapshot_parameters = snapshot_parameters
+        self._snapshot_timeout: float = snapshot_timeout
+        self._snapshot_socket: Optional[ZMQDealer] = None
+        self._next_request: int = 0
+        # topic -> last delivered sequence number
+        self._last: Dict[bytes, int] = {}
+        self._gaps: int = 0
+        self._duplicates: int = 0
+        self._recovered: int = 0
+        self._malformed: int = 0
+
+    async def __aenter__(self) -> Self:
+        await super().__aenter__()
+        if self._snapshot_parameters is not None:
+            self._snapshot_socket = ZMQDealer(
+                self._snapshot_parameters, context=self._managed_context
+            )
+            await self._snapshot_socket.__aenter__()
+        return self
+
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        if self._snapshot_socket is not None:
+            await self._snapshot_socket.__aexit__(*args, **kwargs)
+            self._snapshot_socket = None
+        await super().__aexit__(*args, **kwargs)
+
+    @property
+    def gaps(self) -> int:
+        return self._gaps
+
+    @property
+    def duplicates(self) -> int:
+        return self._duplicates
+
+    @property
+    def recovered(self) -> int:
+        return self._recovered
+
+    @property
+    def malformed(self) -> int:
+        return self._malformed
+
+    def last_sequence(self, topic: bytes) -> int:
+        return self._last.get(topic, 0)
+
+    async def _request_snapshot(
+        self, command: bytes, key: bytes, timeout: Optional[float]
+    ) -> Dict[bytes, Tuple[int, List[bytes]]]:
+        if self._snapshot_socket is None:
+            raise RuntimeError("snapshot_parameters were not provided")
+        request_id = self._next_request.to_bytes(8, "big")
+        self._next_request += 1
+        await self._snapshot_socket.send_multipart([command, request_id, key])
+
+        state = {}
+        deadline = self._snapshot_timeout if timeout is None else timeout
+        async with asyncio.timeout(deadline):
+            while True:
+                reply = await self._snapshot_socket.recv_multipart()
+                # Replies to earlier requests that timed out, or malformed ones, are discarded
+                if len(reply) < 2 or reply[1] != request_id:
+                    continue
+                if reply[0] == SNAPSHOT_END:
+                    break
+                if reply[0] == SNAPSHOT_ITEM and len(reply) >= 4:
+                    state[reply[2]] = (int.from_bytes(reply[3], "big"), reply[4:])
+        return state
+
+    def _advance(self, topic: bytes, seq: int) -> None:
+        if seq > self._last.get(topic, 0):
+            self._last[topic] = seq
+
+    async def snapshot(
+        self, prefix: bytes = b"", timeout: Optional[float] = None
+    ) -> Dict[bytes, Tuple[int, List[bytes]]]:
+        state = await self._request_snapshot(SNAPSHOT_REQUEST, prefix, timeout)
+        # The caller now holds these values: updates up to them are duplicates
+        for topic, (seq, frames) in state.items():
+            self._advance(topic, seq)
+        return state
+
+    async def _recover(self, topic: bytes, seq: int, out: List[List[bytes]]) -> bool:
+        # Exact-topic request: other topics sharing the prefix keep their own sequence
+        try:
+            state = await self._request_snapshot(SNAPSHOT_TOPIC, topic, None)
+        except TimeoutError:
+            return False
+        entry = state.get(topic)
+        if entry is None or entry[0] < seq:
+            return False
+        self._advance(topic, entry[0])
+        out.append([topic] + entry[1])
+        self._recovered += 1
+        return True
+
+    async def recv_messages(
+        self, max_n: int = 1024, timeout: Optional[float] = None
+    ) -> List[List[bytes]]:
+        cdef dict last_seen = self._last
+        cdef unsigned long long seq, last
+        out = []
+        for message in await self.recv_batch(max_n, timeout):
+            # Modules are built without bounds checks: drop messages without a
+            # header, and sequence frames that do not fit the 64-bit counter
+            if len(message) < 2 or len(message[1]) != 8:
+                self._malformed += 1
+                continue
+            topic = message[0]
+            seq = int.from_bytes(message[1], "big")
+            previous = last_seen.get(topic)
+            if previous is not None:
+                last = previous
+                if seq <= last:
+                    self._duplicates += 1
+                    continue
+                if seq != last + 1:
+                    self._gaps += 1
+                    if self._snapshot_socket is not None and await self._recover(
+                        topic, seq, out
+                    ):
+                        continue
+            last_seen[topic] = seq
+            out.append([topic] + message[2:])
+        return out
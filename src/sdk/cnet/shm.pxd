@@ -0,0 +1,36 @@
+from libc.stdint cimport uint32_t, uint64_t
+
+cdef class ShmRing:
+    cdef:
+        str _name
+        bint _owner
+        object _mmap
+        unsigned char[::1] _buffer
+        object _view
+        tuple _data_fds
+        tuple _space_fds
+        unsigned char *_base
+        unsigned char *_data
+        uint64_t _capacity
+        uint64_t _mask
+        uint64_t *_shared_head
+        uint64_t *_shared_tail
+        uint32_t *_reader_waiting
+        uint32_t *_writer_waiting
+        uint32_t *_closed
+        uint32_t *_polling
+        # writer side
+        uint64_t _head
+        uint64_t _seen_tail
+        # reader side
+        uint64_t _tail
+        uint64_t _published
+
+    cdef void _open(self, str name, int flags, Py_ssize_t size) except *
+    cdef void _map_header(self)
+    cdef void _wake(self, uint32_t *waiting, tuple fds) except *
+    cdef void _check_open(self) except *
+    cpdef bint try_send(self, list message) except -1
+    cpdef list try_recv(self, bint copy=*)
+    cpdef void release(self) except *
+    cpdef bint prepare_wait(self, bint readable)
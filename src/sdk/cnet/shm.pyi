@@ -0,0 +1,51 @@
+from typing import Any, List, Optional, Self
+
+from .zmq import SendStatus
+
+class ShmRing:
+    @staticmethod
+    def create(name: str, capacity: int = 1 << 20) -> "ShmRing": ...
+    @staticmethod
+    def attach(name: str) -> "ShmRing": ...
+    @property
+    def name(self) -> str: ...
+    @property
+    def capacity(self) -> int: ...
+    @property
+    def used(self) -> int: ...
+    @property
+    def closed(self) -> bool: ...
+    @property
+    def polling(self) -> bool: ...
+    @property
+    def data_fd(self) -> Optional[int]: ...
+    @property
+    def space_fd(self) -> Optional[int]: ...
+    def try_send(self, message: List[Any]) -> bool: ...
+    def try_recv(self, copy: bool = True) -> Optional[List[Any]]: ...
+    def release(self) -> None: ...
+    def prepare_wait(self, readable: bool) -> bool: ...
+    def close_writer(self) -> None: ...
+    def close(self) -> None: ...
+    def unlink(self) -> None: ...
+
+class _ShmEndpoint(object):
+    def __init__(self, ring: ShmRing, poll_interval: float = 0.0001, spin: int = 0) -> None: ...
+    @property
+    def ring(self) -> ShmRing: ...
+
+class ShmPush(_ShmEndpoint):
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None: ...
+    def send_nowait(self, message: List[bytes]) -> SendStatus: ...
+    async def send_multipart(self, message: List[bytes]) -> None: ...
+    async def send_batch(self, messages: List[List[bytes]]) -> None: ...
+
+class ShmPull(_ShmEndpoint):
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None: ...
+    def release(self) -> None: ...
+    async def recv_multipart(self, copy: bool = True) -> List[Any]: ...
+    async def recv_batch(
+        self, max_n: int = 1024, timeout: Optional[float] = None
+    ) -> List[List[bytes]]: ...
@@ -0,0 +1,469 @@
+from typing import Any, List, Optional, Self
+
+import asyncio
+import mmap
+import os
+import sys
+
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_FromStringAndSize, PyBytes_GET_SIZE
+from libc.errno cimport errno
+from libc.stdint cimport uint32_t, uint64_t
+from libc.string cimport memcpy
+from posix.fcntl cimport O_CREAT, O_EXCL, O_RDWR
+from posix.mman cimport shm_open, shm_unlink
+
+from .zmq import SendStatus
+
+cdef extern from *:
+    """
+    static inline uint64_t sdk_load_acquire(const uint64_t *p) {
+        return __atomic_load_n(p, __ATOMIC_ACQUIRE);
+    }
+    static inline void sdk_store_release(uint64_t *p, uint64_t v) {
+        __atomic_store_n(p, v, __ATOMIC_RELEASE);
+    }
+    static inline uint32_t sdk_load_flag(const uint32_t *p) {
+        return __atomic_load_n(p, __ATOMIC_SEQ_CST);
+    }
+    static inline void sdk_store_flag(uint32_t *p, uint32_t v) {
+        __atomic_store_n(p, v, __ATOMIC_SEQ_CST);
+    }
+    static inline uint32_t sdk_exchange_flag(uint32_t *p, uint32_t v) {
+        return __atomic_exchange_n(p, v, __ATOMIC_SEQ_CST);
+    }
+    static inline void sdk_fence(void) {
+        __atomic_thread_fence(__ATOMIC_SEQ_CST);
+    }
+    """
+    uint64_t sdk_load_acquire(const uint64_t *p) nogil
+    void sdk_store_release(uint64_t *p, uint64_t v) nogil
+    uint32_t sdk_load_flag(const uint32_t *p) nogil
+    void sdk_store_flag(uint32_t *p, uint32_t v) nogil
+    uint32_t sdk_exchange_flag(uint32_t *p, uint32_t v) nogil
+    void sdk_fence() nogil
+
+# Shared header, one cache line per field written by a different side
+DEF MAGIC = 0x31474e49524b4453
+DEF OFF_MAGIC = 0
+DEF OFF_CAPACITY = 8
+DEF OFF_HEAD = 64
+DEF OFF_TAIL = 128
+DEF OFF_READER_WAITING = 192
+DEF OFF_WRITER_WAITING = 256
+DEF OFF_CLOSED = 320
+DEF OFF_POLLING = 384
+DEF HEADER_SIZE = 448
+
+# Record: u32 size, u32 frame count, u32 frame lengths, then 8-byte aligned
+# frames. A size of 0 means the rest of the buffer is unused: wrap around.
+DEF WRAP = 0
+DEF MIN_CAPACITY = 4096
+DEF MAX_CAPACITY = 1 << 31
+
+cdef inline uint64_t _align8(uint64_t n) noexcept nogil:
+    return (n + 7) & ~(<uint64_t>7)
+
+# 8-byte eventfd/pipe payload that wakes the other side
+_WAKE = (1).to_bytes(8, sys.byteorder)
+
+
+cdef class ShmRing:
+    """
+    Single-producer, single-consumer ring buffer of multipart messages in
+    POSIX shared memory.
+
+    ``create()`` makes the segment and two wakeup fds (eventfds on Linux),
+    which processes forked afterwards inherit; the other side then sleeps
+    in the event loop and is only woken when it is actually waiting, so a
+    busy consumer costs no syscalls. Processes that ``attach()`` by name
+    have no wakeup fds, and both sides fall back to polling.
+    """
+
+    def __cinit__(self):
+        self._data_fds = None
+        self._space_fds = None
+        self._owner = False
+
+    def __init__(self):
+        raise TypeError("Use ShmRing.create() or ShmRing.attach()")
+
+    @staticmethod
+    def create(name: str, capacity: int = 1 << 20) -> ShmRing:
+        if capacity < MIN_CAPACITY or capacity > MAX_CAPACITY or capacity & (capacity - 1):
+            raise ValueError(
+                f"capacity must be a power of two between {MIN_CAPACITY} and {MAX_CAPACITY}"
+            )
+        cdef ShmRing ring = ShmRing.__new__(ShmRing)
+        ring._open(name, O_CREAT | O_EXCL | O_RDWR, HEADER_SIZE + capacity)
+        ring._owner = True
+        (<uint64_t *>(ring._base + OFF_CAPACITY))[0] = capacity
+        sdk_store_release(<uint64_t *>(ring._base + OFF_MAGIC), MAGIC)
+        ring._map_header()
+        ring._data_fds = _wakeup_fds()
+        ring._space_fds = _wakeup_fds()
+        return ring
+
+    @staticmethod
+    def attach(name: str) -> ShmRing:
+        cdef ShmRing ring = ShmRing.__new__(ShmRing)
+        ring._open(name, O_RDWR, 0)
+        if sdk_load_acquire(<uint64_t *>(ring._base + OFF_MAGIC)) != MAGIC:
+            ring.close()
+            raise ValueError(f"{name} is not a ring buffer")
+        ring._map_header()
+        # Nobody can wake this process: tell the peer to poll as well
+        sdk_store_flag(ring._polling, 1)
+        return ring
+
+    cdef void _open(self, str name, int flags, Py_ssize_t size) except *:
+        if not name.startswith("/"):
+            name = "/" + name
+        cdef bytes encoded = os.fsencode(name)
+        cdef int fd = shm_open(encoded, flags, 0o600)
+        if fd < 0:
+            raise OSError(errno, os.strerror(errno), name)
+        try:
+            if flags & O_CREAT:
+                os.ftruncate(fd, size)
+            else:
+                size = os.fstat(fd).st_size
+                if size < HEADER_SIZE + MIN_CAPACITY:
+                    raise ValueError(f"{name} is not a ring buffer")
+            self._mmap = mmap.mmap(fd, size)
+        except BaseException:
+            if flags & O_CREAT:
+                shm_unlink(encoded)
+            raise
+        finally:
+            os.close(fd)
+        self._name = name
+        self._buffer = self._mmap
+        self._base = &self._buffer[0]
+
+    cdef void _map_header(self):
+        self._capacity = (<uint64_t *>(self._base + OFF_CAPACITY))[0]
+        self._mask = self._capacity - 1
+        self._data = self._base + HEADER_SIZE
+        self._view = memoryview(self._mmap)[HEADER_SIZE:]
+        self._shared_head = <uint64_t *>(self._base + OFF_HEAD)
+        self._shared_tail = <uint64_t *>(self._base + OFF_TAIL)
+        self._reader_waiting = <uint32_t *>(self._base + OFF_READER_WAITING)
+        self._writer_waiting = <uint32_t *>(self._base + OFF_WRITER_WAITING)
+        self._closed = <uint32_t *>(self._base + OFF_CLOSED)
+        self._polling = <uint32_t *>(self._base + OFF_POLLING)
+        self._head = sdk_load_acquire(self._shared_head)
+        self._tail = self._published = sdk_load_acquire(self._shared_tail)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def used(self) -> int:
+        return sdk_load_acquire(self._shared_head) - sdk_load_acquire(self._shared_tail)
+
+    @property
+    def closed(self) -> bool:
+        return sdk_load_flag(self._closed) != 0
+
+    @property
+    def polling(self) -> bool:
+        return self._data_fds is None or sdk_load_flag(self._polling) != 0
+
+    @property
+    def data_fd(self) -> Optional[int]:
+        return None if self._data_fds is None else self._data_fds[0]
+
+    @property
+    def space_fd(self) -> Optional[int]:
+        return None if self._space_fds is None else self._space_fds[0]
+
+    cdef void _wake(self, uint32_t *waiting, tuple fds) except *:
+        # Pairs with the fence in prepare_wait(): either the waiter sees our
+        # update or we see its flag
+        sdk_fence()
+        if fds is not None and sdk_exchange_flag(waiting, 0):
+            try:
+                os.write(fds[1], _WAKE)
+            except BlockingIOError:
+                # A full pipe already holds a pending wakeup
+                pass
+
+    cdef void _check_open(self) except *:
+        if self._base == NULL:
+            raise ValueError("Ring buffer is closed")
+
+    cpdef bint try_send(self, list message) except -1:
+        self._check_open()
+        cdef Py_ssize_t n = len(message)
+        cdef Py_ssize_t i
+        cdef uint64_t length, size = _align8(8 + 4 * n)
+        cdef list frames = []
+        for i in range(n):
+            frame = message[i]
+            if type(frame) is not bytes:
+                frame = memoryview(frame).cast("B")
+            frames.append(frame)
+            size += _align8(len(frame))
+        if size > self._capacity // 2:
+            raise ValueError("Message does not fit in the ring buffer")
+
+        cdef uint64_t head = self._head
+        cdef uint64_t tail = sdk_load_acquire(self._shared_tail)
+        cdef uint64_t pos = head & self._mask
+        cdef uint64_t contiguous = self._capacity - pos
+        cdef uint64_t skip = contiguous if contiguous < size else 0
+        if self._capacity - (head - tail) < skip + size:
+            self._seen_tail = tail
+            return False
+        if skip:
+            (<uint32_t *>(self._data + pos))[0] = WRAP
+            head += skip
+            pos = 0
+
+        cdef unsigned char *record = self._data + pos
+        cdef unsigned char *dst = record + _align8(8 + 4 * n)
+        cdef const unsigned char[::1] view
+        (<uint32_t *>record)[0] = <uint32_t>size
+        (<uint32_t *>record)[1] = <uint32_t>n
+        for i in range(n):
+            frame = frames[i]
+            if type(frame) is bytes:
+                length = PyBytes_GET_SIZE(frame)
+                memcpy(dst, PyBytes_AS_STRING(frame), length)
+            else:
+                view = frame
+                length = view.shape[0]
+                if length:
+                    memcpy(dst, &view[0], length)
+            (<uint32_t *>record)[2 + i] = <uint32_t>length
+            dst += _align8(length)
+
+        self._head = head + size
+        sdk_store_release(self._shared_head, self._head)
+        self._wake(self._reader_waiting, self._data_fds)
+        return True
+
+    cpdef list try_recv(self, bint copy=True):
+        self._check_open()
+        # Zero-copy frames of the previous message are given back here
+        self.release()
+        cdef uint64_t tail = self._tail
+        cdef uint64_t head = sdk_load_acquire(self._shared_head)
+        if tail == head:
+            return None
+        cdef uint64_t pos = tail & self._mask
+        cdef uint32_t size = (<uint32_t *>(self._data + pos))[0]
+        if size == WRAP:
+            tail += self._capacity - pos
+            pos = 0
+            size = (<uint32_t *>(self._data + pos))[0]
+
+        cdef unsigned char *record = self._data + pos
+        cdef uint32_t n = (<uint32_t *>record)[1]
+        cdef uint64_t offset = pos + _align8(8 + 4 * n)
+        cdef uint32_t i, length
+        cdef list message = []
+        for i in range(n):
+            length = (<uint32_t *>record)[2 + i]
+            if copy:
+                message.append(
+                    PyBytes_FromStringAndSize(<char *>(self._data + offset), length)
+                )
+            else:
+                message.append(self._view[offset:offset + length])
+            offset += _align8(length)
+
+        self._tail = tail + size
+        if copy:
+            self.release()
+        return message
+
+    cpdef void release(self) except *:
+        self._check_open()
+        if self._tail != self._published:
+            self._published = self._tail
+            sdk_store_release(self._shared_tail, self._tail)
+            self._wake(self._writer_waiting, self._space_fds)
+
+    cpdef bint prepare_wait(self, bint readable):
+        """Register as waiting; False if the condition changed meanwhile."""
+        if readable:
+            sdk_store_flag(self._reader_waiting, 1)
+            sdk_fence()
+            if sdk_load_acquire(self._shared_head) != self._tail or self.closed:
+                sdk_store_flag(self._reader_waiting, 0)
+                return False
+        else:
+            sdk_store_flag(self._writer_waiting, 1)
+            sdk_fence()
+            if sdk_load_acquire(self._shared_tail) != self._seen_tail:
+                sdk_store_flag(self._writer_waiting, 0)
+                return False
+        return True
+
+    def close_writer(self) -> None:
+        """Mark the end of the stream; the reader gets EOFError once drained."""
+        sdk_store_flag(self._closed, 1)
+        self._wake(self._reader_waiting, self._data_fds)
+
+    def close(self) -> None:
+        """Unmap the segment; the creator also unlinks it and its wakeup fds."""
+        if self._mmap is None:
+            return
+        self._view = None
+        self._buffer = None
+        self._base = self._data = NULL
+        # Raises BufferError while zero-copy frames are still referenced
+        self._mmap.close()
+        self._mmap = None
+        if self._owner:
+            self.unlink()
+            for fds in (self._data_fds, self._space_fds):
+                for fd in set(fds):
+                    os.close(fd)
+        self._data_fds = self._space_fds = None
+
+    def unlink(self) -> None:
+        shm_unlink(os.fsencode(self._name))
+
+
+def _wakeup_fds() -> tuple:
+    # (read fd, write fd); one eventfd serves as both where available
+    if hasattr(os, "eventfd"):
+        fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+        return fd, fd
+    r, w = os.pipe()
+    os.set_blocking(r, False)
+    os.set_blocking(w, False)
+    return r, w
+
+
+async def _wait_fd(fd: int, timeout: Optional[float]) -> None:
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    loop.add_reader(fd, future.set_result, None)
+    try:
+        await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        loop.remove_reader(fd)
+    try:
+        os.read(fd, 4096)
+    except BlockingIOError:
+        pass
+
+
+class _ShmEndpoint(object):
+    def __init__(self, ring: ShmRing, poll_interval: float = 0.0001, spin: int = 0):
+        self._ring: ShmRing = ring
+        self._poll_interval: float = poll_interval
+        # Retries before sleeping; trades CPU for wakeup latency
+        self._spin: int = spin
+
+    @property
+    def ring(self) -> ShmRing:
+        return self._ring
+
+    async def _wait(self, readable: bool, timeout: Optional[float] = None) -> None:
+        ring = self._ring
+        if ring.polling:
+            await asyncio.sleep(
+                self._poll_interval if timeout is None else min(self._poll_interval, timeout)
+            )
+        elif ring.prepare_wait(readable):
+            await _wait_fd(ring.data_fd if readable else ring.space_fd, timeout)
+
+
+class ShmPush(_ShmEndpoint):
+    """Writing end of a ShmRing, shaped like ZMQPush."""
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        self._ring.close_writer()
+
+    def send_nowait(self, message: List[bytes]) -> SendStatus:
+        return SendStatus.OK if self._ring.try_send(message) else SendStatus.HWM
+
+    async def send_multipart(self, message: List[bytes]) -> None:
+        ring = self._ring
+        spin = self._spin
+        while not ring.try_send(message):
+            if spin > 0:
+                spin -= 1
+                continue
+            await self._wait(False)
+
+    async def send_batch(self, messages: List[List[bytes]]) -> None:
+        for message in messages:
+            await self.send_multipart(message)
+
+
+class ShmPull(_ShmEndpoint):
+    """
+    Reading end of a ShmRing, shaped like ZMQPull.
+
+    With ``copy=False`` frames are memoryviews into the ring, valid until
+    the next receive or ``release()``.
+    """
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        self._ring.release()
+
+    def release(self) -> None:
+        self._ring.release()
+
+    async def recv_multipart(self, copy: bool = True) -> List[Any]:
+        ring = self._ring
+        spin = self._spin
+        while True:
+            message = ring.try_recv(copy)
+            if message is not None:
+                return message
+            if ring.closed:
+                # The writer publishes everything before closing: look once more
+                message = ring.try_recv(copy)
+                if message is None:
+                    raise EOFError("Ring buffer closed by the writer")
+                return message
+            if spin > 0:
+                spin -= 1
+                continue
+            await self._wait(True)
+
+    async def recv_batch(
+        self, max_n: int = 1024, timeout: Optional[float] = None
+    ) -> List[List[bytes]]:
+        # Await only the first message, then take whatever else is there
+        ring = self._ring
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        message = ring.try_recv(True)
+        while message is None:
+            if ring.closed:
+                message = ring.try_recv(True)
+                if message is None:
+                    raise EOFError("Ring buffer closed by the writer")
+                break
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return []
+            await self._wait(True, remaining)
+            message = ring.try_recv(True)
+        messages = [message]
+        while len(messages) < max_n:
+            message = ring.try_recv(True)
+            if message is None:
+                break
+            messages.append(message)
+        return messages
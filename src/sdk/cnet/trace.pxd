@@ -0,0 +1,25 @@
+from libc.stdint cimport int64_t, uint64_t
+
+cdef class LatencyHistogram:
+    cdef:
+        uint64_t _counts[256]
+        uint64_t _count
+        int64_t _sum
+        int64_t _min
+        int64_t _max
+
+    cpdef void record(self, int64_t value)
+    cpdef void reset(self)
+    cpdef int64_t percentile(self, double q)
+
+cdef class MessageTracer:
+    cdef:
+        readonly bint realtime
+        readonly LatencyHistogram histogram
+        readonly uint64_t sent
+        readonly uint64_t received
+        readonly uint64_t untraced
+        readonly uint64_t skewed
+
+    cpdef list stamp(self, list message)
+    cpdef list observe(self, list message)
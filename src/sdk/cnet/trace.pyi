@@ -0,0 +1,31 @@
+from typing import Any, Dict, List
+
+TRACE_MAGIC: bytes
+
+class LatencyHistogram:
+    def __init__(self) -> None: ...
+    @property
+    def count(self) -> int: ...
+    @property
+    def min(self) -> int: ...
+    @property
+    def max(self) -> int: ...
+    @property
+    def mean(self) -> float: ...
+    def record(self, value: int) -> None: ...
+    def reset(self) -> None: ...
+    def percentile(self, q: float) -> int: ...
+    def to_dict(self) -> Dict[str, float]: ...
+
+class MessageTracer:
+    realtime: bool
+    histogram: LatencyHistogram
+    sent: int
+    received: int
+    untraced: int
+    skewed: int
+    def __init__(self, realtime: bool = False) -> None: ...
+    def stamp(self, message: List[Any]) -> List[Any]: ...
+    def observe(self, message: List[Any]) -> List[Any]: ...
+    def reset(self) -> None: ...
+    def stats(self) -> Dict[str, Any]: ...
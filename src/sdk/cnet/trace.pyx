@@ -0,0 +1,181 @@
+from typing import Dict
+
+from libc.stdint cimport int64_t, uint64_t
+from libc.string cimport memset
+
+from ..ctime import clock_monotonic, clock_realtime
+
+DEF HISTOGRAM_BUCKETS = 256
+DEF SUB_BUCKET_BITS = 2
+DEF SUB_BUCKETS = 4
+DEF TRACE_FRAME_SIZE = 17
+
+# Trailing frame of a traced message: magic byte, realtime ns, monotonic ns (big-endian)
+TRACE_MAGIC = b"\xa7"
+
+cdef extern from *:
+    """
+    static inline int sdk_bit_length(unsigned long long x) {
+        return x ? 64 - __builtin_clzll(x) : 0;
+    }
+    """
+    int sdk_bit_length(unsigned long long x) nogil
+
+
+cdef inline Py_ssize_t _bucket(uint64_t value) noexcept nogil:
+    # Log-linear buckets: 4 sub-buckets per power of two, so the relative error is < 25%
+    if value < SUB_BUCKETS:
+        return <Py_ssize_t>value
+    cdef int e = sdk_bit_length(value)
+    cdef Py_ssize_t sub = (value >> (e - SUB_BUCKET_BITS - 1)) & (SUB_BUCKETS - 1)
+    return (e - SUB_BUCKET_BITS) * SUB_BUCKETS + sub
+
+
+cdef object _bucket_upper(Py_ssize_t index):
+    if index < SUB_BUCKETS:
+        return index
+    e = index // SUB_BUCKETS + SUB_BUCKET_BITS
+    sub = index % SUB_BUCKETS
+    return ((SUB_BUCKETS + sub + 1) << (e - SUB_BUCKET_BITS - 1)) - 1
+
+
+cdef class LatencyHistogram:
+    """
+    Fixed-size log-linear histogram of nanosecond latencies.
+
+    Recording is a bucket increment with no allocation; percentiles are
+    reported as the upper bound of the bucket they fall in.
+    """
+
+    def __cinit__(self):
+        self.reset()
+
+    cpdef void reset(self):
+        memset(self._counts, 0, sizeof(self._counts))
+        self._count = 0
+        self._sum = 0
+        self._min = 0
+        self._max = 0
+
+    cpdef void record(self, int64_t value):
+        if value < 0:
+            value = 0
+        if self._count == 0 or value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+        self._counts[_bucket(<uint64_t>value)] += 1
+        self._count += 1
+        self._sum += value
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def min(self) -> int:
+        return self._min
+
+    @property
+    def max(self) -> int:
+        return self._max
+
+    @property
+    def mean(self) -> float:
+        return <double>self._sum / self._count if self._count else 0.0
+
+    cpdef int64_t percentile(self, double q):
+        if not 0.0 <= q <= 100.0:
+            raise ValueError("q must be between 0 and 100")
+        if self._count == 0:
+            return 0
+        cdef uint64_t rank = <uint64_t>(q / 100.0 * self._count)
+        if rank >= self._count:
+            rank = self._count - 1
+        cdef uint64_t seen = 0
+        cdef Py_ssize_t i
+        for i in range(HISTOGRAM_BUCKETS):
+            seen += self._counts[i]
+            if seen > rank:
+                return min(_bucket_upper(i), self._max)
+        return self._max
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self._count,
+            "min": self._min,
+            "mean": self.mean,
+            "p50": self.percentile(50.0),
+            "p90": self.percentile(90.0),
+            "p99": self.percentile(99.0),
+            "p999": self.percentile(99.9),
+            "max": self._max,
+        }
+
+
+cdef class MessageTracer:
+    """
+    Stamps outgoing messages with a trailing 17-byte trace frame and
+    measures their delay on receipt.
+
+    Both ends of a hop must trace. ``realtime=False`` (the default) uses
+    CLOCK_MONOTONIC, which is only comparable between processes on the
+    same host; use ``realtime=True`` across hosts with synchronized clocks.
+    """
+
+    def __init__(self, bint realtime = False):
+        self.realtime = realtime
+        self.histogram = LatencyHistogram()
+        self.sent = 0
+        self.received = 0
+        self.untraced = 0
+        self.skewed = 0
+
+    cpdef list stamp(self, list message):
+        self.sent += 1
+        return message + [
+            TRACE_MAGIC
+            + clock_realtime().to_bytes(8, "big")
+            + clock_monotonic().to_bytes(8, "big")
+        ]
+
+    cpdef list observe(self, list message):
+        cdef Py_ssize_t n = len(message)
+        if n < 2:
+            self.untraced += 1
+            return message
+        trailer = message[n - 1]
+        if len(trailer) != TRACE_FRAME_SIZE:
+            self.untraced += 1
+            return message
+        # Trailers may arrive as bytes, memoryviews or zmq.Frames
+        trailer = bytes(trailer)
+        if trailer[0] != 0xa7:
+            self.untraced += 1
+            return message
+        cdef int64_t now, sent_at
+        if self.realtime:
+            now = clock_realtime()
+            sent_at = int.from_bytes(trailer[1:9], "big")
+        else:
+            now = clock_monotonic()
+            sent_at = int.from_bytes(trailer[9:17], "big")
+        if now < sent_at:
+            self.skewed += 1
+        self.histogram.record(now - sent_at)
+        self.received += 1
+        del message[n - 1]
+        return message
+
+    def reset(self) -> None:
+        self.histogram.reset()
+        self.sent = self.received = self.untraced = self.skewed = 0
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "sent": self.sent,
+            "received": self.received,
+            "untraced": self.untraced,
+            "skewed": self.skewed,
+            "latency_ns": self.histogram.to_dict(),
+        }
@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Any, Coroutine, List, Optional, Self
+from enum import IntEnum
+from typing import Any, Coroutine, Dict, List, Literal, Optional, Self, Tuple, Union
 
+import pyarrow as pa
 import zmq
 import zmq.asyncio
 
 from ..cuuid import randstr_16
+from .codec import Codec
+from .trace import MessageTracer
 
 class AbstractSocketParameters(ABC):
     __slots__ = ["_protocol", "_host", "_port", "_dir", "_filename"]
@@ -32,50 +36,178 @@ class TCPSocketParameters(AbstractSocketParameters):
     def url(self):
         return f"{self._protocol}://{self._host}:{self._port}"
 
+class SendStatus(IntEnum):
+    OK = 0
+    HWM = 1
+    DROPPED = 2
+
+class ZMQSocketOptions(object):
+    sndhwm: Optional[int]
+    rcvhwm: Optional[int]
+    sndbuf: Optional[int]
+    rcvbuf: Optional[int]
+    linger: Optional[int]
+    immediate: Optional[bool]
+    conflate: Optional[bool]
+    reconnect_ivl: Optional[int]
+    reconnect_ivl_max: Optional[int]
+    tcp_keepalive: Optional[int]
+    tcp_keepalive_idle: Optional[int]
+    tcp_keepalive_intvl: Optional[int]
+    tcp_keepalive_cnt: Optional[int]
+    def __init__(
+        self,
+        *,
+        sndhwm: Optional[int] = None,
+        rcvhwm: Optional[int] = None,
+        sndbuf: Optional[int] = None,
+        rcvbuf: Optional[int] = None,
+        linger: Optional[int] = None,
+        immediate: Optional[bool] = None,
+        conflate: Optional[bool] = None,
+        reconnect_ivl: Optional[int] = None,
+        reconnect_ivl_max: Optional[int] = None,
+        tcp_keepalive: Optional[int] = None,
+        tcp_keepalive_idle: Optional[int] = None,
+        tcp_keepalive_intvl: Optional[int] = None,
+        tcp_keepalive_cnt: Optional[int] = None,
+    ) -> None: ...
+    def to_dict(self) -> Dict[str, int]: ...
+    def apply(self, socket: zmq.Socket) -> None: ...
+
+class ZMQContext(object):
+    def __init__(self, io_threads: int = 1, linger: Optional[int] = None) -> None: ...
+    @classmethod
+    def instance(cls) -> "ZMQContext": ...
+    @property
+    def refs(self) -> int: ...
+    @property
+    def linger(self) -> Optional[int]: ...
+    def acquire(self) -> zmq.asyncio.Context: ...
+    def release(self) -> None: ...
+
 class ZMQSocket(object):
     def __init__(
         self,
         socket_type: zmq.SocketType,
         socket_parameters: AbstractSocketParameters,
         id=None,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        codec: Optional[Codec] = None,
     ):
         self._id: bytes = id or randstr_16()
         self._socket_type: zmq.SocketType = socket_type
         self._socket_parameters: AbstractSocketParameters = socket_parameters
 
+        self._managed_context: ZMQContext = context or ZMQContext.instance()
         self._context: zmq.asyncio.Context = None
         self._socket: zmq.asyncio.Socket = None
+        self._sync_socket: zmq.Socket = None
+        self._copy_threshold: int = zmq.COPY_THRESHOLD
+        self._options: Optional[ZMQSocketOptions] = options
+        self._hwm_hits: int = 0
+        self._dropped: int = 0
+        self._ipc_inode: Optional[Tuple[int, int]] = None
+        self._tracer: Optional[MessageTracer] = None
+        self._codec: Optional[Codec] = codec
 
     def initialize_socket(self):
-        self._context: zmq.asyncio.Context = zmq.asyncio.Context.instance()
+        self._context: zmq.asyncio.Context = self._managed_context.acquire()
         self._socket = self._context.socket(self._socket_type)
         self._socket.identity = self._id
+        self._apply_options()
+        self._sync_socket = zmq.Socket.shadow(self._socket.underlying)
+
+    def _apply_options(self) -> None: ...
+    def _bind(self) -> None: ...
+    @property
+    def options(self) -> Optional[ZMQSocketOptions]: ...
+    @property
+    def hwm_hits(self) -> int: ...
+    @property
+    def dropped(self) -> int: ...
+    @property
+    def copy_threshold(self) -> int: ...
+    @copy_threshold.setter
+    def copy_threshold(self, value: int) -> None: ...
+    @property
+    def codec(self) -> Optional[Codec]: ...
+    @codec.setter
+    def codec(self, value: Optional[Codec]) -> None: ...
+    @property
+    def tracer(self) -> Optional[MessageTracer]: ...
+    def enable_tracing(self, realtime: bool = False) -> MessageTracer: ...
+    def disable_tracing(self) -> None: ...
 
     async def __aenter__(self) -> Self:
         raise NotImplementedError
 
     async def __aexit__(self, *args: any, **kwargs: any) -> None:
         self._socket.close()
-        self._context.term()
+        self._socket = None
+        self._sync_socket = None
+        self._context = None
+        self._managed_context.release()
+
+    def send_multipart(
+        self, message: List[bytes], copy: bool = True, track: bool = False
+    ) -> Coroutine[Any, Any, Optional[zmq.MessageTracker]]: ...
+    def recv_multipart(
+        self, copy: bool = True
+    ) -> Coroutine[Any, Any, List[Union[bytes, memoryview]]]: ...
+    def recv_frames(self) -> Coroutine[Any, Any, List[zmq.Frame]]: ...
 
-    def send_multipart(self, message: List[bytes]) -> Coroutine[Any, Any, None]:
-        return self._socket.send_multipart(message)
+    def send_nowait(self, message: List[bytes]) -> SendStatus: ...
+    async def send_with_backpressure(
+        self, message: List[bytes], timeout: Optional[float] = None
+    ) -> SendStatus: ...
+    async def recv_batch(
+        self, max_n: int = 1024, timeout: Optional[float] = None
+    ) -> List[List[bytes]]: ...
+    async def send_batch(self, messages: List[List[bytes]]) -> None: ...
 
-    def recv_multipart(self) -> Coroutine[Any, Any, bytes]:
-        return self._socket.recv_multipart()
+    def send_arrow(
+        self,
+        data: Union[pa.RecordBatch, pa.Table],
+        prefix: Optional[List[bytes]] = None,
+        compression: Optional[Literal["lz4", "zstd"]] = None,
+    ) -> Coroutine[Any, Any, None]: ...
+    async def recv_arrow(self) -> Tuple[List[bytes], pa.Table]: ...
+
+    def send_object(
+        self, obj: Any, prefix: Optional[List[bytes]] = None
+    ) -> Coroutine[Any, Any, Optional[zmq.MessageTracker]]: ...
+    async def recv_object(self) -> Tuple[List[bytes], Any]: ...
 
 class ZMQPublisher(ZMQSocket):
-    def __init__(self, socket_parameters: AbstractSocketParameters):
-        super().__init__(zmq.PUB, socket_parameters)
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        codec: Optional[Codec] = None,
+    ):
+        super().__init__(
+            zmq.PUB, socket_parameters, context=context, options=options, codec=codec
+        )
 
     async def __aenter__(self) -> Self:
         self.initialize_socket()
-        self._socket.bind(self._socket_parameters.url)
+        self._bind()
         return self
 
 class ZMQSubscriber(ZMQSocket):
-    def __init__(self, socket_parameters: AbstractSocketParameters):
-        super().__init__(zmq.SUB, socket_parameters)
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        codec: Optional[Codec] = None,
+    ):
+        super().__init__(
+            zmq.SUB, socket_parameters, context=context, options=options, codec=codec
+        )
 
     async def __aenter__(self) -> Self:
         self.initialize_socket()
@@ -86,18 +218,38 @@ class ZMQSubscriber(ZMQSocket):
         self._socket.setsockopt(zmq.SUBSCRIBE, topic)
         return self
 
+    def unsubscribe(self, topic: bytes = b""):
+        self._socket.setsockopt(zmq.UNSUBSCRIBE, topic)
+        return self
+
 class ZMQRouter(ZMQSocket):
-    def __init__(self, socket_parameters: AbstractSocketParameters):
-        super().__init__(zmq.ROUTER, socket_parameters)
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        codec: Optional[Codec] = None,
+    ):
+        super().__init__(
+            zmq.ROUTER, socket_parameters, context=context, options=options, codec=codec
+        )
 
     async def __aenter__(self) -> Self:
         self.initialize_socket()
-        self._socket.bind(self._socket_parameters.url)
+        self._bind()
         return self
 
 class ZMQDealer(ZMQSocket):
-    def __init__(self, socket_parameters: AbstractSocketParameters):
-        super().__init__(zmq.DEALER, socket_parameters)
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        codec: Optional[Codec] = None,
+    ):
+        super().__init__(
+            zmq.DEALER, socket_parameters, context=context, options=options, codec=codec
+        )
 
     async def __aenter__(self) -> Self:
         self.initialize_socket()
@@ -105,8 +257,16 @@ class ZMQDealer(ZMQSocket):
         return self
 
 class ZMQPush(ZMQSocket):
-    def __init__(self, socket_parameters: AbstractSocketParameters):
-        super().__init__(zmq.PUSH, socket_parameters)
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        codec: Optional[Codec] = None,
+    ):
+        super().__init__(
+            zmq.PUSH, socket_parameters, context=context, options=options, codec=codec
+        )
 
     async def __aenter__(self) -> Self:
         self.initialize_socket()
@@ -114,10 +274,33 @@ class ZMQPush(ZMQSocket):
         return self
 
 class ZMQPull(ZMQSocket):
-    def __init__(self, socket_parameters: AbstractSocketParameters):
-        super().__init__(zmq.PULL, socket_parameters)
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        codec: Optional[Codec] = None,
+    ):
+        super().__init__(
+            zmq.PULL, socket_parameters, context=context, options=options, codec=codec
+        )
 
     async def __aenter__(self) -> Self:
         self.initialize_socket()
-        self._socket.bind(self._socket_parameters.url)
-        return self
\ No newline at end of file
+        self._bind()
+        return self
+
+class ZMQPoller(object):
+    def __init__(self) -> None: ...
+    def register(self, socket: ZMQSocket, flags: int = zmq.POLLIN) -> Self: ...
+    def unregister(self, socket: ZMQSocket) -> Self: ...
+    async def poll(
+        self, timeout: Optional[float] = None
+    ) -> List[Tuple[ZMQSocket, int]]: ...
+    async def recv_ready(
+        self, max_n: int = 1024, timeout: Optional[float] = None
+    ) -> List[Tuple[ZMQSocket, List[List[bytes]]]]: ...
+
+async def wait_sent(
+    tracker: zmq.MessageTracker, timeout: Optional[float] = None
+) -> None: ...
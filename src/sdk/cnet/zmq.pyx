@@ -1,61 +1,459 @@
-from typing import Any, Coroutine, Self, List, Type
+from typing import Any, Coroutine, Self, List, Tuple, Type
 
+import asyncio
+import os
 import zmq
 import zmq.asyncio
 from abc import ABC, abstractmethod
+from enum import IntEnum
 from typing import Optional
 
-from .parameters import AbstractSocketParameters, TCPSocketParameters
+from .codec import Codec
+from .parameters import AbstractSocketParameters, IPCSocketParameters, TCPSocketParameters
+from .trace import MessageTracer
  
 from ..cuuid cimport randstr_16
 
 
+def _file_inode(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+class SendStatus(IntEnum):
+    OK = 0
+    # Not queued: the send high-water mark was reached
+    HWM = 1
+    # Not queued: no room freed up before the send timeout
+    DROPPED = 2
+
+
+class ZMQSocketOptions(object):
+    """
+    Typed zmq socket options; ``None`` leaves the libzmq default in place.
+
+    Names match pyzmq socket attributes and are applied before bind/connect.
+    """
+
+    __slots__ = (
+        "sndhwm",
+        "rcvhwm",
+        "sndbuf",
+        "rcvbuf",
+        "linger",
+        "immediate",
+        "conflate",
+        "reconnect_ivl",
+        "reconnect_ivl_max",
+        "tcp_keepalive",
+        "tcp_keepalive_idle",
+        "tcp_keepalive_intvl",
+        "tcp_keepalive_cnt",
+    )
+
+    def __init__(
+        self,
+        *,
+        sndhwm: Optional[int] = None,
+        rcvhwm: Optional[int] = None,
+        sndbuf: Optional[int] = None,
+        rcvbuf: Optional[int] = None,
+        linger: Optional[int] = None,
+        immediate: Optional[bool] = None,
+        conflate: Optional[bool] = None,
+        reconnect_ivl: Optional[int] = None,
+        reconnect_ivl_max: Optional[int] = None,
+        tcp_keepalive: Optional[int] = None,
+        tcp_keepalive_idle: Optional[int] = None,
+        tcp_keepalive_intvl: Optional[int] = None,
+        tcp_keepalive_cnt: Optional[int] = None,
+    ):
+        self.sndhwm = sndhwm
+        self.rcvhwm = rcvhwm
+        self.sndbuf = sndbuf
+        self.rcvbuf = rcvbuf
+        self.linger = linger
+        self.immediate = immediate
+        self.conflate = conflate
+        self.reconnect_ivl = reconnect_ivl
+        self.reconnect_ivl_max = reconnect_ivl_max
+        self.tcp_keepalive = tcp_keepalive
+        self.tcp_keepalive_idle = tcp_keepalive_idle
+        self.tcp_keepalive_intvl = tcp_keepalive_intvl
+        self.tcp_keepalive_cnt = tcp_keepalive_cnt
+
+    def to_dict(self) -> dict:
+        return {
+            name: int(getattr(self, name))
+            for name in self.__slots__
+            if getattr(self, name) is not None
+        }
+
+    def apply(self, socket: zmq.Socket) -> None:
+        for name, value in self.to_dict().items():
+            setattr(socket, name, value)
+
+
+class ZMQContext(object):
+    """
+    Reference-counted owner of a ``zmq.asyncio.Context``.
+
+    The underlying context is created by the first socket that acquires it
+    and terminated when the last one releases it, so sockets sharing it can
+    be closed in any order.
+    """
+
+    _instance: Optional["ZMQContext"] = None
+
+    def __init__(self, io_threads: int = 1, linger: Optional[int] = None):
+        self._io_threads: int = io_threads
+        self._linger: Optional[int] = linger
+        self._context: zmq.asyncio.Context = None
+        self._refs: int = 0
+
+    @classmethod
+    def instance(cls) -> "ZMQContext":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def refs(self) -> int:
+        return self._refs
+
+    @property
+    def linger(self) -> Optional[int]:
+        return self._linger
+
+    def acquire(self) -> zmq.asyncio.Context:
+        if self._context is None:
+            self._context = zmq.asyncio.Context(io_threads=self._io_threads)
+            if self._linger is not None:
+                self._context.linger = self._linger
+        self._refs += 1
+        return self._context
+
+    def release(self) -> None:
+        if self._refs <= 0:
+            raise RuntimeError("ZMQContext released more times than acquired")
+        self._refs -= 1
+        if self._refs == 0:
+            self._context.term()
+            self._context = None
+
+
 class ZMQSocket(object):
     def __init__(
         self,
         socket_type: zmq.SocketType,
         socket_parameters: AbstractSocketParameters,
         id=None,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        codec: Optional[Codec] = None,
     ):
         self._id: bytes = id or randstr_16()
         self._socket_type: zmq.SocketType = socket_type
         self._socket_parameters: AbstractSocketParameters = socket_parameters
 
+        self._managed_context: ZMQContext = context or ZMQContext.instance()
         self._context: zmq.asyncio.Context = None
         self._socket: zmq.asyncio.Socket = None
+        # Blocking view of the same socket, used to drain/fill without awaiting
+        self._sync_socket: zmq.Socket = None
+        # Frames of at least this many bytes are sent/received without copying
+        self._copy_threshold: int = zmq.COPY_THRESHOLD
+        self._options: Optional[ZMQSocketOptions] = options
+        self._hwm_hits: int = 0
+        self._dropped: int = 0
+        # (st_dev, st_ino) of the ipc socket file this socket bound, if any
+        self._ipc_inode: Optional[Tuple[int, int]] = None
+        # Latency tracing is off unless enable_tracing() is called
+        self._tracer: Optional[MessageTracer] = None
+        # Encodes the last frame for send_object/recv_object
+        self._codec: Optional[Codec] = codec
 
     def initialize_socket(self):
-        self._context: zmq.asyncio.Context = zmq.asyncio.Context.instance()
+        self._context: zmq.asyncio.Context = self._managed_context.acquire()
         self._socket = self._context.socket(self._socket_type)
         self._socket.identity = self._id
+        self._apply_options()
+        self._sync_socket = zmq.Socket.shadow(self._socket.underlying)
+        self._socket.copy_threshold = self._copy_threshold
+        self._sync_socket.copy_threshold = self._copy_threshold
+
+    def _apply_options(self):
+        # Transport options from the parameters first, socket options override
+        for name, value in getattr(
+            self._socket_parameters, "socket_options", {}
+        ).items():
+            setattr(self._socket, name, value)
+        if self._options is not None:
+            self._options.apply(self._socket)
+
+    def _bind(self):
+        try:
+            # ipc:// endpoints need their directory and must not take over a live one
+            if isinstance(self._socket_parameters, IPCSocketParameters):
+                self._socket_parameters.prepare()
+                self._socket.bind(self._socket_parameters.url)
+                self._ipc_inode = _file_inode(self._socket_parameters.path)
+            else:
+                self._socket.bind(self._socket_parameters.url)
+        except BaseException:
+            # __aexit__ is not called when __aenter__ fails: release the context here
+            self._socket.close()
+            self._socket = None
+            self._sync_socket = None
+            self._context = None
+            self._managed_context.release()
+            raise
+
+    @property
+    def options(self) -> Optional[ZMQSocketOptions]:
+        return self._options
+
+    @property
+    def hwm_hits(self) -> int:
+        return self._hwm_hits
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    @property
+    def copy_threshold(self) -> int:
+        return self._copy_threshold
+
+    @property
+    def codec(self) -> Optional[Codec]:
+        return self._codec
+
+    @codec.setter
+    def codec(self, value: Optional[Codec]) -> None:
+        self._codec = value
+
+    @property
+    def tracer(self) -> Optional[MessageTracer]:
+        return self._tracer
+
+    def enable_tracing(self, realtime: bool = False) -> MessageTracer:
+        # Both ends of a hop must trace: the trace frame is appended on send
+        # and only stripped by a tracing receiver
+        if self._tracer is None or self._tracer.realtime != realtime:
+            self._tracer = MessageTracer(realtime)
+        return self._tracer
+
+    def disable_tracing(self) -> None:
+        self._tracer = None
+
+    @copy_threshold.setter
+    def copy_threshold(self, value: int) -> None:
+        self._copy_threshold = value
+        if self._socket is not None:
+            self._socket.copy_threshold = value
+            self._sync_socket.copy_threshold = value
 
     async def __aenter__(self) -> Self:
         raise NotImplementedError
 
     async def __aexit__(self, *args: any, **kwargs: any) -> None:
         self._socket.close()
-        self._context.term()
+        self._socket = None
+        self._sync_socket = None
+        self._context = None
+        self._managed_context.release()
+        if self._ipc_inode is not None:
+            # Only remove the file we bound; another process may have rebound the path
+            if _file_inode(self._socket_parameters.path) == self._ipc_inode:
+                self._socket_parameters.cleanup()
+            self._ipc_inode = None
+
+    def send_multipart(
+        self, message: List[bytes], copy: bool = True, track: bool = False
+    ) -> Coroutine[Any, Any, Optional[zmq.MessageTracker]]:
+        # copy=False only avoids the copy for frames >= copy_threshold;
+        # track=True resolves to a MessageTracker (see wait_sent)
+        if self._tracer is not None:
+            message = self._tracer.stamp(list(message))
+        return self._socket.send_multipart(message, copy=copy, track=track)
+
+    def recv_multipart(self, copy: bool = True) -> Coroutine[Any, Any, List[Any]]:
+        if self._tracer is not None:
+            return self._recv_traced(copy)
+        if copy:
+            return self._socket.recv_multipart()
+        return self._recv_multipart_buffers()
+
+    async def _recv_traced(self, copy: bool) -> List[Any]:
+        if copy:
+            message = await self._socket.recv_multipart()
+        else:
+            message = await self._recv_multipart_buffers()
+        return self._tracer.observe(message)
+
+    def recv_frames(self) -> Coroutine[Any, Any, List[zmq.Frame]]:
+        if self._tracer is not None:
+            return self._recv_frames_traced()
+        return self._socket.recv_multipart(copy=False)
+
+    async def _recv_frames_traced(self) -> List[zmq.Frame]:
+        return self._tracer.observe(await self._socket.recv_multipart(copy=False))
+
+    async def _recv_multipart_buffers(self) -> List[Any]:
+        # Large frames come back as memoryviews over the zmq message
+        frames = await self._socket.recv_multipart(copy=False)
+        threshold = self._copy_threshold
+        return [
+            frame.buffer if len(frame) >= threshold else frame.bytes
+            for frame in frames
+        ]
+
+    def send_nowait(self, message: List[bytes]) -> SendStatus:
+        if self._tracer is not None:
+            message = self._tracer.stamp(list(message))
+        return self._send_nowait(message)
+
+    def _send_nowait(self, message: List[bytes]) -> SendStatus:
+        # PUB sockets drop at the HWM inside libzmq and always report OK
+        try:
+            self._sync_socket.send_multipart(message, zmq.NOBLOCK)
+        except zmq.Again:
+            self._hwm_hits += 1
+            return SendStatus.HWM
+        return SendStatus.OK
+
+    async def send_with_backpressure(
+        self, message: List[bytes], timeout: Optional[float] = None
+    ) -> SendStatus:
+        if self._tracer is not None:
+            message = self._tracer.stamp(list(message))
+        if self._send_nowait(message) == SendStatus.OK:
+            return SendStatus.OK
+        # timeout=None waits without limit like recv_batch; 0 never waits
+        if timeout is not None and timeout <= 0:
+            return SendStatus.HWM
+        try:
+            await asyncio.wait_for(self._socket.send_multipart(message), timeout)
+        except asyncio.TimeoutError:
+            self._dropped += 1
+            return SendStatus.DROPPED
+        return SendStatus.OK
+
+    async def recv_batch(
+        self, max_n: int = 1024, timeout: Optional[float] = None
+    ) -> List[List[bytes]]:
+        # Await only the first message, then drain whatever else is queued
+        if not await self._socket.poll(
+            None if timeout is None else int(timeout * 1000), zmq.POLLIN
+        ):
+            return []
+        return self._drain(max_n)
 
-    def send_multipart(self, message: List[bytes]) -> Coroutine[Any, Any, None]:
-        return self._socket.send_multipart(message)
+    def _drain(self, max_n: int) -> List[List[bytes]]:
+        messages = []
+        recv = self._sync_socket.recv_multipart
+        while len(messages) < max_n:
+            try:
+                messages.append(recv(zmq.NOBLOCK))
+            except zmq.Again:
+                break
+        if self._tracer is not None:
+            observe = self._tracer.observe
+            return [observe(message) for message in messages]
+        return messages
 
-    def recv_multipart(self) -> Coroutine[Any, Any, bytes]:
-        return self._socket.recv_multipart()
+    async def send_batch(self, messages: List[List[bytes]]) -> None:
+        send = self._sync_socket.send_multipart
+        if self._tracer is not None:
+            stamp = self._tracer.stamp
+            messages = [stamp(list(message)) for message in messages]
+        for message in messages:
+            try:
+                send(message, zmq.NOBLOCK)
+            except zmq.Again:
+                # High-water mark reached: wait for room like send_multipart
+                await self._socket.send_multipart(message)
+
+    def send_arrow(
+        self,
+        data: Any,
+        prefix: Optional[List[bytes]] = None,
+        compression: Optional[str] = None,
+    ) -> Coroutine[Any, Any, None]:
+        # Imported here so sdk.cnet does not load pyarrow for non-Arrow users
+        from ..cfs.arrow import pa_serialize_ipc_stream
+
+        # The IPC stream is the last frame, sent without copying it into zmq
+        frames = list(prefix) if prefix else []
+        frames.append(pa_serialize_ipc_stream(data, compression))
+        if self._tracer is not None:
+            frames = self._tracer.stamp(frames)
+        return self._socket.send_multipart(frames, copy=False)
+
+    async def recv_arrow(self) -> Tuple[List[bytes], Any]:
+        from ..cfs.arrow import pa_deserialize_ipc_stream
+
+        frames = await self._socket.recv_multipart(copy=False)
+        if self._tracer is not None:
+            frames = self._tracer.observe(frames)
+        # Pop rather than index: modules are built with wraparound=False
+        table = pa_deserialize_ipc_stream(frames.pop().buffer)
+        return [frame.bytes for frame in frames], table
+
+
+    def send_object(
+        self, obj: Any, prefix: Optional[List[bytes]] = None
+    ) -> Coroutine[Any, Any, Optional[zmq.MessageTracker]]:
+        # The encoded object is the last frame, after any routing/topic frames
+        if self._codec is None:
+            raise RuntimeError("Socket has no codec")
+        frames = list(prefix) if prefix else []
+        frames.append(self._codec.encode(obj))
+        return self.send_multipart(frames)
+
+    async def recv_object(self) -> Tuple[List[bytes], Any]:
+        if self._codec is None:
+            raise RuntimeError("Socket has no codec")
+        frames = await self.recv_multipart()
+        if not frames:
+            raise ValueError("Empty message")
+        # Pop rather than index: modules are built with wraparound=False
+        return frames, self._codec.decode(frames.pop())
 
 
 class ZMQPublisher(ZMQSocket):
-    def __init__(self, socket_parameters: AbstractSocketParameters):
-        super().__init__(zmq.PUB, socket_parameters)
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        codec: Optional[Codec] = None,
+    ):
+        super().__init__(
+            zmq.PUB, socket_parameters, context=context, options=options, codec=codec
+        )
 
     async def __aenter__(self) -> Self:
         self.initialize_socket()
-        self._socket.bind(self._socket_parameters.url)
+        self._bind()
         return self
 
 
 class ZMQSubscriber(ZMQSocket):
-    def __init__(self, socket_parameters: AbstractSocketParameters):
-        super().__init__(zmq.SUB, socket_parameters)
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        codec: Optional[Codec] = None,
+    ):
+        super().__init__(
+            zmq.SUB, socket_parameters, context=context, options=options, codec=codec
+        )
 
     async def __aenter__(self) -> Self:
         self.initialize_socket()
@@ -66,20 +464,40 @@ class ZMQSubscriber(ZMQSocket):
         self._socket.setsockopt(zmq.SUBSCRIBE, topic)
         return self
 
+    def unsubscribe(self, topic: bytes=b""):
+        self._socket.setsockopt(zmq.UNSUBSCRIBE, topic)
+        return self
+
 
 class ZMQRouter(ZMQSocket):
-    def __init__(self, socket_parameters: AbstractSocketParameters):
-        super().__init__(zmq.ROUTER, socket_parameters)
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        codec: Optional[Codec] = None,
+    ):
+        super().__init__(
+            zmq.ROUTER, socket_parameters, context=context, options=options, codec=codec
+        )
 
     async def __aenter__(self) -> Self:
         self.initialize_socket()
-        self._socket.bind(self._socket_parameters.url)
+        self._bind()
         return self
 
 
 class ZMQDealer(ZMQSocket):
-    def __init__(self, socket_parameters: AbstractSocketParameters):
-        super().__init__(zmq.DEALER, socket_parameters)
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        codec: Optional[Codec] = None,
+    ):
+        super().__init__(
+            zmq.DEALER, socket_parameters, context=context, options=options, codec=codec
+        )
 
     async def __aenter__(self) -> Self:
         self.initialize_socket()
@@ -88,8 +506,16 @@ class ZMQDealer(ZMQSocket):
 
 
 class ZMQPush(ZMQSocket):
-    def __init__(self, socket_parameters: AbstractSocketParameters):
-        super().__init__(zmq.PUSH, socket_parameters)
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        codec: Optional[Codec] = None,
+    ):
+        super().__init__(
+            zmq.PUSH, socket_parameters, context=context, options=options, codec=codec
+        )
 
     async def __aenter__(self) -> Self:
         self.initialize_socket()
@@ -98,10 +524,65 @@ class ZMQPush(ZMQSocket):
 
 
 class ZMQPull(ZMQSocket):
-    def __init__(self, socket_parameters: AbstractSocketParameters):
-        super().__init__(zmq.PULL, socket_parameters)
+    def __init__(
+        self,
+        socket_parameters: AbstractSocketParameters,
+        context: Optional[ZMQContext] = None,
+        options: Optional[ZMQSocketOptions] = None,
+        codec: Optional[Codec] = None,
+    ):
+        super().__init__(
+            zmq.PULL, socket_parameters, context=context, options=options, codec=codec
+        )
 
     async def __aenter__(self) -> Self:
         self.initialize_socket()
-        self._socket.bind(self._socket_parameters.url)
-        return self
\ No newline at end of file
+        self._bind()
+        return self
+
+
+class ZMQPoller(object):
+    """Multiplexes many ZMQSockets in a single coroutine."""
+
+    def __init__(self):
+        self._poller = zmq.asyncio.Poller()
+        self._sockets: dict = {}
+
+    def register(self, socket: ZMQSocket, flags: int = zmq.POLLIN) -> Self:
+        self._poller.register(socket._socket, flags)
+        self._sockets[socket._socket] = socket
+        return self
+
+    def unregister(self, socket: ZMQSocket) -> Self:
+        self._poller.unregister(socket._socket)
+        del self._sockets[socket._socket]
+        return self
+
+    async def poll(self, timeout: Optional[float] = None) -> List[Tuple[ZMQSocket, int]]:
+        events = await self._poller.poll(-1 if timeout is None else int(timeout * 1000))
+        return [(self._sockets[sock], event) for sock, event in events]
+
+    async def recv_ready(
+        self, max_n: int = 1024, timeout: Optional[float] = None
+    ) -> List[Tuple[ZMQSocket, List[List[bytes]]]]:
+        # One wakeup for all sockets, then drain each ready one without awaiting
+        ready = []
+        for socket, event in await self.poll(timeout):
+            if event & zmq.POLLIN:
+                messages = socket._drain(max_n)
+                if messages:
+                    ready.append((socket, messages))
+        return ready
+
+
+async def wait_sent(
+    tracker: zmq.MessageTracker, timeout: Optional[float] = None
+) -> None:
+    """Wait until zmq has released the buffers of a tracked zero-copy send."""
+    async def _wait():
+        delay = 0.0
+        while not tracker.done:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2 or 0.0001, 0.01)
+
+    await asyncio.wait_for(_wait(), timeout)
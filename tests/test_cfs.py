@@ -1,6 +1,34 @@
+import asyncio
+import io
+import tempfile
+import time
 import unittest
 from pathlib import Path
-from sdk.cfs import extract_zip, read_json, write_json, read_toml, write_toml
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+from sdk.cfs import (
+    FileInfoCache,
+    ParquetSink,
+    extract_zip,
+    pa_deserialize_ipc_stream,
+    pa_files_exist,
+    pa_iter_csv_batches,
+    pa_iter_parquet_batches,
+    pa_read_ipc_file,
+    pa_read_parquet,
+    pa_serialize_ipc_stream,
+    pa_write_ipc_file,
+    pa_write_partitioned_parquet,
+    read_json,
+    read_json_bytes,
+    write_json,
+    read_toml,
+    write_toml,
+)
 
 
 class TestExtractZip(unittest.TestCase):
@@ -71,6 +99,13 @@ class TestJsonReadWrite(unittest.TestCase):
         data2 = read_json(str(self.temp_json_path))
         self.assertEqual(data, data2)
 
+    def test_read_json_bytes(self):
+        data = read_json_bytes(self.example_json_path.read_bytes())
+        self.assertEqual(data, read_json(str(self.example_json_path)))
+        self.assertEqual(read_json_bytes('{"a": [1, 2.5, null]} '), {"a": [1, 2.5, None]})
+        with self.assertRaises(ValueError):
+            read_json_bytes(b'{"a": 1} x')
+
 
 class TestTomlReadWrite(unittest.TestCase):
     def setUp(self):
@@ -98,5 +133,237 @@ class TestTomlReadWrite(unittest.TestCase):
         data2 = read_toml(str(self.temp_toml_path))
         self.assertEqual(data, data2)
 
+class TestParquetSink(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    @staticmethod
+    def _batch(start, n):
+        return pa.record_batch({"id": pa.array(range(start, start + n), pa.int64())})
+
+    def test_buffers_into_row_groups(self):
+        with ParquetSink(self.tmp_dir.name, row_group_size=100) as sink:
+            for i in range(25):
+                sink.write(self._batch(i * 10, 10))
+            self.assertEqual(sink.pending_rows, 50)
+
+        self.assertEqual(len(sink.paths), 1)
+        metadata = pq.ParquetFile(sink.paths[0]).metadata
+        self.assertEqual(metadata.num_rows, 250)
+        self.assertEqual(
+            [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)],
+            [100, 100, 50],
+        )
+        table = pq.read_table(sink.paths[0])
+        self.assertEqual(table.column("id").to_pylist(), list(range(250)))
+
+    def test_rolls_by_row_count(self):
+        with ParquetSink(self.tmp_dir.name, row_group_size=40, max_file_rows=100) as sink:
+            sink.write(pa.Table.from_batches([self._batch(0, 250)]))
+
+        self.assertEqual(len(sink.paths), 3)
+        rows = [pq.ParquetFile(p).metadata.num_rows for p in sink.paths]
+        self.assertEqual(rows, [100, 100, 50])
+
+    def test_rejects_schema_mismatch(self):
+        with ParquetSink(self.tmp_dir.name) as sink:
+            sink.write(self._batch(0, 1))
+            with self.assertRaises(ValueError):
+                sink.write(pa.record_batch({"other": pa.array(["x"])}))
+
+    def test_async_context_manager(self):
+        async def run():
+            async with ParquetSink(self.tmp_dir.name) as sink:
+                sink.write(self._batch(0, 5))
+            return sink
+
+        sink = asyncio.run(run())
+        self.assertEqual(pq.read_table(sink.paths[0]).num_rows, 5)
+        with self.assertRaises(ValueError):
+            sink.write(self._batch(0, 1))
+
+
+class TestPartitionedParquet(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_hourly_partitions(self):
+        hour_ns = 3600 * 10**9
+        base_ns = 1_700_000_000 * 10**9  # 2023-11-14T22:13:20Z
+        ts = [base_ns, base_ns + hour_ns, base_ns + 1, base_ns + 2 * hour_ns]
+        table = pa.table(
+            {"ts": pa.array(ts, pa.timestamp("ns", tz="UTC")), "v": [0, 1, 2, 3]}
+        )
+        paths = pa_write_partitioned_parquet(
+            table, self.tmp_dir.name, "ts", granularity="hour", compression="zstd"
+        )
+
+        self.assertEqual(len(paths), 3)
+        self.assertIn("/date=2023-11-14/hour=22/", paths[0])
+        self.assertIn("/date=2023-11-14/hour=23/", paths[1])
+        self.assertIn("/date=2023-11-15/hour=00/", paths[2])
+        self.assertEqual(pq.read_table(paths[0]).column("v").to_pylist(), [0, 2])
+
+    def test_integer_timestamps_with_unit(self):
+        table = pa.table({"ts": pa.array([0, 86_399, 86_400, -1], pa.int64())})
+        paths = pa_write_partitioned_parquet(
+            table, self.tmp_dir.name, "ts", granularity="day", ts_unit="s"
+        )
+        self.assertEqual(
+            [Path(p).parent.name for p in paths],
+            ["date=1969-12-31", "date=1970-01-01", "date=1970-01-02"],
+        )
+
+    def test_invalid_granularity(self):
+        table = pa.table({"ts": pa.array([0], pa.int64())})
+        with self.assertRaises(ValueError):
+            pa_write_partitioned_parquet(table, self.tmp_dir.name, "ts", granularity="week")
+
+
+class TestFilesExist(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.fs = pafs.LocalFileSystem()
+        self.existing = [f"{self.tmp_dir.name}/f{i}" for i in range(10)]
+        for path in self.existing:
+            Path(path).touch()
+        self.paths = self.existing + [f"{self.tmp_dir.name}/missing", "/nonexistent/x"]
+        self.expected = [True] * 10 + [False, False]
+
+    def test_batched(self):
+        self.assertEqual(pa_files_exist(self.fs, self.paths), self.expected)
+
+    def test_listing_common_prefixes(self):
+        self.assertEqual(
+            pa_files_exist(self.fs, self.paths, min_listing_size=2), self.expected
+        )
+
+    def test_listing_unnormalized_paths(self):
+        paths = [self.tmp_dir.name + "//f0", self.existing[1]]
+        self.assertEqual(pa_files_exist(self.fs, paths, min_listing_size=1), [True, True])
+
+    def test_cache_hits_keep_their_ttl(self):
+        cache = FileInfoCache(ttl=0.05)
+        pa_files_exist(self.fs, self.existing[:1], cache)
+        Path(self.existing[0]).unlink()
+        deadline = time.monotonic() + 0.2
+        # Every batch has a miss, which must not refresh the hit on existing[0]
+        i = 1
+        while pa_files_exist(self.fs, [self.existing[0], self.existing[i]], cache)[0]:
+            self.assertLess(time.monotonic(), deadline)
+            i = i % 9 + 1
+            cache.invalidate(self.existing[i])
+            time.sleep(0.01)
+
+    def test_cache_put_existing_key_does_not_evict(self):
+        cache = FileInfoCache(max_size=2)
+        a, b = pafs.FileInfo("a"), pafs.FileInfo("b")
+        cache.put(a)
+        cache.put(b)
+        cache.put(b)
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.get("a"), a)
+
+    def test_ttl_cache(self):
+        cache = FileInfoCache(ttl=60.0)
+        self.assertEqual(pa_files_exist(self.fs, self.paths, cache), self.expected)
+        self.assertEqual(len(cache), len(self.paths))
+
+        # Cached results are served without touching the filesystem
+        Path(self.existing[0]).unlink()
+        self.assertTrue(pa_files_exist(self.fs, self.existing[:1], cache)[0])
+        cache.invalidate(self.existing[0])
+        self.assertFalse(pa_files_exist(self.fs, self.existing[:1], cache)[0])
+
+    def test_ttl_expiry(self):
+        cache = FileInfoCache(ttl=0.001)
+        pa_files_exist(self.fs, self.existing[:1], cache)
+        time.sleep(0.01)
+        self.assertIsNone(cache.get(self.existing[0]))
+
+
+class TestParquetReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = f"{self.tmp_dir.name}/data.parquet"
+        self.table = pa.table(
+            {
+                "ts": pa.array(range(0, 10_000_000, 1000), pa.timestamp("ns")),
+                "id": pa.array(range(10_000), pa.int64()),
+                "payload": pa.array([str(i) for i in range(10_000)]),
+            }
+        )
+        pq.write_table(self.table, self.path, row_group_size=1000)
+
+    def test_projection_and_filters(self):
+        table = pa_read_parquet(
+            self.path, columns=["id"], filters=[("id", ">=", 9_990)]
+        )
+        self.assertEqual(table.column_names, ["id"])
+        self.assertEqual(table.column("id").to_pylist(), list(range(9_990, 10_000)))
+
+    def test_time_range(self):
+        table = pa_read_parquet(self.path, time_range=("ts", 2_000_000, 2_005_000))
+        self.assertEqual(table.column("id").to_pylist(), list(range(2_000, 2_005)))
+
+    def test_iter_batches(self):
+        batches = list(
+            pa_iter_parquet_batches(
+                self.path,
+                columns=["id"],
+                filters=[("id", "<", 2_500)],
+                batch_size=500,
+                use_threads=False,
+            )
+        )
+        self.assertTrue(all(batch.num_rows <= 500 for batch in batches))
+        self.assertEqual(sum(batch.num_rows for batch in batches), 2_500)
+
+
+class TestCSVReader(unittest.TestCase):
+    def test_iter_csv_batches(self):
+        content = b"id,name\n" + b"".join(f"{i},n{i}\n".encode() for i in range(5000))
+        batches = list(
+            pa_iter_csv_batches(
+                io.BytesIO(content), read_options=pacsv.ReadOptions(block_size=4096)
+            )
+        )
+        self.assertGreater(len(batches), 1)
+        table = pa.Table.from_batches(batches)
+        self.assertEqual(table.column("id").to_pylist(), list(range(5000)))
+
+class TestArrowIPC(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.table = pa.table({"id": pa.array(range(1000), pa.int64())})
+
+    def test_ipc_file_memory_mapped(self):
+        path = f"{self.tmp_dir.name}/data.arrow"
+        pa_write_ipc_file(self.table, path)
+        allocated = pa.total_allocated_bytes()
+        table = pa_read_ipc_file(path)
+        # Uncompressed reads are zero-copy views into the mapped file
+        self.assertEqual(pa.total_allocated_bytes(), allocated)
+        self.assertTrue(table.equals(self.table))
+
+    def test_ipc_file_compressed(self):
+        path = f"{self.tmp_dir.name}/data.arrow"
+        pa_write_ipc_file(self.table, path, compression="zstd")
+        self.assertTrue(pa_read_ipc_file(path, memory_map=False).equals(self.table))
+
+    def test_ipc_stream_roundtrip(self):
+        for compression in (None, "lz4", "zstd"):
+            buffer = pa_serialize_ipc_stream(self.table, compression)
+            self.assertTrue(pa_deserialize_ipc_stream(buffer).equals(self.table))
+            self.assertTrue(
+                pa_deserialize_ipc_stream(memoryview(buffer)).equals(self.table)
+            )
+
+
 if __name__ == "__main__":
     unittest.main()